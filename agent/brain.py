@@ -1,16 +1,24 @@
+import asyncio
 import os
-from typing import List, Optional, Any
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from dotenv import load_dotenv
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage, BaseMessage, ToolMessage
-from langchain_groq import ChatGroq
-from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.messages import (
+    HumanMessage, AIMessage, SystemMessage, BaseMessage, ToolMessage, message_chunk_to_message
+)
 from skills.tools_factory import get_viora_tools
 from agent.router import Router
+from agent.context import ContextManager
 
 load_dotenv()
 
+# Bound LLM clients shared across Brain instances, keyed by (provider, category).
+_llm_cache: Dict[Tuple[str, str], Any] = {}
+_llm_cache_lock = threading.Lock()
+
 class Brain:
-    def __init__(self):
+    def __init__(self, memory=None):
         self.provider = os.getenv("VIORA_MODEL_PROVIDER", "groq").lower()
         self.router = Router()
         self.history: List[BaseMessage] = [
@@ -18,16 +26,41 @@ class Brain:
                                   "You can search the web, manage todos, and provide system info. "
                                   "Be concise, friendly, and proactive.")
         ]
+        # Keeps the resent history within a token budget
+        self.context = ContextManager()
+        # Long-term recall: relevant past notes/logs are injected for the current turn only
+        self.memory = memory
+        self.recall_k = int(os.getenv("VIORA_MEMORY_TOP_K", "3"))
+        self.recall_min_score = float(os.getenv("VIORA_MEMORY_MIN_SCORE", "0.35"))
+        self.recalled: Optional[SystemMessage] = None
+        # Why the last recall failed, if it did; shown after the response
+        self.recall_error: Optional[str] = None
         # Token usage tracking
         self.session_tokens = {"prompt": 0, "completion": 0, "total": 0}
         self.last_response_tokens = None
         self.current_category = "ALL"
+        # Seconds from request to first streamed chunk of the last LLM call (async path only)
+        self.last_ttft: Optional[float] = None
 
     def _get_llm_for_category(self, category: str):
-        """Returns an LLM bound with tools for a specific category."""
+        """Returns the cached LLM bound with tools for a specific category."""
+        key = (self.provider, category)
+        llm = _llm_cache.get(key)
+        if llm is None:
+            with _llm_cache_lock:
+                llm = _llm_cache.get(key)
+                if llm is None:
+                    llm = self._build_llm_for_category(category)
+                    _llm_cache[key] = llm
+        return llm
+
+    def _build_llm_for_category(self, category: str):
+        """Creates an LLM client and binds the tools for a specific category."""
         tools = get_viora_tools(category)
         
+        # Provider SDKs are imported only for the provider in use
         if self.provider == "groq":
+            from langchain_groq import ChatGroq
             api_key = os.getenv("GROQ_API_KEY")
             llm = ChatGroq(
                 temperature=0,
@@ -36,6 +69,7 @@ class Brain:
             )
             return llm.bind_tools(tools) if tools else llm
         elif self.provider in ["gemini", "google"]:
+            from langchain_google_genai import ChatGoogleGenerativeAI
             api_key = os.getenv("GOOGLE_API_KEY")
             llm = ChatGoogleGenerativeAI(
                 model="gemini-1.5-flash",
@@ -49,12 +83,14 @@ class Brain:
     def think(self, prompt: str) -> BaseMessage:
         """Processes a prompt and returns the AI message."""
         self.history.append(HumanMessage(content=prompt))
+        self.context.compact(self.history)
         
         # Classify intent and get specialized LLM
         self.current_category = self.router.classify(prompt)
+        self._recall(prompt)
         llm = self._get_llm_for_category(self.current_category)
         
-        response = llm.invoke(self.history)
+        response = llm.invoke(self._request_messages())
         self.history.append(response)
         
         # Track token usage
@@ -64,8 +100,9 @@ class Brain:
 
     def think_after_tools(self) -> BaseMessage:
         """Gets next response after tool results, using the current category LLM."""
+        self.context.compact(self.history)
         llm = self._get_llm_for_category(self.current_category)
-        response = llm.invoke(self.history)
+        response = llm.invoke(self._request_messages())
         self.history.append(response)
         
         # Track token usage
@@ -73,26 +110,101 @@ class Brain:
         
         return response
     
+    async def athink(self, prompt: str, on_token: Optional[Callable[[str], None]] = None) -> BaseMessage:
+        """Async variant of think() that streams text chunks to on_token as they arrive."""
+        self.history.append(HumanMessage(content=prompt))
+        self.context.compact(self.history)
+        self.current_category = await asyncio.to_thread(self.router.classify, prompt)
+        await asyncio.to_thread(self._recall, prompt)
+        llm = await self.aprepare()
+        return await self._astream(llm, on_token)
+
+    async def athink_after_tools(self, on_token: Optional[Callable[[str], None]] = None) -> BaseMessage:
+        """Async variant of think_after_tools() with streaming output."""
+        self.context.compact(self.history)
+        llm = await self.aprepare()
+        return await self._astream(llm, on_token)
+
+    async def aprepare(self):
+        """Gets the bound LLM for the current category off the event loop.
+        The agent loop runs this alongside tool execution so the next call is ready."""
+        return await asyncio.to_thread(self._get_llm_for_category, self.current_category)
+
+    async def _astream(self, llm, on_token: Optional[Callable[[str], None]]) -> BaseMessage:
+        start = time.perf_counter()
+        self.last_ttft = None
+        merged = None
+        async for chunk in llm.astream(self._request_messages()):
+            if self.last_ttft is None:
+                self.last_ttft = time.perf_counter() - start
+            merged = chunk if merged is None else merged + chunk
+            if on_token and isinstance(chunk.content, str) and chunk.content:
+                on_token(chunk.content)
+
+        response = message_chunk_to_message(merged) if merged is not None else AIMessage(content="")
+        self.history.append(response)
+        self._track_tokens(response)
+        return response
+
+    def _recall(self, prompt: str):
+        """Looks up past notes/logs related to the prompt for the current turn."""
+        self.recalled = None
+        self.recall_error = None
+        if self.memory is None or self.current_category == "GREETING":
+            return
+        try:
+            hits = self.memory.recall(prompt, k=self.recall_k, min_score=self.recall_min_score)
+        except Exception as e:
+            # Recall is best-effort: the turn goes ahead without memories
+            self.recall_error = str(e)
+            return
+        if hits:
+            lines = []
+            for hit in hits:
+                if hit["kind"] == "notes":
+                    lines.append(f"- [note {hit['timestamp'][:10]}] {hit['content']}")
+                else:
+                    lines.append(f"- [{hit['timestamp'][:10]}] User: {hit['user']} | You: {hit['agent'][:300]}")
+            self.recalled = SystemMessage(content="Relevant memories from earlier sessions:\n" + "\n".join(lines))
+
+    def _request_messages(self) -> List[BaseMessage]:
+        """History as sent to the LLM, with recalled memories placed before the current user message."""
+        if self.recalled is None:
+            return self.history
+        for i in range(len(self.history) - 1, -1, -1):
+            if isinstance(self.history[i], HumanMessage):
+                return self.history[:i] + [self.recalled] + self.history[i:]
+        return self.history + [self.recalled]
+
     def _track_tokens(self, response: BaseMessage):
         """Extract and track token usage from response metadata."""
+        usage = {}
         if hasattr(response, 'response_metadata') and response.response_metadata:
             usage = response.response_metadata.get('token_usage', {})
-            if usage:
-                prompt_tokens = usage.get('prompt_tokens', 0)
-                completion_tokens = usage.get('completion_tokens', 0)
-                total_tokens = usage.get('total_tokens', 0)
-                
-                # Update session totals
-                self.session_tokens['prompt'] += prompt_tokens
-                self.session_tokens['completion'] += completion_tokens
-                self.session_tokens['total'] += total_tokens
-                
-                # Store last response tokens
-                self.last_response_tokens = {
-                    'prompt': prompt_tokens,
-                    'completion': completion_tokens,
-                    'total': total_tokens
-                }
+        if not usage and getattr(response, 'usage_metadata', None):
+            # Streamed responses only carry the standardized usage metadata
+            meta = response.usage_metadata
+            usage = {
+                'prompt_tokens': meta.get('input_tokens', 0),
+                'completion_tokens': meta.get('output_tokens', 0),
+                'total_tokens': meta.get('total_tokens', 0)
+            }
+        if usage:
+            prompt_tokens = usage.get('prompt_tokens', 0)
+            completion_tokens = usage.get('completion_tokens', 0)
+            total_tokens = usage.get('total_tokens', 0)
+            
+            # Update session totals
+            self.session_tokens['prompt'] += prompt_tokens
+            self.session_tokens['completion'] += completion_tokens
+            self.session_tokens['total'] += total_tokens
+            
+            # Store last response tokens
+            self.last_response_tokens = {
+                'prompt': prompt_tokens,
+                'completion': completion_tokens,
+                'total': total_tokens
+            }
     
     def get_token_usage(self) -> dict:
         """Get current session token usage statistics."""
@@ -101,7 +213,14 @@ class Brain:
             'last_response': self.last_response_tokens.copy() if self.last_response_tokens else None,
             'provider': self.provider,
             'model': self._get_model_name(),
-            'category': self.current_category
+            'category': self.current_category,
+            'ttft': self.last_ttft,
+            'context': {
+                'history_tokens': self.context.total_tokens(self.history),
+                'saved_last': self.context.last_saved,
+                'saved_total': self.context.total_saved,
+                'budget': self.context.budget_tokens
+            }
         }
     
     def _get_model_name(self) -> str:
@@ -0,0 +1,130 @@
+import json
+import os
+from typing import List, Optional
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, ToolMessage
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+def estimate_tokens(message: BaseMessage) -> int:
+    """Rough token count (~4 characters per token) including tool-call arguments."""
+    content = message.content if isinstance(message.content, str) else json.dumps(message.content)
+    chars = len(content)
+    for call in getattr(message, "tool_calls", None) or []:
+        chars += len(call.get("name", "")) + len(json.dumps(call.get("args", {})))
+    return chars // 4 + 4
+
+
+def _text(message: BaseMessage) -> str:
+    content = message.content if isinstance(message.content, str) else json.dumps(message.content)
+    return " ".join(content.split())
+
+
+class ContextManager:
+    """
+    Keeps Brain.history within a token budget.
+    Tool outputs from finished turns are trimmed first, then (when over budget) those
+    from earlier tool steps of the current turn; if the history is still over budget,
+    the oldest turns are folded into a rolling summary message that sits right
+    after the system prompt. A turn (user message, tool calls and their results) is
+    always kept or dropped as a whole so tool calls stay paired with their results.
+    """
+
+    def __init__(self, budget_tokens: Optional[int] = None, tool_output_chars: Optional[int] = None,
+                 keep_turns: int = 2, summary_chars: int = 2000):
+        if budget_tokens is None:
+            budget_tokens = int(os.getenv("VIORA_CONTEXT_BUDGET", "4000"))
+        if tool_output_chars is None:
+            tool_output_chars = int(os.getenv("VIORA_TOOL_OUTPUT_CHARS", "500"))
+        self.budget_tokens = budget_tokens
+        self.tool_output_chars = tool_output_chars
+        self.keep_turns = max(1, keep_turns)
+        self.summary_chars = summary_chars
+        self.summary_lines: List[str] = []
+        self.last_saved = 0
+        self.total_saved = 0
+
+    def total_tokens(self, history: List[BaseMessage]) -> int:
+        return sum(estimate_tokens(m) for m in history)
+
+    def compact(self, history: List[BaseMessage]) -> int:
+        """Compacts history in place before each LLM request; returns estimated tokens saved."""
+        before = self.total_tokens(history)
+        head, turns = self._split(history)
+
+        # Finished turns only: the current turn may still be waiting on its tool results
+        for turn in turns[:-1]:
+            self._trim_tool_outputs(turn, len(turn))
+
+        def size() -> int:
+            return self.total_tokens(head) + sum(self.total_tokens(t) for t in turns) + len(self._summary_text()) // 4
+
+        # A long tool loop: outputs of earlier steps in the current turn have already been
+        # read by the model; the results answering its latest tool calls stay whole
+        if turns and size() > self.budget_tokens:
+            current = turns[-1]
+            last_call = max((i for i, m in enumerate(current) if isinstance(m, AIMessage)), default=0)
+            self._trim_tool_outputs(current, last_call)
+
+        while len(turns) > self.keep_turns and size() > self.budget_tokens:
+            self._summarize_turn(turns.pop(0))
+
+        compacted = list(head)
+        if self.summary_lines:
+            compacted.append(SystemMessage(content=self._summary_text(), additional_kwargs={"viora_summary": True}))
+        for turn in turns:
+            compacted.extend(turn)
+        history[:] = compacted
+
+        self.last_saved = max(0, before - self.total_tokens(history))
+        self.total_saved += self.last_saved
+        return self.last_saved
+
+    def _split(self, history: List[BaseMessage]):
+        """Splits history into the leading system prompt and a list of turns."""
+        head: List[BaseMessage] = []
+        turns: List[List[BaseMessage]] = []
+        for message in history:
+            if isinstance(message, SystemMessage) and message.additional_kwargs.get("viora_summary"):
+                continue  # Rebuilt from summary_lines
+            if isinstance(message, HumanMessage):
+                turns.append([message])
+            elif turns:
+                turns[-1].append(message)
+            else:
+                head.append(message)
+        return head, turns
+
+    def _trim_tool_outputs(self, turn: List[BaseMessage], end: int):
+        """Trims the tool outputs in turn[:end] in place."""
+        for i in range(end):
+            if isinstance(turn[i], ToolMessage):
+                turn[i] = self._trim_tool_output(turn[i])
+
+    def _trim_tool_output(self, message: ToolMessage) -> ToolMessage:
+        content = message.content if isinstance(message.content, str) else json.dumps(message.content)
+        if message.additional_kwargs.get("viora_trimmed") or len(content) <= self.tool_output_chars:
+            return message
+        trimmed = f"{content[:self.tool_output_chars]}\n...[{len(content) - self.tool_output_chars} chars trimmed]..."
+        return ToolMessage(content=trimmed, tool_call_id=message.tool_call_id,
+                           additional_kwargs={"viora_trimmed": True})
+
+    def _summarize_turn(self, turn: List[BaseMessage]):
+        """Folds a turn into the rolling summary as one or two short lines."""
+        user = _text(turn[0])[:200]
+        tools = [call["name"] for m in turn if isinstance(m, AIMessage) for call in (m.tool_calls or [])]
+        replies = [m for m in turn if isinstance(m, AIMessage) and _text(m)]
+        line = f"- User: {user}"
+        if tools:
+            line += f" (tools: {', '.join(dict.fromkeys(tools))})"
+        if replies:
+            line += f"\n  Viora: {_text(replies[-1])[:200]}"
+        self.summary_lines.append(line)
+        # Oldest summary lines go first once the summary itself hits its cap
+        while len(self._summary_text()) > self.summary_chars and len(self.summary_lines) > 1:
+            self.summary_lines.pop(0)
+
+    def _summary_text(self) -> str:
+        if not self.summary_lines:
+            return ""
+        return SUMMARY_PREFIX + "\n".join(self.summary_lines)
@@ -0,0 +1,163 @@
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# High-precision patterns per category. A query is answered by the rules tier
+# only when exactly one category matches.
+RULES: Dict[str, List[str]] = {
+    "GREETING": [
+        r"^(hi|hello|hey|hiya|yo|sup|good (morning|afternoon|evening|night)|thanks|thank you|"
+        r"how are you( doing)?|what'?s up|bye|goodbye|see you)( there)?( viora)?[\s!.?]*$",
+    ],
+    "TODO": [
+        r"\b(todos?|to-dos?|to do list|my tasks?|pending tasks?|task list)\b",
+        r"\bremind me to\b",
+        r"\b(my notes|journal|what did (i|we) (say|talk about)|last (week|month)'?s? (notes|conversations?))\b",
+    ],
+    "SYSTEM": [
+        r"\b(open|launch|start|run) (the )?(notepad|calc|calculator|chrome|edge|firefox|cmd|terminal|"
+        r"explorer|settings app|spotify|vs ?code|visual studio code|photos app|microsoft store|solitaire)\b",
+        r"\b((set|turn|raise|lower|increase|decrease) (the )?volume|volume (up|down|to \d+)|(mute|unmute)( the)?( volume| sound| audio)?$|"
+        r"(my|the|current|system) (battery|cpu|ram|memory)( usage| level| status)?$|(cpu|ram|memory) usage (right )?now|"
+        r"how much battery|system status|(to|from|my|the) clipboard|take (a )?screenshot|"
+        r"list (the )?files|read (the )?file|write (to )?(a |the )?file|next track|previous track|"
+        r"play ?pause|os info|my (os|operating system))\b",
+        r"\bwhat('?s| is) the (time|date)\b",
+    ],
+    "BROWSER": [
+        r"https?://|\bwww\.",
+        r"\b(navigate to|go to|browse to|in the browser|web ?page|new tab|switch tab|close tab|"
+        r"extract (the )?(links|table))\b",
+    ],
+    # Desktop actions only: a noun on its own ("mouse", "pixel", "windows") is as likely
+    # a question about it, so those queries go on to the model/LLM tiers
+    "DESKTOP": [
+        r"\b(focus|minimi[sz]e|maximi[sz]e|restore|close|resize|move|switch to|bring up) (the |this |that |my |all )?"
+        r"([\w.-]+ ){0,3}windows?\b",
+        r"\b(list|show)( me)?( all)?( the)?( open)? windows\b",
+        r"\bmove (the )?(mouse|cursor)\b",
+        r"\b(double[- ]|right[- ])?click (at|on) \(?\d+",
+        r"\bdrag (from )?\(?\d+",
+        r"\bscroll (the )?(mouse |page )?(up|down) \d+",
+        r"\bpress (the )?\w+ key\b|\b(press|hit) (ctrl|alt|shift|win)\s*\+?\s*\w",
+        r"\b(get|what('?s| is)) (the |my )?(screen size|screen resolution|(mouse|cursor) position)\b",
+        r"\bpixel colou?r at\b",
+    ],
+    "WEB_SEARCH": [
+        r"\b(search (the web|online|the internet|for)|look up|google|latest news|news about|who is|who was)\b",
+    ],
+}
+
+# Seed utterances used to train the TF-IDF model alongside the category descriptions
+# and any LLM-labelled interactions found in the memory logs.
+SEED_EXAMPLES: Dict[str, List[str]] = {
+    "GREETING": ["hi", "hello there", "good morning", "how are you", "thanks a lot", "who are you",
+                 "tell me a joke", "what can you do"],
+    "TODO": ["add buy groceries to my todo list", "what are my todos", "list my tasks",
+             "add a task to call mom", "show pending tasks", "remind me to pay rent"],
+    "SYSTEM": ["open notepad", "set volume to 50", "what is my system status", "take a screenshot",
+               "read the file notes.txt", "list files in downloads", "mute the volume",
+               "what time is it", "copy this to clipboard", "play next song"],
+    "BROWSER": ["navigate to google.com", "click the login button on the page", "open a new tab",
+                "fill the form on this website", "extract links from the page", "go back in the browser",
+                "read this web page"],
+    "DESKTOP": ["list all open windows", "focus the chrome window", "move the mouse to 500 300",
+                "click at 100 200", "type hello world and press enter", "maximize the window",
+                "drag from 100 100 to 500 500", "press ctrl c"],
+    "WEB_SEARCH": ["search for python tutorials", "who won the match yesterday", "latest news on ai",
+                   "look up the weather in delhi", "find information about black holes",
+                   "what is the population of india", "how do i install node on linux",
+                   "recommend a good laptop for students", "which operating system is better for gaming",
+                   "explain what a gpu does"],
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+
+def normalize_query(query: str) -> str:
+    """Lowercases and collapses whitespace so equivalent queries compare equal."""
+    return " ".join(query.lower().split())
+
+
+def _features(text: str) -> List[str]:
+    words = _TOKEN_RE.findall(text.lower())
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+class LocalIntentClassifier:
+    """
+    Local routing tier: regex rules first, then a TF-IDF nearest-centroid model.
+    Returns (category, confidence, tier) where tier is 'rules' or 'model'.
+    """
+
+    def __init__(self, categories: Dict[str, str], examples: Iterable[Tuple[str, str]] = (),
+                 temperature: float = 0.1):
+        self.categories = categories
+        self.temperature = temperature
+        self._rules = {
+            label: [re.compile(p) for p in patterns]
+            for label, patterns in RULES.items() if label in categories
+        }
+        self._idf: Dict[str, float] = {}
+        self._centroids: Dict[str, Dict[str, float]] = {}
+        self.fit(examples)
+
+    def fit(self, examples: Iterable[Tuple[str, str]] = ()):
+        """Trains the TF-IDF centroids from descriptions, seeds and extra (text, label) pairs."""
+        corpus: List[Tuple[str, str]] = []
+        for label, description in self.categories.items():
+            if label == "ALL":
+                continue
+            corpus.append((description, label))
+            corpus.extend((text, label) for text in SEED_EXAMPLES.get(label, []))
+        corpus.extend((text, label) for text, label in examples if label in self.categories and label != "ALL")
+
+        docs = [(Counter(_features(text)), label) for text, label in corpus]
+        df = Counter(term for counts, _ in docs for term in counts)
+        n = len(docs)
+        self._idf = {term: math.log((1 + n) / (1 + count)) + 1.0 for term, count in df.items()}
+
+        sums: Dict[str, Counter] = {}
+        for counts, label in docs:
+            sums.setdefault(label, Counter()).update(self._vectorize(counts))
+        self._centroids = {label: self._normalize(vec) for label, vec in sums.items()}
+
+    def _vectorize(self, counts: Counter) -> Dict[str, float]:
+        vec = {term: tf * self._idf[term] for term, tf in counts.items() if term in self._idf}
+        return self._normalize(vec)
+
+    @staticmethod
+    def _normalize(vec: Dict[str, float]) -> Dict[str, float]:
+        norm = math.sqrt(sum(v * v for v in vec.values()))
+        return {k: v / norm for k, v in vec.items()} if norm else {}
+
+    def match_rules(self, query: str) -> Optional[str]:
+        """Returns the single category whose rules match, or None if zero or several match."""
+        text = normalize_query(query)
+        matched = [label for label, patterns in self._rules.items() if any(p.search(text) for p in patterns)]
+        return matched[0] if len(matched) == 1 else None
+
+    def predict_model(self, query: str) -> Tuple[Optional[str], float]:
+        """Returns the best category and its softmax confidence under the TF-IDF model."""
+        vec = self._vectorize(Counter(_features(query)))
+        if not vec or not self._centroids:
+            return None, 0.0
+        scores = {
+            label: sum(weight * centroid.get(term, 0.0) for term, weight in vec.items())
+            for label, centroid in self._centroids.items()
+        }
+        best = max(scores, key=scores.get)
+        if scores[best] <= 0:
+            return None, 0.0
+        top = max(scores.values())
+        exp = {label: math.exp((s - top) / self.temperature) for label, s in scores.items()}
+        return best, exp[best] / sum(exp.values())
+
+    def predict(self, query: str) -> Tuple[Optional[str], float, str]:
+        """Classifies a query locally, trying the rules tier before the model tier."""
+        category = self.match_rules(query)
+        if category:
+            return category, 1.0, "rules"
+        category, confidence = self.predict_model(query)
+        return category, confidence, "model"
@@ -0,0 +1,212 @@
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from skills.tool_results import is_failure
+
+PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+# (tool_call, output) -> True if the call did not do its job. Tools report failures
+# as strings rather than raising; ToolExecutor.failed applies each tool's own check.
+FailureCheck = Callable[[dict, Any], bool]
+
+
+def _generic_failure(tool_call: dict, output: Any) -> bool:
+    return is_failure(output)
+
+
+def parameterize(value: Any, params: Dict[str, str]) -> Any:
+    """Replaces each param's recorded value with a {{name}} placeholder inside string args."""
+    if isinstance(value, str):
+        # Longest values first, so 'alice@example.com' wins over 'alice'
+        for name, recorded in sorted(params.items(), key=lambda item: -len(item[1])):
+            if recorded:
+                value = value.replace(recorded, "{{%s}}" % name)
+        return value
+    if isinstance(value, list):
+        return [parameterize(v, params) for v in value]
+    if isinstance(value, dict):
+        return {k: parameterize(v, params) for k, v in value.items()}
+    return value
+
+
+def render(value: Any, params: Dict[str, str]) -> Any:
+    """Fills {{name}} placeholders; raises KeyError for a param with no value."""
+    if isinstance(value, str):
+        return PLACEHOLDER_RE.sub(lambda m: str(params[m.group(1)]), value)
+    if isinstance(value, list):
+        return [render(v, params) for v in value]
+    if isinstance(value, dict):
+        return {k: render(v, params) for k, v in value.items()}
+    return value
+
+
+class MacroRecorder:
+    """Keeps the successful tool calls of the most recent agent turn so it can be saved."""
+
+    def __init__(self, failed: Optional[FailureCheck] = None):
+        self.request = ""
+        self.steps: List[Dict[str, Any]] = []
+        self.failed = failed or _generic_failure
+
+    def begin(self, request: str):
+        self.request = request
+        self.steps = []
+
+    def record(self, tool_call: dict, output: Any):
+        # Failed calls are left out: the model recovered from them, so the
+        # sequence that worked is what's worth replaying
+        if not self.failed(tool_call, output):
+            self.steps.append({"tool": tool_call["name"], "args": dict(tool_call.get("args") or {})})
+
+
+class ReplayResult:
+    def __init__(self, name: str, request: str, total: int):
+        self.name = name
+        self.request = request
+        self.total = total
+        self.outputs: List[str] = []
+        self.failed_step: Optional[Dict[str, Any]] = None
+        self.failure = ""
+        self.seconds = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.failed_step is None
+
+    def summary(self) -> str:
+        lines = [f"{i}. {str(output)[:200]}" for i, output in enumerate(self.outputs, 1)]
+        if self.ok:
+            lines.append(f"Macro '{self.name}' finished {self.total} steps in {self.seconds:.2f}s.")
+        else:
+            lines.append(f"{len(self.outputs) + 1}. {self.failed_step['tool']} failed: {self.failure[:300]}")
+        return "\n".join(lines)
+
+    def fallback_prompt(self) -> str:
+        """Hands a failed replay over to the model, with what already happened."""
+        done = "\n".join(f"- {str(output)[:200]}" for output in self.outputs) or "- (nothing)"
+        step = json.dumps(self.failed_step, ensure_ascii=False)
+        return (
+            f"{self.request}\n\n"
+            f"[A saved macro '{self.name}' for this task was replayed. These steps already succeeded:\n{done}\n"
+            f"Step {len(self.outputs) + 1} of {self.total} failed: {step}\nOutput: {self.failure[:500]}\n"
+            "Continue from the current state and finish the task.]"
+        )
+
+
+class MacroLibrary:
+    """
+    Named, parameterized tool-call sequences, stored as JSON.
+
+    A macro is saved from a MacroRecorder; the recorded value of each parameter is
+    turned into a {{name}} placeholder in the step args and kept as its default.
+    Replays run the steps in order through a tool runner, with no LLM involved,
+    and stop at the first step whose output is a failure according to `failed`.
+    """
+
+    def __init__(self, storage_file: Optional[str] = "data/macros.json", failed: Optional[FailureCheck] = None):
+        self.storage_file = storage_file
+        self.failed = failed or _generic_failure
+        self._macros: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def names(self) -> List[str]:
+        return sorted(self._macros)
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        return self._macros.get(name)
+
+    def save(self, name: str, recorder: MacroRecorder, params: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        if not recorder.steps:
+            raise ValueError("the last request made no successful tool calls to record")
+        if not re.fullmatch(r"[\w-]+", name):
+            raise ValueError(f"invalid macro name '{name}' (use letters, digits, '-' and '_')")
+        params = params or {}
+        steps = parameterize(recorder.steps, params)
+        unused = [p for p in params if "{{%s}}" % p not in json.dumps(steps)]
+        if unused:
+            raise ValueError(f"value of {', '.join(unused)} does not appear in any recorded step")
+        macro = {
+            "request": parameterize(recorder.request, params),
+            "params": dict(params),
+            "steps": steps,
+            "created": datetime.now().isoformat(timespec="seconds"),
+        }
+        with self._lock:
+            self._macros[name] = macro
+            self._save()
+        return macro
+
+    def delete(self, name: str) -> bool:
+        with self._lock:
+            removed = self._macros.pop(name, None) is not None
+            if removed:
+                self._save()
+        return removed
+
+    def describe(self, name: str) -> str:
+        macro = self._macros[name]
+        params = ", ".join(f"{k}={v}" for k, v in macro["params"].items())
+        tools = " → ".join(step["tool"] for step in macro["steps"])
+        return f"{name}({params}): {len(macro['steps'])} steps — {tools}"
+
+    def replay(self, name: str, run_step: Callable[[dict], str],
+               params: Optional[Dict[str, str]] = None) -> ReplayResult:
+        """
+        Runs macro `name`; run_step executes one tool call dict and returns its output.
+        Params not given fall back to the values recorded when the macro was saved.
+        """
+        macro = self._macros.get(name)
+        if macro is None:
+            raise KeyError(f"no macro named '{name}'")
+        values = {**macro["params"], **(params or {})}
+        result = ReplayResult(name, render(macro["request"], values), len(macro["steps"]))
+        start = time.perf_counter()
+        for i, step in enumerate(macro["steps"]):
+            args = render(step["args"], values)
+            tool_call = {"name": step["tool"], "args": args, "id": f"macro-{name}-{i}"}
+            output = run_step(tool_call)
+            if self.failed(tool_call, output):
+                result.failed_step = {"tool": step["tool"], "args": args}
+                result.failure = str(output)
+                break
+            result.outputs.append(str(output))
+        result.seconds = time.perf_counter() - start
+        return result
+
+    def _load(self):
+        if not self.storage_file or not os.path.exists(self.storage_file):
+            return
+        try:
+            with open(self.storage_file, 'r') as f:
+                self._macros = json.load(f).get("macros", {})
+        except (OSError, ValueError):
+            return
+
+    def _save(self):
+        if not self.storage_file:
+            return
+        os.makedirs(os.path.dirname(self.storage_file) or ".", exist_ok=True)
+        tmp_file = f"{self.storage_file}.tmp"
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump({"macros": self._macros}, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, self.storage_file)
+        except OSError:
+            pass
+
+
+def parse_params(tokens: List[str]) -> Dict[str, str]:
+    """['user=alice', 'site=example.com'] -> {'user': 'alice', 'site': 'example.com'}."""
+    params = {}
+    for token in tokens:
+        key, sep, value = token.partition("=")
+        if not sep or not re.fullmatch(r"\w+", key):
+            raise ValueError(f"expected name=value, got '{token}'")
+        params[key] = value
+    return params
@@ -1,37 +1,82 @@
-import json
 import os
 from datetime import datetime
+from typing import Dict, List, Optional
+from skills.storage import Store, date_bounds
+from agent.semantic_memory import SemanticMemory
 
 class Memory:
-    def __init__(self, storage_file: str = "data/memory.json"):
+    def __init__(self, storage_file: str = "data/memory.db"):
         self.storage_file = storage_file
-        self.data = self._load_memory()
-
-    def _load_memory(self):
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(self.storage_file), exist_ok=True)
-        if os.path.exists(self.storage_file):
-            with open(self.storage_file, 'r') as f:
-                return json.load(f)
-        return {"notes": [], "logs": []}
-
-    def save_memory(self):
-        with open(self.storage_file, 'w') as f:
-            json.dump(self.data, f, indent=4)
+        # Entries from the old single-file JSON format are imported on first open
+        legacy_json = os.path.splitext(storage_file)[0] + ".json"
+        self.store = Store(
+            storage_file, ["notes", "logs"], legacy_json=legacy_json,
+            indexes={"logs": ["route_tier"]},
+            text_fields={"notes": ["content"], "logs": ["user", "agent"]}
+        )
+        # Vector recall over notes and logs, loaded on first use
+        self.semantic = SemanticMemory(self.store)
 
     def add_note(self, content: str):
         timestamp = datetime.now().isoformat()
-        self.data["notes"].append({"timestamp": timestamp, "content": content})
-        self.save_memory()
+        note = {"timestamp": timestamp, "content": content}
+        self.semantic.add("notes", self.store.append("notes", note), note)
+
+    def get_notes(self) -> List[Dict]:
+        return self.store.all("notes")
+
+    def get_logs(self) -> List[Dict]:
+        return self.store.all("logs")
 
-    def get_notes(self):
-        return self.data["notes"]
+    def get_labeled_logs(self) -> List[Dict]:
+        """Returns interactions whose intent was decided by the LLM router."""
+        return self.store.find("logs", {"route_tier": "llm"})
 
-    def log_interaction(self, user_input: str, agent_response: str):
+    def log_interaction(self, user_input: str, agent_response: str,
+                        category: Optional[str] = None, route_tier: Optional[str] = None):
         timestamp = datetime.now().isoformat()
-        self.data["logs"].append({
+        entry = {
             "timestamp": timestamp,
             "user": user_input,
             "agent": agent_response
-        })
-        self.save_memory()
+        }
+        # Routing labels let the local intent classifier learn from past LLM decisions
+        if category:
+            entry["category"] = category
+            entry["route_tier"] = route_tier
+        self.semantic.add("logs", self.store.append("logs", entry), entry)
+
+    def recall(self, query: str, k: int = 3, min_score: float = 0.0) -> List[Dict]:
+        """Returns the stored notes/logs most similar in meaning to query."""
+        return self.semantic.recall(query, k, min_score)
+
+    def search(self, query: str, limit: int = 10):
+        """Full-text search over saved notes and past conversations."""
+        try:
+            notes = self.store.search("notes", query, limit)
+            logs = self.store.search("logs", query, limit)
+        except Exception as e:
+            return f"Error searching memory: {str(e)}"
+        if not notes and not logs:
+            return f"No notes or conversations matching '{query}'."
+        lines = [f"- [note {n['timestamp'][:10]}] {n['content']}" for n in notes]
+        lines += [f"- [chat {l['timestamp'][:10]}] You: {l['user']} | Viora: {l['agent'][:200]}" for l in logs]
+        return "\n".join(lines)
+
+    def entries_between(self, kind: str, start_date: str = "", end_date: str = "", limit: int = 50):
+        """Lists notes or logs between two dates (YYYY-MM-DD, inclusive)."""
+        if kind not in ("notes", "logs"):
+            return f"Invalid kind: {kind}. Valid kinds: ['notes', 'logs']"
+        try:
+            start, end = date_bounds(start_date or None, end_date or None)
+            entries = self.store.between(kind, start, end, limit)
+        except Exception as e:
+            return f"Error listing {kind}: {str(e)}"
+        if not entries:
+            return f"No {kind} found in that date range."
+        if kind == "notes":
+            return "\n".join(f"- [{n['timestamp'][:16]}] {n['content']}" for n in entries)
+        return "\n".join(f"- [{l['timestamp'][:16]}] You: {l['user']} | Viora: {l['agent'][:200]}" for l in entries)
+
+    def close(self):
+        self.store.close()
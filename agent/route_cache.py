@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from agent.intent import normalize_query
+
+
+def hash_categories(categories: Dict[str, str]) -> str:
+    """Fingerprint of the category table; any edit to labels or descriptions changes it."""
+    payload = json.dumps(categories, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()[:12]
+
+
+class RouteCache:
+    """
+    LRU cache of normalized query -> category routing decisions.
+    Keys include a hash of the category table so stale decisions are never served
+    after Router.categories changes. Optionally persisted to a JSON file.
+    """
+
+    def __init__(self, max_entries: int = 512, storage_file: Optional[str] = "data/route_cache.json"):
+        self.max_entries = max_entries
+        self.storage_file = storage_file
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    @staticmethod
+    def _key(query: str, table_hash: str) -> str:
+        return f"{table_hash}:{normalize_query(query)}"
+
+    def get(self, query: str, table_hash: str) -> Optional[str]:
+        key = self._key(query, table_hash)
+        with self._lock:
+            category = self._entries.get(key)
+            if category is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return category
+
+    def put(self, query: str, table_hash: str, category: str):
+        key = self._key(query, table_hash)
+        with self._lock:
+            self._entries[key] = category
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save()
+
+    def prune(self, table_hash: str):
+        """Drops decisions made under any other category table."""
+        prefix = f"{table_hash}:"
+        with self._lock:
+            stale = [key for key in self._entries if not key.startswith(prefix)]
+            for key in stale:
+                del self._entries[key]
+            if stale:
+                self._save()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._save()
+
+    def _load(self):
+        if not self.storage_file or not os.path.exists(self.storage_file):
+            return
+        try:
+            with open(self.storage_file, 'r') as f:
+                entries = json.load(f).get("entries", [])
+        except (OSError, ValueError):
+            return
+        # Stored oldest-first, so replaying preserves LRU order
+        for key, category in entries[-self.max_entries:]:
+            self._entries[key] = category
+
+    def _save(self):
+        if not self.storage_file:
+            return
+        os.makedirs(os.path.dirname(self.storage_file) or ".", exist_ok=True)
+        tmp_file = f"{self.storage_file}.tmp"
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump({"entries": list(self._entries.items())}, f)
+            os.replace(tmp_file, self.storage_file)
+        except OSError:
+            pass
@@ -1,27 +1,105 @@
 import os
-from typing import List, Literal
+import sqlite3
+from typing import List, Literal, Optional, Tuple
 from langchain_core.messages import SystemMessage, HumanMessage
-from langchain_groq import ChatGroq
+from agent.intent import LocalIntentClassifier
+from agent.memory import Memory
+from agent.route_cache import RouteCache, hash_categories
 
 class Router:
-    def __init__(self):
-        self.llm = ChatGroq(
-            model_name="llama-3.1-8b-instant",
-            temperature=0,
-            groq_api_key=os.getenv("GROQ_API_KEY")
-        )
+    def __init__(self, confidence_threshold: Optional[float] = None, memory_file: str = "data/memory.db",
+                 cache: Optional[RouteCache] = None):
+        # Created on the first query the local tiers can't answer
+        self._llm = None
         self.categories = {
             "GREETING": "Simple conversation, greetings, or small talk. No tools needed.",
-            "TODO": "Tasks related to managing todo lists (adding, listing).",
+            "TODO": "Tasks related to managing todo lists (adding, listing), and looking up notes, journal entries or past conversations.",
             "SYSTEM": "System-level operations like opening applications (notepad, chrome), listing files, reading/writing files, system status, volume control, and media control.",
             "BROWSER": "Web browser automation using Playwright (navigating, clicking, typing on web pages).",
             "DESKTOP": "Desktop automation using pywinauto (interacting with windows, mouse movements, keyboard typing).",
             "WEB_SEARCH": "Searching the internet for information.",
             "ALL": "General fallback when multiple tools from different categories might be needed."
         }
+        # Local answers below this confidence fall through to the LLM
+        if confidence_threshold is None:
+            confidence_threshold = float(os.getenv("VIORA_ROUTER_CONFIDENCE", "0.75"))
+        self.confidence_threshold = confidence_threshold
+        self.local = LocalIntentClassifier(self.categories, self._load_labeled_logs(memory_file))
+        # Memoized LLM decisions; set VIORA_ROUTE_CACHE=0 to keep the cache in memory only
+        if cache is None:
+            persist = os.getenv("VIORA_ROUTE_CACHE", "1") != "0"
+            cache = RouteCache(storage_file="data/route_cache.json" if persist else None)
+        self.cache = cache
+        self.cache.prune(hash_categories(self.categories))
+        # Which tier answered each query, for hit-rate measurement
+        self.last_tier: Optional[str] = None
+        self.last_confidence: Optional[float] = None
+        self.tier_counts = {"cache": 0, "rules": 0, "model": 0, "llm": 0}
+
+    @staticmethod
+    def _load_labeled_logs(memory_file: str) -> List[Tuple[str, str]]:
+        """Returns (query, category) pairs from past interactions routed by the LLM."""
+        try:
+            memory = Memory(memory_file)
+            logs = memory.get_labeled_logs()
+            memory.close()
+        except sqlite3.Error:
+            return []
+        return [(log["user"], log["category"]) for log in logs if log.get("category")]
 
     def classify(self, query: str) -> str:
-        """Classify the user query into a category."""
+        """Classify the user query into a category: cache, then local tier, then the LLM."""
+        table_hash = hash_categories(self.categories)
+        category = self.cache.get(query, table_hash)
+        if category in self.categories:
+            self._record("cache", None)
+            return category
+
+        category, confidence, tier = self.local.predict(query)
+        if category and confidence >= self.confidence_threshold:
+            self._record(tier, confidence)
+            return category
+
+        self._record("llm", None)
+        category = self._classify_with_llm(query)
+        if category:
+            self.cache.put(query, table_hash, category)
+            return category
+        # Not cached: the next attempt may get a usable answer
+        return "ALL"
+
+    def _record(self, tier: str, confidence: Optional[float]):
+        self.last_tier = tier
+        self.last_confidence = confidence
+        self.tier_counts[tier] = self.tier_counts.get(tier, 0) + 1
+
+    def get_stats(self) -> dict:
+        """Returns per-tier counts and the share of queries answered without the LLM."""
+        total = sum(self.tier_counts.values())
+        local = total - self.tier_counts.get("llm", 0)
+        return {
+            "tiers": self.tier_counts.copy(),
+            "total": total,
+            "local_hit_rate": local / total if total else 0.0,
+            "threshold": self.confidence_threshold
+        }
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            from langchain_groq import ChatGroq
+            self._llm = ChatGroq(
+                model_name="llama-3.1-8b-instant",
+                temperature=0,
+                groq_api_key=os.getenv("GROQ_API_KEY")
+            )
+        return self._llm
+
+    def _classify_with_llm(self, query: str) -> Optional[str]:
+        """
+        Classify the user query with a Groq round-trip. Returns None on routing errors
+        and on replies that aren't a known category, so neither gets cached.
+        """
         categories_text = "\n".join([f"- {k}: {v}" for k, v in self.categories.items()])
         prompt = f"""Classify the user query into exactly ONE of the following categories:
 {categories_text}
@@ -32,10 +110,9 @@ Return ONLY the category name in uppercase."""
         
         try:
             response = self.llm.invoke([HumanMessage(content=prompt)])
-            category = response.content.strip().upper()
-            if category in self.categories:
-                return category
-            return "ALL"
+            # Tolerate quoting and trailing punctuation ("DESKTOP.", "`SYSTEM`")
+            category = response.content.strip().strip("`'\".*: ").upper()
+            return category if category in self.categories else None
         except Exception as e:
             print(f"DEBUG: Routing error: {e}")
-            return "ALL"
+            return None
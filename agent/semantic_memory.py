@@ -0,0 +1,233 @@
+import json
+import re
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+class HashingEmbedder:
+    """
+    Network-free text embeddings: word unigrams/bigrams and character 3-grams are hashed
+    into a fixed number of signed buckets, then L2-normalized. Similar wording gives a
+    high cosine similarity; there is nothing to download or train.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def _features(self, text: str) -> List[str]:
+        words = _WORD_RE.findall(text.lower())
+        features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+        for word in words:
+            padded = f"<{word}>"
+            features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        return features
+
+    def embed(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for feature in self._features(text):
+            h = zlib.crc32(feature.encode("utf-8"))
+            vec[h % self.dim] += 1.0 if (h >> 31) & 1 else -1.0
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def embed_many(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.vstack([self.embed(t) for t in texts])
+
+
+class VectorIndex:
+    """
+    In-memory cosine-similarity index over unit vectors.
+    Below `ann_threshold` entries a query is an exact matrix-vector product. Above it,
+    an IVF (inverted file) index is trained with k-means: each vector is filed under its
+    nearest centroid and a query only scores the lists of the `nprobe` closest centroids.
+    New vectors are filed incrementally; the centroids are retrained once the index has
+    doubled since the last training.
+    """
+
+    def __init__(self, dim: int, ann_threshold: int = 20000, nprobe: int = 8):
+        self.dim = dim
+        self.ann_threshold = ann_threshold
+        self.nprobe = nprobe
+        self._vectors = np.zeros((1024, dim), dtype=np.float32)
+        self.keys: List[Tuple[str, int]] = []
+        self._rows: Dict[Tuple[str, int], int] = {}
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[List[int]] = []
+        self._trained_size = 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._vectors[:len(self.keys)]
+
+    def add(self, keys: List[Tuple[str, int]], vectors: np.ndarray):
+        """Files new vectors; a key already in the index has its vector replaced instead."""
+        fresh = []
+        for i, key in enumerate(keys):
+            row = self._rows.get(key)
+            if row is None:
+                fresh.append(i)
+            else:
+                self._vectors[row] = vectors[i]
+        if len(fresh) < len(keys):
+            keys = [keys[i] for i in fresh]
+            vectors = vectors[fresh]
+        if not keys:
+            return
+        start = len(self.keys)
+        needed = start + len(keys)
+        if needed > len(self._vectors):
+            grown = np.zeros((max(needed, 2 * len(self._vectors)), self.dim), dtype=np.float32)
+            grown[:start] = self._vectors[:start]
+            self._vectors = grown
+        self._vectors[start:needed] = vectors
+        self.keys.extend(keys)
+        self._rows.update((key, start + offset) for offset, key in enumerate(keys))
+
+        if needed >= self.ann_threshold and (self._centroids is None or needed >= 2 * self._trained_size):
+            self._train()
+        elif self._centroids is not None:
+            assignments = np.argmax(vectors @ self._centroids.T, axis=1)
+            for offset, cluster in enumerate(assignments):
+                self._lists[cluster].append(start + offset)
+
+    def _train(self, iterations: int = 6, sample_size: int = 20000):
+        vectors = self.vectors
+        n = len(vectors)
+        nlist = max(1, int(np.sqrt(n)))
+        rng = np.random.default_rng(0)
+        sample = vectors[rng.choice(n, size=min(n, sample_size), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            order = np.argsort(assignments, kind="stable")
+            clusters, starts = np.unique(assignments[order], return_index=True)
+            sums = np.zeros_like(centroids)
+            sums[clusters] = np.add.reduceat(sample[order], starts, axis=0)
+            norms = np.linalg.norm(sums, axis=1)
+            # Empty clusters keep their previous centroid
+            filled = norms > 0
+            centroids[filled] = sums[filled] / norms[filled, None]
+        self._centroids = centroids
+        # Assign in chunks to bound the size of the score matrix
+        assignments = np.concatenate([
+            np.argmax(vectors[s:s + 8192] @ centroids.T, axis=1) for s in range(0, n, 8192)
+        ])
+        order = np.argsort(assignments, kind="stable")
+        bounds = np.searchsorted(assignments[order], np.arange(nlist + 1))
+        self._lists = [order[bounds[c]:bounds[c + 1]].tolist() for c in range(nlist)]
+        self._trained_size = n
+
+    def search(self, query: np.ndarray, k: int = 5) -> List[Tuple[Tuple[str, int], float]]:
+        """Returns up to k (key, cosine similarity) pairs, best first."""
+        if not self.keys:
+            return []
+        if self._centroids is None:
+            candidates = None
+            scores = self.vectors @ query
+        else:
+            probes = np.argsort(self._centroids @ query)[::-1][:self.nprobe]
+            candidates = np.fromiter((i for p in probes for i in self._lists[p]), dtype=np.int64)
+            if not len(candidates):
+                return []
+            scores = self._vectors[candidates] @ query
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        rows = top if candidates is None else candidates[top]
+        return [(self.keys[row], float(scores[i])) for row, i in zip(rows, top)]
+
+
+class SemanticMemory:
+    """
+    Vector recall over a Store's notes and logs.
+    Embeddings are persisted in an `embeddings` table next to the documents so the index
+    loads with one query at startup; rows that have no embedding yet (older or migrated
+    data) are embedded on first load. The index is built lazily on the first recall.
+    """
+
+    # Text that gets embedded for each collection
+    FIELDS = {"notes": ("content",), "logs": ("user", "agent")}
+
+    def __init__(self, store, dim: int = 256):
+        self.store = store
+        self.embedder = HashingEmbedder(dim)
+        self.index: Optional[VectorIndex] = None
+        self._lock = threading.Lock()
+        store.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "kind TEXT NOT NULL, ref_id INTEGER NOT NULL, vec BLOB NOT NULL, PRIMARY KEY (kind, ref_id))"
+        )
+
+    def text_for(self, kind: str, item: Dict) -> str:
+        return " ".join(str(item.get(field, "")) for field in self.FIELDS[kind])
+
+    def add(self, kind: str, ref_id: int, item: Dict):
+        """Embeds and stores a new entry; also files it in the index if that is loaded."""
+        vec = self.embedder.embed(self.text_for(kind, item))
+        self.store.execute(
+            "INSERT OR REPLACE INTO embeddings (kind, ref_id, vec) VALUES (?, ?, ?)",
+            (kind, ref_id, vec.tobytes())
+        )
+        with self._lock:
+            # A background _load() may already have read this row from the table (or
+            # embedded it in _backfill); VectorIndex.add dedupes by key
+            if self.index is not None:
+                self.index.add([(kind, ref_id)], vec[None, :])
+
+    def preload(self):
+        """Builds the index on a background thread so the first recall doesn't wait for it."""
+        def load():
+            with self._lock:
+                if self.index is None:
+                    self._load()
+        threading.Thread(target=load, name="viora-memory-index", daemon=True).start()
+
+    def _load(self):
+        self._backfill()
+        index = VectorIndex(self.embedder.dim)
+        rows = self.store.execute("SELECT kind, ref_id, vec FROM embeddings")
+        if rows:
+            vectors = np.frombuffer(b"".join(r[2] for r in rows), dtype=np.float32).reshape(len(rows), -1)
+            index.add([(r[0], r[1]) for r in rows], vectors)
+        self.index = index
+
+    def _backfill(self, batch_size: int = 2000):
+        for kind in self.FIELDS:
+            while True:
+                rows = self.store.execute(
+                    f"SELECT id, data FROM {kind} WHERE id NOT IN "
+                    f"(SELECT ref_id FROM embeddings WHERE kind = ?) LIMIT ?", (kind, batch_size)
+                )
+                if not rows:
+                    break
+                vectors = self.embedder.embed_many([self.text_for(kind, json.loads(data)) for _, data in rows])
+                self.store.execute(
+                    "INSERT OR REPLACE INTO embeddings (kind, ref_id, vec) VALUES (?, ?, ?)",
+                    [(kind, row_id, vec.tobytes()) for (row_id, _), vec in zip(rows, vectors)],
+                    many=True
+                )
+
+    def recall(self, query: str, k: int = 3, min_score: float = 0.0) -> List[Dict]:
+        """Returns up to k stored entries most similar to query, each with 'kind' and 'score'."""
+        with self._lock:
+            if self.index is None:
+                self._load()
+            hits = self.index.search(self.embedder.embed(query), k)
+        results = []
+        for (kind, ref_id), score in hits:
+            if score < min_score:
+                continue
+            item = self.store.get(kind, ref_id)
+            if item is not None:
+                results.append({**item, "kind": kind, "score": score})
+        return results
@@ -0,0 +1,88 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from skills.tools_factory import PARALLEL, get_tool_concurrency, is_tool_failure
+
+def _init_serial_thread():
+    """Initializes COM on the serial worker so pywinauto/pycaw can be used from it."""
+    try:
+        import comtypes
+        comtypes.CoInitializeEx(comtypes.COINIT_APARTMENTTHREADED)
+    except Exception:
+        pass
+
+class ToolExecutor:
+    """
+    Runs the tool calls from one LLM response.
+    PARALLEL tools are dispatched to a thread pool; SERIAL tools run one after another
+    on a single dedicated thread, so thread-bound backends (Playwright's sync API, COM
+    objects) always see the same thread, whether called from the sync or the async
+    agent loop. SERIAL calls are barriers: parallel calls only overlap with their
+    neighbours up to the next serial call, so e.g. write_file then read_file in one
+    response reads the new contents. Outputs are always returned in the original call order.
+    """
+
+    def __init__(self, tools_map: Dict, max_workers: Optional[int] = None):
+        self.tools_map = tools_map
+        if max_workers is None:
+            max_workers = int(os.getenv("VIORA_TOOL_WORKERS", "4"))
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="viora-tool")
+        self._serial = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="viora-serial", initializer=_init_serial_thread
+        )
+
+    def invoke(self, tool_call: dict) -> str:
+        """Executes a single tool call, turning failures into an error string for the model."""
+        tool_name = tool_call["name"]
+        tool = self.tools_map.get(tool_name)
+        if tool is None:
+            return f"Tool {tool_name} not found."
+        try:
+            # For our specific tools, they are simple functions
+            return tool.func(**tool_call["args"])
+        except Exception as e:
+            return f"Error: {str(e)}"
+
+    def failed(self, tool_call: dict, output) -> bool:
+        """Whether output means the call failed, by the tool's own registered check."""
+        return is_tool_failure(self.tools_map.get(tool_call["name"]), output)
+
+    def _executor_for(self, tool_call: dict) -> ThreadPoolExecutor:
+        tool = self.tools_map.get(tool_call["name"])
+        if tool is not None and get_tool_concurrency(tool) == PARALLEL:
+            return self._pool
+        return self._serial
+
+    def _batches(self, tool_calls: List[dict]) -> List[Tuple[ThreadPoolExecutor, List[dict]]]:
+        """Splits calls into runs of consecutive calls on the same executor, in order."""
+        batches: List[Tuple[ThreadPoolExecutor, List[dict]]] = []
+        for call in tool_calls:
+            executor = self._executor_for(call)
+            if batches and batches[-1][0] is executor:
+                batches[-1][1].append(call)
+            else:
+                batches.append((executor, [call]))
+        return batches
+
+    def run(self, tool_calls: List[dict]) -> List[str]:
+        """Executes tool calls, overlapping the parallel-safe ones, and returns outputs in order."""
+        outputs = []
+        # Each batch finishes before the next starts; the serial worker is FIFO within one
+        for executor, calls in self._batches(tool_calls):
+            futures = [executor.submit(self.invoke, call) for call in calls]
+            outputs.extend(future.result() for future in futures)
+        return outputs
+
+    async def arun(self, tool_calls: List[dict]) -> List[str]:
+        """Async variant of run() for the streaming agent loop."""
+        loop = asyncio.get_running_loop()
+        outputs = []
+        for executor, calls in self._batches(tool_calls):
+            futures = [loop.run_in_executor(executor, self.invoke, call) for call in calls]
+            outputs.extend(await asyncio.gather(*futures))
+        return outputs
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+        self._serial.shutdown(wait=False)
@@ -0,0 +1,111 @@
+"""
+Benchmark: HTML-to-text extraction latency and peak memory on large pages.
+
+"before" is the old read_url path: the whole body parsed into a BeautifulSoup tree,
+chrome tags decomposed, the full text extracted and then cut to 4000 characters.
+"after" streams the same bytes in 64 KB chunks through skills.html_extract, once
+with each available parser, and stops once the budget is collected.
+
+Pages are saved HTML files passed with --files, or a synthetic page of --size-mb
+with the usual chrome (inline scripts, nav, sidebar, comments) around an article.
+Peak memory is Python allocations measured with tracemalloc.
+
+Usage: python benchmarks/bench_html_extract.py [--files page1.html ...] [--size-mb 5] [--runs 3]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skills.html_extract import available_parser, extract_text
+
+MAX_CHARS = 4000
+CHUNK = 64 * 1024
+
+
+def synthetic_page(size_mb: float) -> bytes:
+    nav = "<nav><ul>" + "".join(f'<li><a href="/s{i}">Section {i}</a></li>' for i in range(40)) + "</ul></nav>"
+    script = "<script>" + "var x = {'k': [1, 2, 3]};" * 400 + "</script>"
+    sidebar = '<div class="sidebar">' + "".join(f'<a href="/t{i}">tag{i}</a> ' for i in range(200)) + "</div>"
+    paragraph = ("<p>The quick brown fox jumps over the lazy dog while the committee debates the "
+                 "long-term effects of caching on page load latency and memory use.</p>")
+    comments = '<div class="comments">' + "<p>Great article, thanks!</p>" * 50 + "</div>"
+    # State classes on <body> (WordPress/Bootstrap style) must not hide the whole page
+    head = (f"<html><head><title>Big page</title><style>{'.a{color:red}' * 2000}</style>{script}</head>"
+            '<body class="home page-ads-free has-sidebar with-comments cookies-accepted modal-open">')
+    # Hyphenated chrome classes must still be dropped
+    promo = '<div class="ad-slot share-buttons">Sponsored: buy now</div>'
+    parts = [head, "<header><h1>Site name</h1></header>", nav, sidebar, promo, "<main><article><h1>Title</h1>"]
+    body = "".join(parts)
+    section = paragraph * 20 + script + comments
+    target = int(size_mb * 1024 * 1024)
+    sections = [body]
+    size = len(body)
+    while size < target:
+        sections.append(section)
+        size += len(section)
+    sections.append("</article></main><footer>Copyright</footer></body></html>")
+    return "".join(sections).encode("utf-8")
+
+
+def before(content: bytes) -> str:
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(content, 'html.parser')
+    for script in soup(["script", "style", "nav", "footer", "header", "noscript"]):
+        script.decompose()
+    text = soup.get_text()
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    text = '\n'.join(chunk for chunk in chunks if chunk)
+    return text[:MAX_CHARS]
+
+
+def after(content: bytes, parser: str) -> str:
+    chunks = (content[i:i + CHUNK] for i in range(0, len(content), CHUNK))
+    text, _ = extract_text(chunks, max_chars=MAX_CHARS, parser=parser)
+    return text[:MAX_CHARS]
+
+
+def measure(fn, runs: int):
+    timings = []
+    peak = 0
+    text = ""
+    for _ in range(runs):
+        tracemalloc.start()
+        start = time.perf_counter()
+        text = fn()
+        timings.append((time.perf_counter() - start) * 1000)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return sorted(timings)[len(timings) // 2], peak / (1024 * 1024), text
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--files", nargs="*", default=[])
+    parser.add_argument("--size-mb", type=float, default=5.0)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = [(path, open(path, "rb").read()) for path in args.files]
+    if not pages:
+        pages = [(f"synthetic {args.size_mb:g} MB", synthetic_page(args.size_mb))]
+
+    parsers = ["html.parser"] + (["lxml"] if available_parser() == "lxml" else [])
+    for name, content in pages:
+        print(f"{name}: {len(content) / (1024 * 1024):.1f} MB")
+        cases = [("before (bs4)", lambda: before(content))]
+        cases += [(f"after ({p})", lambda p=p: after(content, p)) for p in parsers]
+        for label, fn in cases:
+            median, peak, text = measure(fn, args.runs)
+            print(f"  {label:<20} median {median:9.1f} ms | peak {peak:8.1f} MB | {len(text)} chars")
+        print(f"  after, first line: {text.splitlines()[0][:80] if text else ''!r}")
+        if not args.files and ("quick brown fox" not in text or "Sponsored" in text):
+            sys.exit("  extraction check failed: article text missing or chrome kept on the synthetic page")
+
+
+if __name__ == "__main__":
+    main()
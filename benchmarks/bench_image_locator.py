@@ -0,0 +1,122 @@
+"""
+Benchmark: finding images on screen.
+
+- baseline: what pyautogui.locateOnScreen (pyscreeze) does per lookup: decode the
+  template file, then one full-resolution colour matchTemplate, best match only
+- ImageLocator: cached templates, shared grayscale pyramid, coarse-to-fine search
+  returning every match
+- multi-scale: the same templates on a frame scaled by 1.25 (125% display scaling)
+- region: the search restricted to a quarter of the screen
+
+Templates are cropped from the screenshot, so the expected positions are known.
+Usage: python benchmarks/bench_image_locator.py [--image screenshots/screenshot.png] [--templates 5]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from skills.image_locator import ImageLocator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def pick_boxes(frame: np.ndarray, count: int, size=(96, 48)):
+    """Crops with the most detail (highest variance), spread over the screen."""
+    height, width = frame.shape[:2]
+    gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY).astype(np.float32)
+    candidates = []
+    for y in range(0, height - size[1], size[1]):
+        for x in range(0, width - size[0], size[0]):
+            detail = float(gray[y:y + size[1], x:x + size[0]].std())
+            if detail > 5:
+                candidates.append((detail, x, y))
+    candidates.sort(reverse=True)
+    boxes = []
+    for _, x, y in candidates:
+        if all(abs(x - bx) > 2 * size[0] or abs(y - by) > 2 * size[1] for bx, by, _, _ in boxes):
+            boxes.append((x, y, *size))
+        if len(boxes) == count:
+            break
+    return boxes
+
+
+def baseline(frame_bgr: np.ndarray, path: str, confidence: float):
+    template = cv2.imread(path, cv2.IMREAD_COLOR)
+    scores = cv2.matchTemplate(frame_bgr, template, cv2.TM_CCOEFF_NORMED)
+    _, best, _, (x, y) = cv2.minMaxLoc(scores)
+    return (x, y) if best >= confidence else None
+
+
+def timed(func, repeat: int = 5):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def found(results, boxes, scale: float = 1.0, tolerance: int = 3) -> int:
+    hits = 0
+    for (path, matches), (x, y, _, _) in zip(results.items(), boxes):
+        ex, ey = round(x * scale), round(y * scale)
+        hits += any(abs(m.x - ex) <= tolerance and abs(m.y - ey) <= tolerance for m in matches)
+    return hits
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--image", default=os.path.join(ROOT, "screenshots", "screenshot.png"))
+    parser.add_argument("--templates", type=int, default=5)
+    parser.add_argument("--confidence", type=float, default=0.8)
+    args = parser.parse_args()
+
+    frame = np.ascontiguousarray(np.asarray(Image.open(args.image).convert("RGB")))
+    height, width = frame.shape[:2]
+    boxes = pick_boxes(frame, args.templates)
+    workdir = tempfile.mkdtemp(prefix="bench_locator_")
+    paths = []
+    for i, (x, y, w, h) in enumerate(boxes):
+        path = os.path.join(workdir, f"template_{i}.png")
+        Image.fromarray(frame[y:y + h, x:x + w]).save(path)
+        paths.append(path)
+    print(f"frame: {width}x{height} ({os.path.basename(args.image)}), {len(paths)} templates of {boxes[0][2]}x{boxes[0][3]}")
+
+    frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+    seconds, hits = timed(lambda: [baseline(frame_bgr, p, args.confidence) for p in paths], repeat=3)
+    correct = sum(hit == (x, y) for hit, (x, y, _, _) in zip(hits, boxes))
+    print(f"\n{'baseline (decode + colour, best only)':<40} {seconds * 1000:8.1f} ms  {correct}/{len(paths)} found")
+
+    locator = ImageLocator()
+    seconds, results = timed(lambda: locator.locate_all(frame, paths, confidence=args.confidence))
+    print(f"{'ImageLocator (all matches)':<40} {seconds * 1000:8.1f} ms  {found(results, boxes)}/{len(paths)} found")
+
+    scaled = np.ascontiguousarray(np.asarray(Image.fromarray(frame).resize((round(width * 1.25), round(height * 1.25)))))
+    scaled_bgr = cv2.cvtColor(scaled, cv2.COLOR_RGB2BGR)
+    _, hits = timed(lambda: [baseline(scaled_bgr, p, args.confidence) for p in paths], repeat=1)
+    print(f"\n125% scaled frame: baseline finds {sum(h is not None for h in hits)}/{len(paths)}")
+    seconds, results = timed(lambda: locator.locate_all(scaled, paths, confidence=args.confidence, scales=(1.0, 1.25)))
+    print(f"{'ImageLocator scales=(1.0, 1.25)':<40} {seconds * 1000:8.1f} ms  {found(results, boxes, 1.25)}/{len(paths)} found")
+
+    # The screen quarter holding the first template
+    region = (boxes[0][0] // (width // 2) * (width // 2), boxes[0][1] // (height // 2) * (height // 2),
+              width // 2, height // 2)
+    inside = [(path, box) for path, box in zip(paths, boxes)
+              if region[0] <= box[0] and box[0] + box[2] <= region[0] + region[2]
+              and region[1] <= box[1] and box[1] + box[3] <= region[1] + region[3]]
+    seconds, results = timed(lambda: locator.locate_all(frame, paths, confidence=args.confidence, region=region))
+    hits = sum(bool(results[path]) for path, _ in inside)
+    print(f"\n{'ImageLocator region (one quarter)':<40} {seconds * 1000:8.1f} ms  "
+          f"{hits}/{len(inside)} inside the region found")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark: wall time of a scripted 50-action mouse/keyboard sequence through
+DesktopTools with the old fixed pacing (PYAUTOGUI.PAUSE = 0.5, 0.5 s mouse moves,
+1 s drags, 50 ms per typed character) vs. InputPacer defaults and human mode.
+
+No input is sent: pyautogui is replaced by a model that sleeps exactly where
+PyAutoGUI does (PAUSE after each call, move/drag durations of 0.1 s or more,
+write/hotkey intervals). Event injection costs the same under every pacing, so
+the difference is the dead time pacing adds.
+Usage: python benchmarks/bench_input_pacing.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skills import desktop_tools
+from skills.desktop_tools import DesktopTools
+from skills.input_pacing import InputPacer
+
+MINIMUM_DURATION = 0.1  # PyAutoGUI moves shorter than this are instant
+
+
+class TimedPyAutoGUI:
+    """Reproduces PyAutoGUI's sleeps without touching the mouse or keyboard."""
+    FAILSAFE = True
+
+    def __init__(self, pause: float):
+        self.PAUSE = pause
+        self.calls = 0
+        self._pos = (0, 0)
+
+    @staticmethod
+    def easeOutQuad(n):
+        return n
+
+    def _pause(self):
+        self.calls += 1
+        if self.PAUSE:
+            time.sleep(self.PAUSE)
+
+    def position(self):
+        return self._pos
+
+    def moveTo(self, x, y, duration=0.0, tween=None):
+        if duration >= MINIMUM_DURATION:
+            time.sleep(duration)
+        self._pos = (x, y)
+        self._pause()
+
+    dragTo = moveTo
+
+    def click(self, x=None, y=None, button="left"):
+        self._pause()
+
+    def doubleClick(self, x=None, y=None):
+        self._pause()
+
+    def rightClick(self, x=None, y=None):
+        self._pause()
+
+    def press(self, key):
+        self._pause()
+
+    def hotkey(self, *keys, interval=0.0):
+        time.sleep(interval * len(keys))
+        self._pause()
+
+    def write(self, text, interval=0.0):
+        time.sleep(interval * len(text))
+        self._pause()
+
+    def scroll(self, clicks):
+        self._pause()
+
+
+def script(desktop: DesktopTools, legacy: bool = False, human: bool = False):
+    """50 actions: 10 moves, 15 clicks, 10 key presses, 5 hotkeys, 5 texts, 3 scrolls, 2 drags."""
+    move = {"duration": 0.5} if legacy else {"human": human}
+    typing = {"interval": 0.05} if legacy else {"human": human}
+    drag = {"duration": 1.0} if legacy else {"human": human}
+    click = {} if legacy else {"human": human}
+    for i in range(5):
+        desktop.move_mouse(200 + 40 * i, 300, **move)
+        desktop.click_at(200 + 40 * i, 300, **click)
+        desktop.click_at(400, 200 + 30 * i, **click)
+        desktop.press_key("tab")
+        desktop.type_text("hello world", **typing)
+        desktop.press_key("enter")
+        desktop.hotkey("ctrl", "s")
+        desktop.move_mouse(800, 100 + 50 * i, **move)
+        desktop.click_at(800, 100 + 50 * i, **click)
+        if i < 3:
+            desktop.scroll_mouse(-3)
+        if i < 2:
+            desktop.drag_and_drop(100, 100, 500, 400, **drag)
+
+
+def run(label: str, pause: float, pacer: InputPacer, **kwargs):
+    fake = TimedPyAutoGUI(pause)
+    desktop_tools.pyautogui = fake
+    desktop = DesktopTools(window_index=object(), pacer=pacer)
+    start = time.perf_counter()
+    script(desktop, **kwargs)
+    seconds = time.perf_counter() - start
+    print(f"{label:<32} {seconds:8.2f} s  ({seconds / 50 * 1000:7.1f} ms/action)")
+    return seconds
+
+
+def main():
+    print("50-action scripted sequence")
+    legacy = run("legacy (PAUSE=0.5, fixed anims)", 0.5, InputPacer(settle=0), legacy=True)
+    fast = run("InputPacer default", 0.0, InputPacer())
+    run("InputPacer human=True", 0.0, InputPacer(), human=True)
+    print(f"speedup (default vs legacy): {legacy / fast:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: Memory.log_interaction write latency, legacy JSON rewrite vs SQLite store.
+
+The legacy backend re-serializes the whole document on every call, so its cost grows
+with history size; logging all 100k interactions through it would take hours. It is
+therefore sampled at a few history sizes, while the new store logs every interaction.
+
+Usage: python benchmarks/bench_memory_log.py [--n 100000] [--samples 20]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agent.memory import Memory
+
+
+class LegacyJsonMemory:
+    """The previous implementation: append to a dict, rewrite the file with indent=4."""
+
+    def __init__(self, storage_file: str):
+        self.storage_file = storage_file
+        self.data = {"notes": [], "logs": []}
+
+    def log_interaction(self, user_input: str, agent_response: str):
+        self.data["logs"].append({
+            "timestamp": datetime.now().isoformat(),
+            "user": user_input,
+            "agent": agent_response
+        })
+        with open(self.storage_file, 'w') as f:
+            json.dump(self.data, f, indent=4)
+
+
+def entry(i: int):
+    return f"what are my todos for project {i}?", f"You have 3 pending tasks for project {i}. " * 3
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def summary(samples):
+    samples = sorted(samples)
+    mean = sum(samples) / len(samples)
+    return (f"mean {mean:8.3f} ms | p50 {samples[len(samples) // 2]:8.3f} ms | "
+            f"p99 {samples[min(len(samples) - 1, int(len(samples) * 0.99))]:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=100000)
+    parser.add_argument("--samples", type=int, default=20)
+    args = parser.parse_args()
+    checkpoints = sorted({size for size in (1000, 10000, 50000, args.n) if size <= args.n})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"SQLite store: logging {args.n:,} interactions")
+        memory = Memory(os.path.join(tmp, "memory.db"))
+        latencies = []
+        total_start = time.perf_counter()
+        for i in range(args.n):
+            user, agent = entry(i)
+            latencies.append(timed(lambda: memory.log_interaction(user, agent)))
+        total = time.perf_counter() - total_start
+        print(f"  all writes: {summary(latencies)} | total {total:.1f} s")
+        for size in checkpoints:
+            window = latencies[max(0, size - args.samples):size]
+            print(f"  at {size:>7,} entries: {summary(window)}")
+        memory.close()
+
+        print(f"Legacy JSON rewrite: {args.samples} writes sampled at each history size")
+        legacy = LegacyJsonMemory(os.path.join(tmp, "memory.json"))
+        for size in checkpoints:
+            while len(legacy.data["logs"]) < size - args.samples:
+                user, agent = entry(len(legacy.data["logs"]))
+                legacy.data["logs"].append({"timestamp": datetime.now().isoformat(), "user": user, "agent": agent})
+            samples = []
+            for i in range(args.samples):
+                user, agent = entry(size + i)
+                samples.append(timed(lambda: legacy.log_interaction(user, agent)))
+            print(f"  at {size:>7,} entries: {summary(samples)}")
+
+
+if __name__ == "__main__":
+    main()
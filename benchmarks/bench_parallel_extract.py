@@ -0,0 +1,90 @@
+"""
+Benchmark: scraping N pages with the serial navigate -> extract loop of BrowserTools
+vs. ParallelBrowser loading them concurrently in separate tabs.
+
+The fixture pages are served from a local HTTP server that adds --delay-ms of
+latency to every HTML response, standing in for network round-trips.
+
+Requires Playwright with Chromium installed (runs headless).
+Usage: python benchmarks/bench_parallel_extract.py [--pages 12] [--tabs 4] [--delay-ms 300]
+"""
+import argparse
+import functools
+import os
+import sys
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skills.browser_manager import BrowserManager
+from skills.browser_parallel import ParallelBrowser
+from skills.browser_tools import BrowserTools
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SPEC = [
+    {"name": "title", "selector": "title"},
+    {"name": "heading", "selector": "h1"},
+    {"name": "links", "op": "links", "limit": 10},
+]
+
+
+class SlowHandler(SimpleHTTPRequestHandler):
+    delay = 0.3
+
+    def do_GET(self):
+        if self.path.split("?")[0].endswith(".html"):
+            time.sleep(self.delay)
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=12)
+    parser.add_argument("--tabs", type=int, default=4)
+    parser.add_argument("--delay-ms", type=int, default=300)
+    args = parser.parse_args()
+
+    SlowHandler.delay = args.delay_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(SlowHandler, directory=FIXTURES))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    fixtures = ["login.html", "search.html", "settings.html"]
+    urls = [f"http://127.0.0.1:{server.server_port}/{fixtures[i % len(fixtures)]}?page={i}"
+            for i in range(args.pages)]
+
+    manager = BrowserManager(headless=True)
+    browser = BrowserTools(fast=True, manager=manager, profile="")
+    parallel = ParallelBrowser(max_tabs=args.tabs)
+    try:
+        # Warm both browsers so launch time isn't counted
+        browser.navigate_to(urls[0])
+        parallel.extract(urls[:1], SPEC)
+
+        start = time.perf_counter()
+        for url in urls:
+            browser.navigate_to(url)
+            browser.extract_data(SPEC)
+        serial = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = parallel.extract(urls, SPEC)
+        concurrent = time.perf_counter() - start
+        errors = sum(1 for r in results if "error" in r)
+
+        print(f"{args.pages} pages, {args.delay_ms} ms simulated latency per page")
+        print(f"serial   navigate+extract loop : {serial * 1000:8.1f} ms ({serial / args.pages * 1000:.1f} ms/page)")
+        print(f"parallel {args.tabs} tabs              : {concurrent * 1000:8.1f} ms "
+              f"({concurrent / args.pages * 1000:.1f} ms/page, {errors} errors)")
+        print(f"speedup: {serial / concurrent:.2f}x")
+    finally:
+        parallel.shutdown()
+        manager.shutdown()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
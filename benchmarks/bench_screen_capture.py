@@ -0,0 +1,91 @@
+"""
+Benchmark: the screen capture engine on a recorded screenshot.
+
+- pixel/region reads: a fresh grab per read (the old pyautogui.pixel / screenshot
+  path) vs. reads served from the frame buffer
+- encoding a full frame: PIL's default PNG (what take_screenshot used to write) vs.
+  fast PNG, JPEG, WebP and raw
+- dirty-region detection between two frames with a small change
+
+Frames come from SyntheticSource; --grab-ms simulates the cost of one grab.
+Usage: python benchmarks/bench_screen_capture.py [--image screenshots/screenshot.png] [--grab-ms 30]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PIL import Image
+
+from skills.screen_capture import ScreenCapture, SyntheticSource, dirty_regions, encode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed(func, repeat: int = 5):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--image", default=os.path.join(ROOT, "screenshots", "screenshot.png"))
+    parser.add_argument("--grab-ms", type=float, default=30)
+    parser.add_argument("--reads", type=int, default=20)
+    args = parser.parse_args()
+
+    frame = np.asarray(Image.open(args.image).convert("RGB"))
+    height, width = frame.shape[:2]
+    print(f"frame: {width}x{height} ({os.path.basename(args.image)}), simulated grab {args.grab_ms} ms")
+
+    points = [(int(x), int(y)) for x, y in zip(np.linspace(10, width - 10, args.reads),
+                                                 np.linspace(10, height - 10, args.reads))]
+    capture = ScreenCapture(SyntheticSource([frame], grab_delay=args.grab_ms / 1000), max_age=1.0)
+    start = time.perf_counter()
+    for x, y in points:
+        capture.pixel(x, y, max_age=0)
+    fresh = time.perf_counter() - start
+    capture.invalidate()
+    start = time.perf_counter()
+    for x, y in points:
+        capture.pixel(x, y)
+    buffered = time.perf_counter() - start
+    print(f"\n{args.reads} pixel reads")
+    print(f"  grab per read : {fresh * 1000:8.1f} ms")
+    print(f"  frame buffer  : {buffered * 1000:8.1f} ms ({capture.grabs - args.reads} grab)")
+
+    print("\nfull-frame encoding")
+    image = Image.fromarray(frame)
+
+    def pil_default_png():
+        buffer = io.BytesIO()
+        image.save(buffer, "PNG")
+        return buffer.getvalue()
+
+    rows = [("PNG (PIL default)", pil_default_png)]
+    rows += [(label, lambda fmt=fmt: encode(frame, fmt)) for label, fmt in
+             (("PNG (fast)", "png"), ("JPEG q80", "jpeg"), ("WebP q80", "webp"), ("raw", "raw"))]
+    for label, func in rows:
+        seconds, data = timed(func, repeat=3)
+        print(f"  {label:<18} {seconds * 1000:8.1f} ms {len(data) / 1024:10.0f} KiB")
+
+    changed = frame.copy()
+    changed[400:440, 600:900] = 255 - changed[400:440, 600:900]
+    changed[1000:1010, 1800:1850] = 0
+    seconds, regions = timed(lambda: dirty_regions(frame, changed))
+    print(f"\ndirty regions (32 px tiles): {seconds * 1000:.1f} ms -> {regions}")
+    same = frame.copy()
+    seconds, regions = timed(lambda: dirty_regions(frame, same))
+    print(f"unchanged frame:             {seconds * 1000:.1f} ms -> {regions}")
+
+
+if __name__ == "__main__":
+    main()
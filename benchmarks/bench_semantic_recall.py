@@ -0,0 +1,91 @@
+"""
+Benchmark: semantic memory recall at scale.
+
+Logs N synthetic interactions through Memory (embedding each incrementally), then
+reports index load time, per-query latency and IVF recall@k against exact search.
+
+Usage: python benchmarks/bench_semantic_recall.py [--n 100000] [--queries 200] [--k 5]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from agent.memory import Memory
+from agent.semantic_memory import VectorIndex
+
+TOPICS = ["python", "groceries", "meeting", "flight", "invoice", "birthday", "gym", "budget",
+          "laptop", "dentist", "report", "vacation", "router", "recipe", "deadline", "movie"]
+VERBS = ["remind me about", "what did I say about", "add a note on", "summarize", "schedule", "cancel"]
+
+
+def synthetic(rng: random.Random):
+    topic, other = rng.sample(TOPICS, 2)
+    user = f"{rng.choice(VERBS)} the {topic} {rng.randint(1, 500)} and {other}"
+    return user, f"Okay, noted the {topic} details for {other} number {rng.randint(1, 10000)}."
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "memory.db")
+        memory = Memory(path)
+        start = time.perf_counter()
+        for _ in range(args.n):
+            memory.log_interaction(*synthetic(rng))
+        elapsed = time.perf_counter() - start
+        print(f"logged {args.n:,} interactions: {elapsed * 1e6 / args.n:.1f} us/write incl. embedding")
+        memory.close()
+
+        memory = Memory(path)
+        start = time.perf_counter()
+        memory.recall("warm up")
+        print(f"index load on first recall: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        semantic = memory.semantic
+        queries = [synthetic(rng)[0] for _ in range(args.queries)]
+        vectors = [semantic.embedder.embed(q) for q in queries]
+
+        exact = VectorIndex(semantic.embedder.dim, ann_threshold=10 ** 12)
+        exact.add(semantic.index.keys, semantic.index.vectors)
+
+        for label, index in (("exact", exact), ("ivf", semantic.index)):
+            start = time.perf_counter()
+            for vec in vectors:
+                index.search(vec, args.k)
+            per_query = (time.perf_counter() - start) * 1000 / len(vectors)
+            print(f"{label:<6} search: {per_query:.3f} ms/query")
+
+        overlap = []
+        for vec in vectors:
+            truth = {key for key, _ in exact.search(vec, args.k)}
+            found = {key for key, _ in semantic.index.search(vec, args.k)}
+            overlap.append(len(truth & found) / max(1, len(truth)))
+        print(f"ivf recall@{args.k} vs exact: {np.mean(overlap):.3f}")
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            memory.log_interaction(*synthetic(rng))
+        print(f"incremental add with loaded index: {(time.perf_counter() - start):.3f} ms/write")
+
+        start = time.perf_counter()
+        for q in queries:
+            memory.recall(q, k=args.k)
+        print(f"end-to-end Memory.recall: {(time.perf_counter() - start) * 1000 / len(queries):.3f} ms/query")
+        memory.close()
+
+
+if __name__ == "__main__":
+    main()
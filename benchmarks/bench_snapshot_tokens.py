@@ -0,0 +1,121 @@
+"""
+Benchmark: tool-output tokens per step and steps per task for page interaction,
+selector-based tools vs. ref-based snapshot tools, on local fixture pages.
+
+"before" follows the old flow: read the page (browser_get_page_content), act by CSS
+selector, then read the page text again to see the outcome. "after" takes one
+snapshot, acts by ref, and reads the outcome from the diff each action returns.
+Each task is scripted, so steps here are tool calls; tokens use the same estimate
+as the conversation context budget.
+
+Requires Playwright with Chromium installed (runs headless).
+Usage: python benchmarks/bench_snapshot_tokens.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.messages import ToolMessage
+
+from agent.context import estimate_tokens
+from skills import page_snapshot
+from skills.browser_manager import BrowserManager
+from skills.browser_tools import BrowserTools
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def fixture_url(name: str) -> str:
+    return "file:///" + os.path.join(FIXTURES, name).replace(os.sep, "/").lstrip("/")
+
+
+def tokens(output: str) -> int:
+    return estimate_tokens(ToolMessage(content=output, tool_call_id="bench"))
+
+
+def find_ref(browser: BrowserTools, name: str) -> int:
+    snapshot = browser.manager.run(page_snapshot.take, browser.page)
+    for item in snapshot["items"]:
+        if item["name"] == name:
+            return item["ref"]
+    raise LookupError(f"no element named {name!r}")
+
+
+# (fixture, before steps, after steps). A step is (method, args); in "after" steps a
+# string argument starting with '@' is resolved to the ref of the element with that name.
+TASKS = {
+    "login": ("login.html", [
+        ("get_page_content", ()),
+        ("type_text", ("#email", "me@example.com")),
+        ("type_text", ("#password", "hunter2")),
+        ("click_element", ("#signin",)),
+        ("get_all_text", ()),
+    ], [
+        ("snapshot", ()),
+        ("type_ref", ("@Email", "me@example.com")),
+        ("type_ref", ("@Password", "hunter2")),
+        ("click_ref", ("@Sign in",)),
+    ]),
+    "search": ("search.html", [
+        ("get_page_content", ()),
+        ("type_text", ("#q", "caching")),
+        ("click_element", ("button[type=submit]",)),
+        ("get_page_content", ()),
+        ("click_element", ("#results li:nth-child(3) a",)),
+        ("get_all_text", ()),
+    ], [
+        ("snapshot", ()),
+        ("type_ref", ("@Search docs", "caching", True)),
+        ("click_ref", ("@caching guide, part 3",)),
+    ]),
+    "settings": ("settings.html", [
+        ("get_page_content", ()),
+        ("check_checkbox", ("#dark", True)),
+        ("select_dropdown", ("#digest", "Weekly")),
+        ("click_element", ("#save",)),
+        ("get_all_text", ()),
+    ], [
+        ("snapshot", ()),
+        ("click_ref", ("@Dark mode",)),
+        ("type_ref", ("@Digest frequency", "Weekly")),
+        ("click_ref", ("@Save",)),
+    ]),
+}
+
+
+def run_steps(browser: BrowserTools, fixture: str, steps, resolve_refs: bool):
+    browser.navigate_to(fixture_url(fixture))
+    counts = []
+    for method, args in steps:
+        if resolve_refs:
+            args = tuple(find_ref(browser, a[1:]) if isinstance(a, str) and a.startswith("@") else a
+                         for a in args)
+        output = getattr(browser, method)(*args)
+        if output.startswith("Error"):
+            raise RuntimeError(f"{method}{args}: {output}")
+        counts.append(tokens(output))
+    return counts
+
+
+def main():
+    manager = BrowserManager(headless=True)
+    browser = BrowserTools(fast=True, manager=manager, profile="")
+    totals = {"before": [0, 0], "after": [0, 0]}
+    try:
+        print(f"{'task':<10} {'mode':<7} {'steps':>5} {'tokens':>7} {'tokens/step':>12}")
+        for name, (fixture, before, after) in TASKS.items():
+            for mode, steps in (("before", before), ("after", after)):
+                counts = run_steps(browser, fixture, steps, resolve_refs=mode == "after")
+                totals[mode][0] += len(counts)
+                totals[mode][1] += sum(counts)
+                print(f"{name:<10} {mode:<7} {len(counts):>5} {sum(counts):>7} {sum(counts) / len(counts):>12.1f}")
+                browser.close_browser()
+        for mode, (steps, total) in totals.items():
+            print(f"{'all':<10} {mode:<7} {steps:>5} {total:>7} {total / steps:>12.1f}")
+    finally:
+        manager.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Startup benchmark: import cost of main.py and wall time of quick CLI commands.
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter, prints the
+slowest imports by cumulative time and checks that none of the heavy optional
+backends (Playwright, pyautogui, LLM provider SDKs, ...) are loaded at startup.
+Then times `python main.py todos` end to end.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--top 15] [--budget-ms 1500]
+Exits with status 1 if a heavy module is imported or the median `todos` run
+exceeds --budget-ms.
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be imported by the tools/commands that use them
+HEAVY_MODULES = [
+    "playwright", "pyautogui", "pywinauto", "psutil", "PIL", "comtypes", "pycaw",
+    "langchain_groq", "langchain_google_genai", "langchain_community",
+    "duckduckgo_search", "ddgs", "bs4", "requests", "numpy", "agent.brain",
+]
+
+_LINE_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_report(env: dict) -> list:
+    """Returns (cumulative_us, self_us, depth, module) tuples for `import main`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=ROOT, env=env, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        sys.exit(f"import main failed:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((int(cumulative_us), int(self_us), (len(indent) - 1) // 2, module))
+    return rows
+
+
+def time_command(args: list, env: dict, runs: int) -> list:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "main.py", *args], cwd=ROOT, env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    return sorted(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="0")
+    rows = import_report(env)
+    total_ms = sum(r[0] for r in rows if r[2] == 0) / 1000
+
+    print(f"import main: {total_ms:.1f} ms cumulative ({len(rows)} modules)")
+    print(f"Top {args.top} imports by cumulative time:")
+    for cumulative_us, self_us, depth, module in sorted(rows, reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:9.1f} ms  (self {self_us / 1000:7.1f} ms)  {module}")
+
+    loaded = {r[3] for r in rows}
+    leaked = [m for m in HEAVY_MODULES if m in loaded]
+    if leaked:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(leaked)}")
+    else:
+        print("OK: no heavy modules imported at startup")
+
+    samples = time_command(["todos"], env, args.runs)
+    median = samples[len(samples) // 2]
+    print(f"main.py todos: median {median:.1f} ms | min {samples[0]:.1f} ms | max {samples[-1]:.1f} ms "
+          f"(budget {args.budget_ms:.0f} ms, {args.runs} runs)")
+
+    if leaked or median > args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Micro-benchmark: per-turn overhead of tool construction and LLM tool binding.
+
+"before" rebuilds every skill backend, all StructuredTool wrappers and a fresh
+bound LLM client on each round-trip (the old Brain._get_llm_for_category path).
+"after" goes through the process-wide registry and bound-LLM cache.
+
+Usage: python benchmarks/bench_tool_setup.py [--turns 20] [--category ALL]
+No network calls are made; a placeholder API key is used if none is set.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("GROQ_API_KEY", "benchmark-placeholder")
+os.environ.setdefault("GOOGLE_API_KEY", "benchmark-placeholder")
+
+from agent.brain import Brain, _llm_cache
+from skills import tools_factory
+
+
+def time_turns(fn, turns: int) -> list:
+    samples = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(label: str, samples: list):
+    samples = sorted(samples)
+    mean = sum(samples) / len(samples)
+    p50 = samples[len(samples) // 2]
+    print(f"{label:<8} mean {mean:9.3f} ms | p50 {p50:9.3f} ms | max {samples[-1]:9.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--category", default="ALL")
+    args = parser.parse_args()
+
+    brain = Brain()
+
+    def uncached_turn():
+        # Mirrors the old code path: rebuild the registry and bind a new client.
+        tools_factory.reset_viora_tools()
+        brain._build_llm_for_category(args.category)
+
+    def cached_turn():
+        brain._get_llm_for_category(args.category)
+
+    before = time_turns(uncached_turn, args.turns)
+
+    tools_factory.reset_viora_tools()
+    _llm_cache.clear()
+    start = time.perf_counter()
+    cached_turn()
+    first = (time.perf_counter() - start) * 1000
+    after = time_turns(cached_turn, args.turns)
+
+    print(f"Per-turn setup overhead, category={args.category}, provider={brain.provider}, turns={args.turns}")
+    report("before", before)
+    print(f"{'first':<8} {first:9.3f} ms (one-time cost per process)")
+    report("after", after)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""
+Check + benchmark: the web caches and read_urls limits against a local HTTP server.
+
+- page cache: a fresh hit makes no request, an expired ETag entry is revalidated
+  with a 304 (not re-parsed), no-store pages are never cached, max-age entries
+  expire on time
+- search cache: WebSearch with a stub backend (itself querying the local server);
+  rephrasings share an entry, "c++" and "c" don't, empty results aren't cached
+- read_urls: at most per_host requests per host at a time, and the pages share
+  max_chars, with text a short page doesn't use going to the long one
+
+Exits non-zero if any check fails.
+Usage: python benchmarks/bench_web_cache.py [--delay-ms 100]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+from skills.cache import TTLCache
+from skills.web_search import WebSearch
+from skills.web_tools import WebTools
+
+WORDS = "the quick brown fox jumps over the lazy dog while the cache keeps the text "
+
+
+def page(chars: int) -> bytes:
+    text = (WORDS * (chars // len(WORDS) + 1))[:chars]
+    return f"<html><head><title>t</title></head><body><p>{text}</p></body></html>".encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    """
+    /etag      max-age=0 with an ETag; answers If-None-Match with 304
+    /no-store  Cache-Control: no-store
+    /max-age   Cache-Control: max-age=1
+    /text?chars=N&delay=S   N characters of text after S seconds
+    /search?q=Q             JSON results for the stub search backend
+    """
+    delay = 0.1
+
+    def do_GET(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        with server.lock:
+            server.requests[parts.path] += 1
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+        try:
+            if parts.path == "/etag":
+                if self.headers.get("If-None-Match") == '"v1"':
+                    server.requests["304"] += 1
+                    self.send_response(304)
+                    self.send_header("ETag", '"v1"')
+                    self.send_header("Cache-Control", "max-age=0")
+                    self.end_headers()
+                    return
+                self.reply(page(2000), {"ETag": '"v1"', "Cache-Control": "max-age=0"})
+            elif parts.path == "/no-store":
+                self.reply(page(2000), {"Cache-Control": "no-store"})
+            elif parts.path == "/max-age":
+                self.reply(page(2000), {"Cache-Control": "max-age=1"})
+            elif parts.path == "/text":
+                time.sleep(float(query.get("delay", 0)))
+                self.reply(page(int(query.get("chars", 1000))), {"Cache-Control": "no-store"})
+            elif parts.path == "/search":
+                q = query.get("q", "")
+                body = "[]" if q == "nothing" else f'[{{"title": "{q}", "url": "http://example.com/{len(q)}", "snippet": ""}}]'
+                self.reply(body.encode(), {"Content-Type": "application/json"})
+            else:
+                self.send_error(404)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def reply(self, body: bytes, headers: dict):
+        self.send_response(200)
+        self.send_header("Content-Type", headers.pop("Content-Type", "text/html; charset=utf-8"))
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.lock = threading.Lock()
+    server.requests = Counter()
+    server.active = server.peak = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def sections(output: str) -> dict:
+    """read_urls output as {url: text}."""
+    found = {}
+    for block in output.split("\n\n--- "):
+        header, _, text = block.lstrip("- ").partition(" ---\n")
+        found[header.replace("Content of ", "")] = text
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--delay-ms", type=int, default=100)
+    args = parser.parse_args()
+    delay = args.delay_ms / 1000
+
+    server, other = start_server(), start_server()
+    base = f"http://127.0.0.1:{server.server_port}"
+    session = requests.Session()
+    session.trust_env = False  # No proxy for the local server
+    web = WebTools(cache=TTLCache(max_entries=64, default_ttl=300), session=session)
+    failures = []
+
+    def check(ok: bool, label: str):
+        print(f"  [{'ok' if ok else 'FAIL'}] {label}")
+        if not ok:
+            failures.append(label)
+
+    print("page cache")
+    ms_miss, text = timed(lambda: web.fetch_text(f"{base}/etag"))
+    ms_revalidated, again = timed(lambda: web.fetch_text(f"{base}/etag"))
+    check(server.requests["/etag"] == 2 and server.requests["304"] == 1 and again == text,
+          f"expired ETag entry revalidated with 304 ({ms_miss:.1f} ms miss, {ms_revalidated:.1f} ms revalidated)")
+
+    web.fetch_text(f"{base}/no-store")
+    web.fetch_text(f"{base}/no-store")
+    check(server.requests["/no-store"] == 2 and web.cache.get_entry(f"{base}/no-store") is None,
+          "no-store page fetched every time and never cached")
+
+    web.fetch_text(f"{base}/max-age")
+    ms_hit, _ = timed(lambda: web.fetch_text(f"{base}/max-age"))
+    check(server.requests["/max-age"] == 1, f"max-age=1 page served from cache while fresh ({ms_hit:.2f} ms hit)")
+    time.sleep(1.1)
+    web.fetch_text(f"{base}/max-age")
+    check(server.requests["/max-age"] == 2, "max-age=1 page refetched once expired")
+
+    print("search cache (stub backend)")
+    calls = []
+
+    def backend(query, max_results):
+        calls.append(query)
+        return session.get(f"{base}/search", params={"q": query}, timeout=5).json()[:max_results]
+
+    search = WebSearch(backend=backend, cache=TTLCache(max_entries=64, default_ttl=300))
+    search.search("Python tutorial")
+    search.search("  python   TUTORIAL?")
+    check(len(calls) == 1, "rephrasing (case, spacing, trailing '?') shares one entry")
+    search.search("c++")
+    search.search("c")
+    check(len(calls) == 3, "'c++' and 'c' are separate entries")
+    search.search("nothing")
+    search.search("nothing")
+    check(len(calls) == 5, "empty results are not cached")
+    output = search.multi_search(["Rust book", "rust book.", "Go tour"])
+    check(len(calls) == 7 and output.count("--- Results for") == 2, "multi_search runs normalized duplicates once")
+    check("--- Results for 'Zig'" in search.multi_search("Zig"), "multi_search accepts a single query string")
+
+    print(f"read_urls (per_host={web.per_host}, {args.delay_ms} ms per page)")
+    urls = [f"{base}/text?chars=500&delay={delay}&n={i}" for i in range(6)]
+    ms_one_host, _ = timed(lambda: web.read_urls(urls))
+    check(server.peak <= web.per_host, f"one host: at most {web.per_host} requests at a time "
+                                       f"(peak {server.peak}, {ms_one_host:.0f} ms for {len(urls)} pages)")
+    server.peak = 0
+    mixed = urls[:3] + [f"http://127.0.0.1:{other.server_port}/text?chars=500&delay={delay}&n={i}" for i in range(3)]
+    ms_two_hosts, _ = timed(lambda: web.read_urls(mixed))
+    check(server.peak <= web.per_host and other.peak <= web.per_host and ms_two_hosts < ms_one_host,
+          f"two hosts: limited per host, not overall ({ms_two_hosts:.0f} ms)")
+
+    short, long = f"{base}/text?chars=300", f"{base}/text?chars=8000"
+    texts = sections(web.read_urls([short, long], max_chars=3000))
+    short_text, long_text = texts.get(short, ""), texts.get(long, "")
+    check("Truncated" not in short_text and len(short_text) >= 290, f"short page kept whole ({len(short_text)} chars)")
+    long_chars = len(long_text.replace("\n...[Content Truncated]...", ""))
+    check(1500 < long_chars and len(short_text) + long_chars <= 3000,
+          f"long page gets the unused share, total within max_chars ({len(short_text)} + {long_chars} <= 3000)")
+    check(sections(web.read_urls(short)).get(short) == short_text, "read_urls accepts a single URL string")
+
+    server.shutdown()
+    other.shutdown()
+    if failures:
+        sys.exit(f"{len(failures)} check(s) failed")
+    print("all checks passed")
+
+
+if __name__ == "__main__":
+    main()
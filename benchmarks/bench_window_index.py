@@ -0,0 +1,119 @@
+"""
+Benchmark: a burst of window commands with a full UIA enumeration and title scan per
+call (the old DesktopTools behaviour) vs. the cached WindowIndex.
+
+Runs anywhere: windows come from a fake provider that charges a simulated COM
+round-trip (--com-ms) for every property read, like pywinauto's UIA wrappers do.
+Usage: python benchmarks/bench_window_index.py [--windows 40] [--commands 20] [--com-ms 1.5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skills.desktop_tools import DesktopTools
+from skills.window_index import WindowIndex, WindowInfo, WindowProvider
+
+APPS = ["Notepad", "Google Chrome", "Visual Studio Code", "File Explorer", "Calculator", "Spotify",
+        "Microsoft Teams", "Slack", "Windows Terminal", "Outlook"]
+
+
+class FakeWindow:
+    """Stands in for a pywinauto wrapper; every property read costs one COM call."""
+
+    def __init__(self, handle, title, delay, provider=None):
+        self.handle, self._title, self._delay = handle, title, delay
+        self._provider = provider
+
+    def _com(self):
+        time.sleep(self._delay)
+
+    def window_text(self):
+        self._com()
+        return self._title
+
+    def set_focus(self):
+        self._com()
+        if self._provider is not None:
+            self._provider.focused = self.handle
+
+    def minimize(self):
+        self._com()
+
+    maximize = restore = minimize
+
+
+class FakeProvider(WindowProvider):
+    def __init__(self, titles, delay):
+        self.wrappers = {1000 + i: FakeWindow(1000 + i, title, delay, self) for i, title in enumerate(titles)}
+        self.delay = delay
+        self.focused = None
+
+    def enumerate(self):
+        time.sleep(self.delay)  # the Desktop().windows() call itself
+        windows = []
+        for handle, win in self.wrappers.items():
+            title = win.window_text()
+            win._com()  # rectangle()
+            win._com()  # process_id()
+            windows.append(WindowInfo(handle, title, (0, 0, 800, 600), handle, "app.exe"))
+        return windows
+
+    def window(self, handle):
+        return self.wrappers[handle]
+
+    def exists(self, handle):
+        return handle in self.wrappers
+
+    def foreground(self):
+        time.sleep(self.delay)
+        return self.focused
+
+
+def scan_focus(provider, title):
+    """The old per-call path: enumerate everything, read each title, substring match."""
+    time.sleep(provider.delay)
+    for win in provider.wrappers.values():
+        if title.lower() in win.window_text().lower():
+            win.set_focus()
+            return win.window_text()
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--windows", type=int, default=40)
+    parser.add_argument("--commands", type=int, default=20)
+    parser.add_argument("--com-ms", type=float, default=1.5)
+    args = parser.parse_args()
+
+    random.seed(0)
+    titles = [f"Document {i} - {APPS[i % len(APPS)]}" for i in range(args.windows)]
+    queries = [random.choice(titles).split(" - ")[0] for _ in range(args.commands)]
+    provider = FakeProvider(titles, args.com_ms / 1000)
+
+    start = time.perf_counter()
+    for query in queries:
+        scan_focus(provider, query)
+    scan = time.perf_counter() - start
+
+    index = WindowIndex(provider, ttl=60)
+    desktop = DesktopTools(window_index=index)
+    start = time.perf_counter()
+    for query in queries:
+        result = desktop.focus_window(query)
+        assert result.startswith("Focused"), result
+    indexed = time.perf_counter() - start
+
+    print(f"{args.commands} focus commands, {args.windows} windows, {args.com_ms} ms per COM call")
+    print(f"scan per call : {scan * 1000:8.1f} ms ({scan / args.commands * 1000:.2f} ms/command)")
+    print(f"window index  : {indexed * 1000:8.1f} ms ({indexed / args.commands * 1000:.2f} ms/command, "
+          f"{index.refreshes} enumeration)")
+    print(f"speedup: {scan / indexed:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+// Shared site chrome for the fixture pages: a large nav, a sidebar and filler
+// paragraphs, so raw page text and HTML are about as big as a real site's.
+(function () {
+    const nav = document.createElement('nav');
+    for (let i = 1; i <= 40; i++) {
+        const a = document.createElement('a');
+        a.href = '#section-' + i;
+        a.textContent = 'Section ' + i;
+        nav.appendChild(a);
+    }
+    document.body.prepend(nav);
+    const aside = document.createElement('aside');
+    for (let i = 1; i <= 15; i++) {
+        const p = document.createElement('p');
+        p.textContent = 'Sidebar promo ' + i + ': lorem ipsum dolor sit amet, consectetur adipiscing elit.';
+        aside.appendChild(p);
+    }
+    document.body.appendChild(aside);
+    const footer = document.createElement('footer');
+    for (let i = 1; i <= 20; i++) {
+        const p = document.createElement('p');
+        p.textContent = 'Footer paragraph ' + i + ': sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.';
+        footer.appendChild(p);
+    }
+    document.body.appendChild(footer);
+})();
@@ -1,79 +1,195 @@
-import sys
-import warnings
-
-# Suppress pywinauto COM threading warning
-warnings.filterwarnings("ignore", message="Revert to STA COM threading mode")
-
-# Set pywinauto threading mode before it's imported
-try:
-    import pywinauto
-    pywinauto.threaded_mode = 'STA'
-except:
-    pass
+import asyncio
+import os
+import shlex
+import time
 
 import typer
-import os
 from dotenv import load_dotenv
 from rich.console import Console
-from agent.brain import Brain
-from agent.memory import Memory
-from skills.tools_factory import get_viora_tools
 
 load_dotenv()
 
 app = typer.Typer()
 console = Console()
-brain = Brain()
-memory = Memory()
-# tools_map still needs all tools to execute them when called
-all_tools = get_viora_tools("ALL")
-tools_map = {tool.name: tool for tool in all_tools}
+
+# The agent (LLM clients, memory index, tool registry) is only built for commands
+# that need it, so quick commands like `todos` don't pay for its imports.
+_agent = {}
+
+def get_agent():
+    """Builds memory, brain and the tool executor on first use."""
+    if not _agent:
+        from agent.brain import Brain
+        from agent.macros import MacroLibrary, MacroRecorder
+        from agent.memory import Memory
+        from agent.tool_executor import ToolExecutor
+        from skills.tools_factory import get_viora_tools
+
+        memory = Memory()
+        # tools_map still needs all tools to execute them when called
+        tools_map = {tool.name: tool for tool in get_viora_tools("ALL")}
+        executor = ToolExecutor(tools_map)
+        _agent.update(
+            memory=memory,
+            brain=Brain(memory=memory),
+            tools_map=tools_map,
+            executor=executor,
+            # Each tool's own failure check decides what gets recorded and where a replay stops
+            recorder=MacroRecorder(failed=executor.failed),
+            macros=MacroLibrary(failed=executor.failed),
+        )
+    return _agent
 
 def run_agent_loop(user_input: str):
     """Handles the think-act-observe loop for Viora."""
+    agent = get_agent()
+    brain, executor, recorder = agent["brain"], agent["executor"], agent["recorder"]
+    recorder.begin(user_input)
     response = brain.think(user_input)
     
     # Process tool calls if any
     while response.tool_calls:
         for tool_call in response.tool_calls:
-            tool_name = tool_call["name"]
-            tool_args = tool_call["args"]
-            tool_id = tool_call["id"]
-            
-            console.print(f"[italic yellow]Viora is using {tool_name}...[/italic yellow]")
-            
-            if tool_name in tools_map:
-                try:
-                    # LangChain tools take input in different ways; most use 'query' or just positional
-                    # For our specific tools, they are simple functions
-                    output = tools_map[tool_name].func(**tool_args)
-                    brain.add_tool_result(tool_id, output)
-                except Exception as e:
-                    brain.add_tool_result(tool_id, f"Error: {str(e)}")
-            else:
-                brain.add_tool_result(tool_id, f"Tool {tool_name} not found.")
+            console.print(f"[italic yellow]Viora is using {tool_call['name']}...[/italic yellow]")
+
+        # Independent calls run concurrently; results are recorded in call order
+        outputs = executor.run(response.tool_calls)
+        for tool_call, output in zip(response.tool_calls, outputs):
+            brain.add_tool_result(tool_call["id"], output)
+            recorder.record(tool_call, output)
         
         # Get next response after tool results
         response = brain.think_after_tools()  # Use brain method to ensure tracking
 
     return response.content
 
+class StreamPrinter:
+    """Prints streamed tokens after a 'Viora:' prefix and records time-to-first-token."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.ttft = None
+        self.is_open = False
+
+    def __call__(self, token: str):
+        if not self.is_open:
+            if self.ttft is None:
+                self.ttft = time.perf_counter() - self.start
+            console.print("[bold blue]Viora:[/bold blue] ", end="")
+            self.is_open = True
+        console.print(token, end="", markup=False, highlight=False)
+
+    def close(self):
+        """Ends the current streamed line; returns True if anything was printed on it."""
+        was_open = self.is_open
+        if was_open:
+            console.print()
+            self.is_open = False
+        return was_open
+
+async def run_agent_loop_async(user_input: str, printer: StreamPrinter):
+    """Async think-act-observe loop that streams model output as it is generated."""
+    agent = get_agent()
+    brain, executor, recorder = agent["brain"], agent["executor"], agent["recorder"]
+    recorder.begin(user_input)
+    response = await brain.athink(user_input, on_token=printer)
+
+    while response.tool_calls:
+        printer.close()
+        for tool_call in response.tool_calls:
+            console.print(f"[italic yellow]Viora is using {tool_call['name']}...[/italic yellow]")
+
+        # Tools run while the LLM client for the next call is being prepared
+        outputs, _ = await asyncio.gather(executor.arun(response.tool_calls), brain.aprepare())
+        for tool_call, output in zip(response.tool_calls, outputs):
+            brain.add_tool_result(tool_call["id"], output)
+            recorder.record(tool_call, output)
+
+        response = await brain.athink_after_tools(on_token=printer)
+
+    return response.content
+
+MACRO_USAGE = ("Usage: /macro save <name> [param=value ...] | /macro run <name> [param=value ...] | "
+               "/macro list | /macro delete <name>")
+
+def run_macro_command(command: str):
+    """
+    Handles '/macro ...' chat commands. Returns (reply, fallback_prompt); fallback_prompt
+    is set when a replay step failed and the model should take over from there.
+    """
+    from agent.macros import parse_params
+
+    agent = get_agent()
+    macros, recorder, executor = agent["macros"], agent["recorder"], agent["executor"]
+
+    def run_step(tool_call: dict) -> str:
+        console.print(f"[italic yellow]Replaying {tool_call['name']}...[/italic yellow]")
+        # Through the executor, so serial tools still run on their dedicated thread
+        return executor.run([tool_call])[0]
+
+    try:
+        args = shlex.split(command)[1:]
+        action = args[0] if args else "list"
+        if action == "list":
+            return "\n".join(macros.describe(name) for name in macros.names()) or "No macros saved yet.", None
+        if action == "save":
+            macros.save(args[1], recorder, parse_params(args[2:]))
+            return f"Saved macro {macros.describe(args[1])}", None
+        if action == "delete":
+            return (f"Deleted macro '{args[1]}'." if macros.delete(args[1]) else f"No macro named '{args[1]}'."), None
+        if action == "run":
+            result = macros.replay(args[1], run_step, parse_params(args[2:]))
+            if result.ok:
+                return result.summary(), None
+            console.print(f"{result.summary()}\nHanding over to the model...", style="italic yellow", markup=False)
+            return None, result.fallback_prompt()
+        return MACRO_USAGE, None
+    except IndexError:
+        return MACRO_USAGE, None
+    except (KeyError, ValueError) as e:
+        return f"Macro error: {e.args[0] if e.args else e}", None
+
 @app.command()
-def chat():
+def chat(stream: bool = typer.Option(True, help="Stream responses token by token.")):
     """Start an agentic chat session with Viora."""
     console.print("[bold green]Viora is online. How can I help you today?[/bold green]")
     console.print("[italic]Type 'exit' to quit.[/italic]")
+    agent = get_agent()
+    brain, memory = agent["brain"], agent["memory"]
+    # One loop for the whole session: async LLM clients keep connections bound to it
+    loop = asyncio.new_event_loop()
+    # Build the long-term memory index while the user types the first command
+    memory.semantic.preload()
+    if os.getenv("VIORA_BROWSER_PRELAUNCH", "0") == "1":
+        from skills.browser_manager import get_browser_manager
+        get_browser_manager().prelaunch(os.getenv("VIORA_BROWSER_PROFILE", "default") or None)
     
     while True:
         try:
             user_input = typer.prompt("You")
             if user_input.lower() in ["exit", "quit"]:
                 break
+            if user_input.startswith("/macro"):
+                reply, fallback = run_macro_command(user_input)
+                if fallback is None:
+                    console.print("[bold blue]Viora:[/bold blue] ", end="")
+                    console.print(reply, markup=False, highlight=False)
+                    continue
+                user_input = fallback
                 
-            final_response = run_agent_loop(user_input)
-            memory.log_interaction(user_input, final_response)
+            printer = None
+            if stream:
+                printer = StreamPrinter()
+                final_response = loop.run_until_complete(run_agent_loop_async(user_input, printer))
+            else:
+                final_response = run_agent_loop(user_input)
+            memory.log_interaction(user_input, final_response,
+                                   category=brain.current_category, route_tier=brain.router.last_tier)
             
-            console.print(f"[bold blue]Viora:[/bold blue] {final_response}")
+            if not (printer and printer.close()):
+                console.print(f"[bold blue]Viora:[/bold blue] {final_response}")
+            if brain.recall_error:
+                console.print(f"Memory recall failed: {brain.recall_error}", style="dim yellow", markup=False)
             
             # Display token usage if using Groq
             if brain.provider == "groq":
@@ -82,10 +198,14 @@ def chat():
                     last = usage['last_response']
                     session = usage['session']
                     category = usage.get('category', 'ALL')
+                    tier = brain.router.last_tier or "llm"
+                    ttft = f" | ⚡ TTFT: {printer.ttft:.2f}s" if printer and printer.ttft is not None else ""
+                    saved = usage['context']['saved_last']
+                    trimmed = f" | ✂️ Saved: {saved:,}" if saved else ""
                     console.print(
-                        f"[dim]📂 Intent: [bold]{category}[/bold] | 💬 Tokens: {last['total']} "
+                        f"[dim]📂 Intent: [bold]{category}[/bold] ({tier}) | 💬 Tokens: {last['total']} "
                         f"(p: {last['prompt']}, c: {last['completion']}) | "
-                        f"Session: {session['total']:,}[/dim]"
+                        f"Session: {session['total']:,}{ttft}{trimmed}[/dim]"
                     )
         except KeyboardInterrupt:
             break
@@ -93,6 +213,12 @@ def chat():
             console.print(f"[bold red]An error occurred:[/bold red] {str(e)}")
             console.print("[italic]Viora recovered from the error and is ready for the next command.[/italic]")
 
+    # Saves browser profiles (cookies, logins) and stops Chromium if it was started
+    from skills.browser_manager import shutdown_browser_manager
+    from skills.browser_parallel import shutdown_parallel_browser
+    shutdown_browser_manager()
+    shutdown_parallel_browser()
+
 @app.command()
 def todo(task: str):
     """Add a todo item."""
@@ -0,0 +1,162 @@
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Browser, BrowserContext
+
+CONTEXT_OPTIONS = {
+    "viewport": {'width': 1280, 'height': 720},
+    "user_agent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+}
+
+_PROFILE_RE = re.compile(r"[^\w.-]")
+
+
+class BrowserManager:
+    """
+    Keeps one warm Chromium process and a pool of BrowserContexts.
+
+    Playwright's sync API is bound to the thread that started it, so the driver, the
+    browser and every page live on a single dedicated "viora-browser" thread and all
+    calls are marshalled onto it with run(). That also lets prelaunch() start Chromium
+    in the background while the user is still typing.
+
+    Contexts acquired for a named profile start from the cookies and local storage
+    saved in data/browser_profiles/<profile>.json and save them back when released,
+    so logins survive restarts. Released contexts are kept idle for reuse, up to
+    pool_size per profile.
+    """
+
+    def __init__(self, headless: Optional[bool] = None, pool_size: int = 2,
+                 profile_dir: str = "data/browser_profiles"):
+        if headless is None:
+            fast = os.getenv("VIORA_BROWSER_FAST", "0") == "1"
+            headless = os.getenv("VIORA_BROWSER_HEADLESS", "1" if fast else "0") == "1"
+        self.headless = headless
+        self.pool_size = pool_size
+        self.profile_dir = profile_dir
+        self.playwright = None
+        self.browser: Optional["Browser"] = None
+        self._idle: Dict[Optional[str], List["BrowserContext"]] = {}
+        self._active: Dict["BrowserContext", Optional[str]] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="viora-browser")
+        self._thread: Optional[threading.Thread] = None
+
+    def run(self, fn: Callable, *args, **kwargs):
+        """Calls fn on the browser thread and returns its result (re-raising its errors)."""
+        if threading.current_thread() is self._thread:
+            return fn(*args, **kwargs)
+        return self._executor.submit(self._on_thread, fn, *args, **kwargs).result()
+
+    def _on_thread(self, fn: Callable, *args, **kwargs):
+        self._thread = threading.current_thread()
+        return fn(*args, **kwargs)
+
+    def prelaunch(self, profile: Optional[str] = None):
+        """Starts the browser and warms a context for profile without waiting for it."""
+        def warm():
+            try:
+                self.release_context(self.acquire_context(profile), profile)
+            except Exception:
+                pass  # The first tool call will retry and report the error
+        self._executor.submit(self._on_thread, warm)
+
+    @property
+    def is_running(self) -> bool:
+        return self.browser is not None and self.browser.is_connected()
+
+    def _ensure_browser(self):
+        if self.is_running:
+            return
+        if self.playwright is None:
+            from playwright.sync_api import sync_playwright
+            self.playwright = sync_playwright().start()
+        # A crashed or closed browser takes its contexts with it
+        self._idle.clear()
+        self._active.clear()
+        self.browser = self.playwright.chromium.launch(headless=self.headless)
+
+    def profile_path(self, profile: str) -> str:
+        return os.path.join(self.profile_dir, f"{_PROFILE_RE.sub('_', profile)}.json")
+
+    def acquire_context(self, profile: Optional[str] = None) -> "BrowserContext":
+        """Returns an idle pooled context for profile, or a new one. Browser thread only."""
+        self._ensure_browser()
+        idle = self._idle.get(profile, [])
+        context = idle.pop() if idle else None
+        if context is None:
+            options = dict(CONTEXT_OPTIONS)
+            if profile and os.path.exists(self.profile_path(profile)):
+                options["storage_state"] = self.profile_path(profile)
+            context = self.browser.new_context(**options)
+        self._active[context] = profile
+        return context
+
+    def save_profile(self, context: "BrowserContext", profile: str):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        context.storage_state(path=self.profile_path(profile))
+
+    def release_context(self, context: "BrowserContext", profile: Optional[str] = None):
+        """Saves the profile, closes the context's pages and returns it to the pool."""
+        self._active.pop(context, None)
+        try:
+            if profile:
+                self.save_profile(context, profile)
+            for page in list(context.pages):
+                page.close()
+            if not profile:
+                context.clear_cookies()
+            idle = self._idle.setdefault(profile, [])
+            if len(idle) < self.pool_size and self.is_running:
+                idle.append(context)
+            else:
+                context.close()
+        except Exception:
+            # Context already gone with its browser; nothing to reuse
+            pass
+
+    def shutdown(self):
+        """Saves active profiles and stops the browser and the driver."""
+        def stop():
+            for context, profile in list(self._active.items()):
+                if profile:
+                    try:
+                        self.save_profile(context, profile)
+                    except Exception:
+                        pass
+            self._active.clear()
+            self._idle.clear()
+            if self.browser:
+                self.browser.close()
+                self.browser = None
+            if self.playwright:
+                self.playwright.stop()
+                self.playwright = None
+        if self._thread is not None:
+            self.run(stop)
+        self._executor.shutdown(wait=True)
+
+
+_manager: Optional[BrowserManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_browser_manager() -> BrowserManager:
+    """Process-wide BrowserManager, created on first use."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = BrowserManager()
+        return _manager
+
+
+def shutdown_browser_manager():
+    """Stops the shared browser if one was started."""
+    global _manager
+    with _manager_lock:
+        manager, _manager = _manager, None
+    if manager is not None:
+        manager.shutdown()
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from skills import dom_extract
+from skills.browser_manager import CONTEXT_OPTIONS
+from skills.browser_tools import DEFAULT_BLOCKED_TYPES, TRACKER_RE
+
+# Extracted from each page when no spec is given
+DEFAULT_SPEC = [
+    {"name": "title", "selector": "title"},
+    {"name": "heading", "selector": "h1"},
+    {"name": "text", "selector": "body", "max_chars": 1500},
+]
+
+
+class ParallelBrowser:
+    """
+    Async Playwright backend for loading and scraping many pages at once.
+
+    Runs its own headless Chromium on a dedicated thread with its own event loop, apart
+    from the interactive browser, so it can be called from any thread. Each call opens
+    a fresh context with image/media/font/tracker requests blocked and loads up to
+    max_tabs pages concurrently, one tab per URL.
+    """
+
+    def __init__(self, max_tabs: Optional[int] = None):
+        self.max_tabs = max_tabs or int(os.getenv("VIORA_BROWSER_TABS", "4"))
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._playwright = None
+        self._browser = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="viora-browser-parallel", daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def _run(self, coro, timeout: Optional[float] = None):
+        """Runs a coroutine on the backend's loop and waits for its result."""
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+        return future.result(timeout)
+
+    async def _ensure_browser(self):
+        # Created here so it belongs to the backend's loop
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+        async with self._launch_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return
+            if self._playwright is None:
+                from playwright.async_api import async_playwright
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True)
+
+    @staticmethod
+    async def _route_request(route):
+        request = route.request
+        if request.resource_type in DEFAULT_BLOCKED_TYPES or TRACKER_RE.search(request.url):
+            if not request.is_navigation_request():
+                await route.abort()
+                return
+        await route.continue_()
+
+    async def _extract_one(self, context, url: str, args: Dict[str, Any],
+                           slots: asyncio.Semaphore, deadline: float) -> Dict[str, Any]:
+        async with slots:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return {"url": url, "error": "timed out waiting for a free tab"}
+            page = await context.new_page()
+            try:
+                start = time.perf_counter()
+                await page.goto(url, wait_until="domcontentloaded", timeout=min(30, remaining) * 1000)
+                data = await page.evaluate(dom_extract.EXTRACT_JS, args)
+                return {"url": url, "seconds": round(time.perf_counter() - start, 3), "data": data}
+            except Exception as e:
+                return {"url": url, "error": str(e)}
+            finally:
+                await page.close()
+
+    async def _extract_all(self, urls: List[str], args: Dict[str, Any], timeout: float) -> List[Dict[str, Any]]:
+        await self._ensure_browser()
+        context = await self._browser.new_context(**CONTEXT_OPTIONS)
+        await context.route("**/*", self._route_request)
+        slots = asyncio.Semaphore(self.max_tabs)
+        deadline = time.monotonic() + timeout
+        try:
+            return await asyncio.gather(*(self._extract_one(context, url, args, slots, deadline) for url in urls))
+        finally:
+            await context.close()
+
+    def extract(self, urls: List[str], spec: Union[List[Dict[str, Any]], Dict[str, Any], None] = None,
+                timeout: float = 60) -> List[Dict[str, Any]]:
+        """Loads each URL in its own tab and runs the dom_extract spec on it; results in URL order."""
+        args = dom_extract.evaluate_args(spec or DEFAULT_SPEC)
+        # Slack for the browser launch on top of the page deadline
+        return self._run(self._extract_all(urls, args, timeout), timeout + 30)
+
+    def parallel_extract(self, urls: List[str], spec: Optional[List[Dict[str, Any]]] = None):
+        """
+        Load several URLs concurrently in separate tabs and extract data from each.
+        spec is a list of browser_extract_data specs (default: title, h1 and page text).
+        """
+        try:
+            if isinstance(urls, str):
+                urls = [urls]
+            urls = list(dict.fromkeys(u.strip() for u in urls if u and u.strip()))[:20]
+            if not urls:
+                return "Error extracting pages: no URLs given"
+            return json.dumps(self.extract(urls, spec), ensure_ascii=False)
+        except Exception as e:
+            return f"Error extracting pages: {str(e)}"
+
+    def shutdown(self):
+        if self._loop is None:
+            return
+
+        async def stop():
+            if self._browser is not None:
+                await self._browser.close()
+            if self._playwright is not None:
+                await self._playwright.stop()
+
+        try:
+            self._run(stop(), 30)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop = None
+            self._browser = self._playwright = self._launch_lock = None
+
+
+_parallel: Optional[ParallelBrowser] = None
+_parallel_lock = threading.Lock()
+
+
+def get_parallel_browser() -> ParallelBrowser:
+    """Process-wide ParallelBrowser, created on first use."""
+    global _parallel
+    with _parallel_lock:
+        if _parallel is None:
+            _parallel = ParallelBrowser()
+        return _parallel
+
+
+def shutdown_parallel_browser():
+    """Stops the parallel browser if one was started."""
+    global _parallel
+    with _parallel_lock:
+        parallel, _parallel = _parallel, None
+    if parallel is not None:
+        parallel.shutdown()
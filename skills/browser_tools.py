@@ -1,41 +1,183 @@
-from playwright.sync_api import sync_playwright, Page, Browser, BrowserContext
+import functools
 import os
-from typing import Optional, Dict, List, Any
+import re
+import time
+from typing import TYPE_CHECKING, Optional, Dict, List, Any
+
+from skills import dom_extract, page_snapshot
+from skills.browser_manager import BrowserManager, get_browser_manager
+
+if TYPE_CHECKING:
+    from playwright.sync_api import Page, BrowserContext
+
+# Resource types dropped in fast mode (override with VIORA_BROWSER_BLOCK=image,font,...)
+DEFAULT_BLOCKED_TYPES = ("image", "media", "font")
+
+# Analytics, ad and tracking hosts dropped in fast mode
+TRACKER_RE = re.compile(
+    r"google-analytics\.com|googletagmanager\.com|doubleclick\.net|googlesyndication\.com|"
+    r"adservice\.google\.|facebook\.net|connect\.facebook|hotjar\.com|segment\.(io|com)|"
+    r"mixpanel\.com|amplitude\.com|scorecardresearch\.com|quantserve\.com|criteo\.(com|net)|"
+    r"taboola\.com|outbrain\.com|adnxs\.com|newrelic\.com|nr-data\.net|clarity\.ms|bat\.bing\.com",
+    re.IGNORECASE,
+)
+
+
+class NavigationMeter:
+    """Counts bytes received (from CDP network events) and blocked requests for one page."""
+
+    def __init__(self, context, page):
+        self.bytes = 0
+        self.responses = 0
+        self.blocked = 0
+        try:
+            session = context.new_cdp_session(page)
+            session.on("Network.loadingFinished", self._on_loading_finished)
+            session.send("Network.enable")
+            self.available = True
+        except Exception:
+            # Not Chromium, or CDP unavailable: report timings only
+            self.available = False
+
+    def _on_loading_finished(self, params):
+        self.bytes += int(params.get("encodedDataLength", 0))
+        self.responses += 1
+
+    def reset(self):
+        self.bytes = self.responses = self.blocked = 0
+
+
+def _on_browser_thread(method):
+    """Runs a BrowserTools method on the browser manager's Playwright thread."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        return self.manager.run(method, self, *args, **kwargs)
+    return wrapper
+
 
 class BrowserTools:
     """
     Browser automation tools using Playwright.
     Provides web navigation, interaction, and data extraction capabilities.
+
+    Fast mode (VIORA_BROWSER_FAST=1) launches headless and aborts image, media, font
+    and tracker requests. Every navigation reports its load time and bytes transferred.
+
+    The browser process belongs to a shared BrowserManager: this class borrows a pooled
+    context for its profile (VIORA_BROWSER_PROFILE, cookies persist across restarts)
+    and close_browser() hands it back while Chromium stays warm.
     """
-    
-    def __init__(self):
-        self.playwright = None
-        self.browser: Optional[Browser] = None
-        self.context: Optional[BrowserContext] = None
-        self.page: Optional[Page] = None
+
+    # wait_until used by each navigating tool; navigate_to also accepts an override
+    WAIT_UNTIL = {
+        "navigate": "domcontentloaded",
+        "new_tab": "domcontentloaded",
+        "reload": "domcontentloaded",
+        # History entries are usually restored from the back/forward cache, and
+        # follow-up actions auto-wait for their elements anyway
+        "history": "commit",
+    }
+
+    def __init__(self, fast: Optional[bool] = None, wait_until: Optional[Dict[str, str]] = None,
+                 manager: Optional[BrowserManager] = None, profile: Optional[str] = None):
+        self.manager = manager or get_browser_manager()
+        self.profile = profile if profile is not None else os.getenv("VIORA_BROWSER_PROFILE", "default")
+        self.context: Optional["BrowserContext"] = None
+        self.page: Optional["Page"] = None
         self._is_initialized = False
+
+        if fast is None:
+            fast = os.getenv("VIORA_BROWSER_FAST", "0") == "1"
+        self.fast = fast
+        blocked = os.getenv("VIORA_BROWSER_BLOCK", ",".join(DEFAULT_BLOCKED_TYPES))
+        self.blocked_types = {t.strip() for t in blocked.split(",") if t.strip()} if fast else set()
+        self.wait_until = {**self.WAIT_UNTIL, **(wait_until or {})}
+        self._meters: Dict[Any, NavigationMeter] = {}
+        self._snapshots = page_snapshot.SnapshotTracker()
+        self.navigation_log: List[Dict[str, Any]] = []
     
     def _ensure_browser(self):
         """Ensures browser is initialized and ready."""
-        if not self._is_initialized:
-            self.playwright = sync_playwright().start()
-            self.browser = self.playwright.chromium.launch(headless=False)  # Visible by default
-            self.context = self.browser.new_context(
-                viewport={'width': 1280, 'height': 720},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            )
+        # Also recovers when the browser process has crashed or been closed
+        if not self._is_initialized or not self.manager.is_running:
+            self.context = self.manager.acquire_context(self.profile or None)
+            if self.fast:
+                self.context.route("**/*", self._route_request)
             self.page = self.context.new_page()
+            self._meters.clear()
             self._is_initialized = True
-    
-    def navigate_to(self, url: str):
-        """Navigate to a URL."""
+
+    def _meter(self, page) -> NavigationMeter:
+        if page not in self._meters:
+            self._meters[page] = NavigationMeter(self.context, page)
+            page.on("close", lambda closed: self._meters.pop(closed, None))
+        return self._meters[page]
+
+    def _route_request(self, route):
+        request = route.request
+        blocked = request.resource_type in self.blocked_types or TRACKER_RE.search(request.url)
+        # Never block a page the user asked to open
+        if blocked and not request.is_navigation_request():
+            try:
+                meter = self._meters.get(request.frame.page)
+            except Exception:
+                meter = None  # Service worker requests have no frame
+            if meter:
+                meter.blocked += 1
+            route.abort()
+        else:
+            route.continue_()
+
+    def _navigate(self, page, kind: str, action) -> str:
+        """Runs a navigation, records its timing and traffic, and returns a summary."""
+        meter = self._meter(page)
+        meter.reset()
+        start = time.perf_counter()
+        action()
+        stats = {"url": page.url, "kind": kind, "seconds": round(time.perf_counter() - start, 3)}
+        summary = f"loaded in {stats['seconds']:.2f}s"
+        if meter.available:
+            stats.update(bytes=meter.bytes, responses=meter.responses)
+            summary += f", {meter.bytes / 1024:.1f} KB in {meter.responses} responses"
+        if meter.blocked:
+            stats["blocked"] = meter.blocked
+            summary += f", {meter.blocked} requests blocked"
+        self.navigation_log = self.navigation_log[-49:] + [stats]
+        return summary
+
+    @_on_browser_thread
+    def navigate_to(self, url: str, wait_until: Optional[str] = None):
+        """Navigate to a URL. wait_until: 'commit', 'domcontentloaded', 'load' or 'networkidle'."""
         try:
             self._ensure_browser()
-            self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
-            return f"Successfully navigated to {url}"
+            wait_until = wait_until or self.wait_until["navigate"]
+            summary = self._navigate(self.page, "navigate",
+                                     lambda: self.page.goto(url, wait_until=wait_until, timeout=30000))
+            return f"Successfully navigated to {url} ({summary})"
         except Exception as e:
             return f"Error navigating to {url}: {str(e)}"
-    
+
+    def get_navigation_stats(self):
+        """Summarize load time and traffic of recent navigations."""
+        if not self.navigation_log:
+            return "No navigations recorded yet"
+        mode = "fast (headless, blocking)" if self.fast else ("headless" if self.manager.headless else "visible")
+        result = f"Last {len(self.navigation_log)} navigations, {mode} mode:\n"
+        for stats in self.navigation_log[-10:]:
+            line = f"- {stats['kind']} {stats['url']}: {stats['seconds']:.2f}s"
+            if "bytes" in stats:
+                line += f", {stats['bytes'] / 1024:.1f} KB"
+            if stats.get("blocked"):
+                line += f", {stats['blocked']} blocked"
+            result += line + "\n"
+        seconds = [s["seconds"] for s in self.navigation_log]
+        result += f"Average load time: {sum(seconds) / len(seconds):.2f}s"
+        sizes = [s["bytes"] for s in self.navigation_log if "bytes" in s]
+        if sizes:
+            result += f", average transfer: {sum(sizes) / len(sizes) / 1024:.1f} KB"
+        return result
+    
+    @_on_browser_thread
     def click_element(self, selector: str):
         """Click an element by CSS selector."""
         try:
@@ -45,6 +187,7 @@ class BrowserTools:
         except Exception as e:
             return f"Error clicking element {selector}: {str(e)}"
     
+    @_on_browser_thread
     def type_text(self, selector: str, text: str):
         """Type text into an input field."""
         try:
@@ -54,6 +197,7 @@ class BrowserTools:
         except Exception as e:
             return f"Error typing into {selector}: {str(e)}"
     
+    @_on_browser_thread
     def get_text(self, selector: str):
         """Get text content from an element."""
         try:
@@ -63,6 +207,7 @@ class BrowserTools:
         except Exception as e:
             return f"Error getting text from {selector}: {str(e)}"
     
+    @_on_browser_thread
     def get_attribute(self, selector: str, attribute: str):
         """Get an attribute value from an element."""
         try:
@@ -72,6 +217,7 @@ class BrowserTools:
         except Exception as e:
             return f"Error getting attribute {attribute} from {selector}: {str(e)}"
     
+    @_on_browser_thread
     def take_screenshot(self, filename: str = "screenshot.png"):
         """Take a screenshot of the current page."""
         try:
@@ -84,6 +230,7 @@ class BrowserTools:
         except Exception as e:
             return f"Error taking screenshot: {str(e)}"
     
+    @_on_browser_thread
     def wait_for_element(self, selector: str, timeout: int = 10000):
         """Wait for an element to appear."""
         try:
@@ -93,6 +240,7 @@ class BrowserTools:
         except Exception as e:
             return f"Error waiting for {selector}: {str(e)}"
     
+    @_on_browser_thread
     def execute_script(self, js_code: str):
         """Execute JavaScript code on the page."""
         try:
@@ -102,6 +250,7 @@ class BrowserTools:
         except Exception as e:
             return f"Error executing script: {str(e)}"
     
+    @_on_browser_thread
     def get_page_content(self):
         """Get the full HTML content of the current page."""
         try:
@@ -114,21 +263,13 @@ class BrowserTools:
         except Exception as e:
             return f"Error getting page content: {str(e)}"
     
+    @_on_browser_thread
     def extract_links(self):
         """Extract all links from the current page."""
         try:
             self._ensure_browser()
-            links = self.page.evaluate("""
-                () => {
-                    const anchors = Array.from(document.querySelectorAll('a'));
-                    return anchors.map(a => ({
-                        text: a.textContent.trim(),
-                        href: a.href
-                    })).filter(link => link.href && link.text);
-                }
-            """)
-            # Limit to first 20 links
-            links = links[:20]
+            # First 20 links, selected inside the page
+            links = dom_extract.extract(self.page, [{"op": "links", "name": "links", "limit": 20}])["links"]
             result = "Links found:\n"
             for link in links:
                 result += f"- {link['text']}: {link['href']}\n"
@@ -136,6 +277,7 @@ class BrowserTools:
         except Exception as e:
             return f"Error extracting links: {str(e)}"
     
+    @_on_browser_thread
     def fill_form(self, form_data: Dict[str, str]):
         """
         Fill a form with multiple fields.
@@ -149,33 +291,40 @@ class BrowserTools:
         except Exception as e:
             return f"Error filling form: {str(e)}"
     
+    @_on_browser_thread
     def go_back(self):
         """Navigate back in browser history."""
         try:
             self._ensure_browser()
-            self.page.go_back(wait_until='domcontentloaded')
-            return "Navigated back"
+            summary = self._navigate(self.page, "back",
+                                     lambda: self.page.go_back(wait_until=self.wait_until["history"]))
+            return f"Navigated back ({summary})"
         except Exception as e:
             return f"Error going back: {str(e)}"
     
+    @_on_browser_thread
     def go_forward(self):
         """Navigate forward in browser history."""
         try:
             self._ensure_browser()
-            self.page.go_forward(wait_until='domcontentloaded')
-            return "Navigated forward"
+            summary = self._navigate(self.page, "forward",
+                                     lambda: self.page.go_forward(wait_until=self.wait_until["history"]))
+            return f"Navigated forward ({summary})"
         except Exception as e:
             return f"Error going forward: {str(e)}"
     
+    @_on_browser_thread
     def reload_page(self):
         """Reload the current page."""
         try:
             self._ensure_browser()
-            self.page.reload(wait_until='domcontentloaded')
-            return "Page reloaded"
+            summary = self._navigate(self.page, "reload",
+                                     lambda: self.page.reload(wait_until=self.wait_until["reload"]))
+            return f"Page reloaded ({summary})"
         except Exception as e:
             return f"Error reloading page: {str(e)}"
     
+    @_on_browser_thread
     def get_current_url(self):
         """Get the current page URL."""
         try:
@@ -184,17 +333,18 @@ class BrowserTools:
         except Exception as e:
             return f"Error getting URL: {str(e)}"
     
+    @_on_browser_thread
     def close_browser(self):
-        """Close the browser and cleanup resources."""
+        """Close this browser session; Chromium itself stays warm for the next one."""
         try:
-            if self.page:
-                self.page.close()
-            if self.context:
-                self.context.close()
-            if self.browser:
-                self.browser.close()
-            if self.playwright:
-                self.playwright.stop()
+            if self._is_initialized:
+                if self.fast:
+                    self.context.unroute("**/*", self._route_request)
+                self.manager.release_context(self.context, self.profile or None)
+            self.context = None
+            self.page = None
+            self._meters.clear()
+            self._snapshots.reset()
             self._is_initialized = False
             return "Browser closed successfully"
         except Exception as e:
@@ -202,6 +352,7 @@ class BrowserTools:
     
     # ===== Form Handling Enhancements =====
     
+    @_on_browser_thread
     def submit_form(self, selector: str):
         """Submit a form by its selector."""
         try:
@@ -211,6 +362,7 @@ class BrowserTools:
         except Exception as e:
             return f"Error submitting form {selector}: {str(e)}"
     
+    @_on_browser_thread
     def select_dropdown(self, selector: str, value: str):
         """Select an option from a dropdown by value or text."""
         try:
@@ -220,6 +372,7 @@ class BrowserTools:
         except Exception as e:
             return f"Error selecting dropdown option: {str(e)}"
     
+    @_on_browser_thread
     def check_checkbox(self, selector: str, checked: bool = True):
         """Check or uncheck a checkbox."""
         try:
@@ -233,6 +386,7 @@ class BrowserTools:
         except Exception as e:
             return f"Error toggling checkbox: {str(e)}"
     
+    @_on_browser_thread
     def upload_file(self, selector: str, filepath: str):
         """Upload a file to a file input element."""
         try:
@@ -244,6 +398,7 @@ class BrowserTools:
     
     # ===== Page Interaction Enhancements =====
     
+    @_on_browser_thread
     def scroll_to(self, x: int, y: int):
         """Scroll to specific coordinates on the page."""
         try:
@@ -253,6 +408,7 @@ class BrowserTools:
         except Exception as e:
             return f"Error scrolling: {str(e)}"
     
+    @_on_browser_thread
     def scroll_to_element(self, selector: str):
         """Scroll an element into view."""
         try:
@@ -262,6 +418,7 @@ class BrowserTools:
         except Exception as e:
             return f"Error scrolling to element: {str(e)}"
     
+    @_on_browser_thread
     def hover_element(self, selector: str):
         """Hover over an element."""
         try:
@@ -271,6 +428,7 @@ class BrowserTools:
         except Exception as e:
             return f"Error hovering: {str(e)}"
     
+    @_on_browser_thread
     def right_click(self, selector: str):
         """Right-click on an element."""
         try:
@@ -282,18 +440,22 @@ class BrowserTools:
     
     # ===== Tab Management =====
     
+    @_on_browser_thread
     def new_tab(self, url: str = "about:blank"):
         """Open a new tab and optionally navigate to a URL."""
         try:
             self._ensure_browser()
             new_page = self.context.new_page()
-            if url != "about:blank":
-                new_page.goto(url, wait_until='domcontentloaded', timeout=30000)
             self.page = new_page  # Switch to new tab
-            return f"Opened new tab{' and navigated to ' + url if url != 'about:blank' else ''}"
+            if url == "about:blank":
+                return "Opened new tab"
+            summary = self._navigate(new_page, "new_tab", lambda: new_page.goto(
+                url, wait_until=self.wait_until["new_tab"], timeout=30000))
+            return f"Opened new tab and navigated to {url} ({summary})"
         except Exception as e:
             return f"Error opening new tab: {str(e)}"
     
+    @_on_browser_thread
     def switch_tab(self, index: int):
         """Switch to a tab by index (0-based)."""
         try:
@@ -307,6 +469,7 @@ class BrowserTools:
         except Exception as e:
             return f"Error switching tab: {str(e)}"
     
+    @_on_browser_thread
     def close_tab(self):
         """Close the current tab."""
         try:
@@ -321,6 +484,7 @@ class BrowserTools:
         except Exception as e:
             return f"Error closing tab: {str(e)}"
     
+    @_on_browser_thread
     def list_tabs(self):
         """List all open tabs with their URLs."""
         try:
@@ -336,24 +500,16 @@ class BrowserTools:
     
     # ===== Data Extraction Enhancements =====
     
+    @_on_browser_thread
     def extract_table(self, selector: str):
         """Extract table data as a structured format."""
         try:
             self._ensure_browser()
-            table_data = self.page.evaluate(f"""
-                () => {{
-                    const table = document.querySelector('{selector}');
-                    if (!table) return null;
-                    const rows = Array.from(table.querySelectorAll('tr'));
-                    return rows.map(row => {{
-                        const cells = Array.from(row.querySelectorAll('th, td'));
-                        return cells.map(cell => cell.textContent.trim());
-                    }});
-                }}
-            """)
+            spec = {"op": "table", "selector": selector, "name": "table", "limit": 10}
+            table_data = dom_extract.extract(self.page, [spec])["table"]
             if table_data:
                 result = "Table data:\n"
-                for row in table_data[:10]:  # Limit to 10 rows
+                for row in table_data:
                     result += " | ".join(row) + "\n"
                 return result
             else:
@@ -361,6 +517,73 @@ class BrowserTools:
         except Exception as e:
             return f"Error extracting table: {str(e)}"
     
+    @_on_browser_thread
+    def extract_data(self, specs: List[Dict[str, Any]]):
+        """
+        Run several extractions in one round-trip and return JSON keyed by spec name.
+        Each spec: {"selector": "h1", "op": "text"}; op is one of text, attr, value,
+        html, count, exists, links, table; optional attr, all, limit, max_chars, name.
+        """
+        try:
+            self._ensure_browser()
+            return dom_extract.to_json(dom_extract.extract(self.page, specs))
+        except Exception as e:
+            return f"Error extracting data: {str(e)}"
+
+    # ===== Accessibility Snapshots =====
+
+    def _snapshot_text(self, full: bool = False) -> str:
+        text, _ = self._snapshots.render(page_snapshot.take(self.page), full=full, source=self.page)
+        return text
+
+    @_on_browser_thread
+    def snapshot(self, full: bool = False):
+        """
+        List the page's visible interactive elements as numbered refs (role, name, state).
+        Repeated calls on the same page return only what changed, unless full=True.
+        """
+        try:
+            self._ensure_browser()
+            return self._snapshot_text(full)
+        except Exception as e:
+            return f"Error taking snapshot: {str(e)}"
+
+    def _after_ref_action(self) -> str:
+        """Waits for any navigation the action started, then reports what changed."""
+        try:
+            self.page.wait_for_load_state("domcontentloaded", timeout=5000)
+        except Exception:
+            pass
+        return self._snapshot_text()
+
+    @_on_browser_thread
+    def click_ref(self, ref: int):
+        """Click an element by its snapshot ref number; returns the resulting page changes."""
+        try:
+            self._ensure_browser()
+            self.page.click(page_snapshot.ref_selector(ref), timeout=10000)
+            return f"Clicked [{ref}]\n{self._after_ref_action()}"
+        except Exception as e:
+            return f"Error clicking [{ref}]: {str(e)}"
+
+    @_on_browser_thread
+    def type_ref(self, ref: int, text: str, submit: bool = False):
+        """Type into (or pick a dropdown option of) an element by its snapshot ref number; submit=True presses Enter."""
+        try:
+            self._ensure_browser()
+            element = self.page.locator(page_snapshot.ref_selector(ref))
+            # Dropdowns take an option label instead of typed text
+            if element.evaluate("el => el.tagName") == "SELECT":
+                element.select_option(label=text, timeout=10000)
+            else:
+                element.fill(text, timeout=10000)
+            if submit:
+                element.press("Enter")
+            return f"Typed into [{ref}]\n{self._after_ref_action()}"
+        except Exception as e:
+            return f"Error typing into [{ref}]: {str(e)}"
+
+    @_on_browser_thread
     def get_all_text(self):
         """Get all visible text from the page."""
         try:
@@ -373,6 +596,7 @@ class BrowserTools:
         except Exception as e:
             return f"Error getting page text: {str(e)}"
     
+    @_on_browser_thread
     def count_elements(self, selector: str):
         """Count the number of elements matching a selector."""
         try:
@@ -0,0 +1,95 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries carry their own expiry time.
+    Expired entries are not served by get() but stay in the cache (until evicted) so
+    callers can revalidate them, e.g. with a conditional HTTP request. Optionally
+    persisted to a JSON file; values must then be JSON-serializable.
+    """
+
+    def __init__(self, max_entries: int = 128, default_ttl: float = 300.0,
+                 storage_file: Optional[str] = None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.storage_file = storage_file
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Returns the value if it is present and still fresh, else None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, bool]]:
+        """Returns (value, is_fresh) whether or not the entry has expired, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1], entry[0] > time.time()
+
+    def put(self, key: str, value: Any, ttl: Optional[float] = None):
+        ttl = self.default_ttl if ttl is None else ttl
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save()
+
+    def discard(self, key: str):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self._save()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+            self._save()
+
+    def _load(self):
+        if not self.storage_file or not os.path.exists(self.storage_file):
+            return
+        try:
+            with open(self.storage_file, 'r') as f:
+                entries = json.load(f).get("entries", [])
+        except (OSError, ValueError):
+            return
+        # Stored oldest-first, so replaying preserves LRU order
+        now = time.time()
+        for key, expires, value in entries[-self.max_entries:]:
+            if expires > now:
+                self._entries[key] = (expires, value)
+
+    def _save(self):
+        if not self.storage_file:
+            return
+        os.makedirs(os.path.dirname(self.storage_file) or ".", exist_ok=True)
+        tmp_file = f"{self.storage_file}.tmp"
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump({"entries": [[k, e, v] for k, (e, v) in self._entries.items()]}, f)
+            os.replace(tmp_file, self.storage_file)
+        except (OSError, TypeError):
+            pass
@@ -1,36 +1,108 @@
-import pyautogui
-import pywinauto
-from pywinauto import Application, Desktop
-from pywinauto.findwindows import ElementNotFoundError
+import functools
+import inspect
+import math
 import time
-from typing import Optional, List, Dict, Tuple
+import typing
+from typing import Any, Callable, Optional, List, Dict, Tuple
+from skills.image_locator import ImageLocator, Match, get_image_locator
+from skills.input_pacing import InputPacer
+from skills.lazy_import import LazyModule
+from skills.screen_capture import ScreenCapture, get_screen_capture
+from skills.tool_results import failed_with
+from skills.window_index import WindowIndex, WindowInfo
+
+def _configure_pyautogui(module):
+    # Set PyAutoGUI safety features
+    module.FAILSAFE = True  # Move mouse to top-left corner to abort
+    # No fixed dead time after every call; InputPacer adds a short settle per
+    # action and waits on observable conditions where it matters
+    module.PAUSE = 0
+
+# Imported on first use so loading the skill stays cheap
+pyautogui = LazyModule("pyautogui", on_import=_configure_pyautogui)
 
 class DesktopTools:
     """
     Desktop automation tools for Windows using pywinauto and PyAutoGUI.
     Provides window management, mouse/keyboard control, and UI element interaction.
+    Windows are looked up through a cached WindowIndex, so a burst of window
+    commands costs a single enumeration. Input timing comes from an InputPacer:
+    near-instant by default, human-like where a tool is called with human=True (or for
+    every call with VIORA_INPUT_HUMAN=1; human=None follows that setting).
     """
-    
-    def __init__(self):
-        # Set PyAutoGUI safety features
-        pyautogui.FAILSAFE = True  # Move mouse to top-left corner to abort
-        pyautogui.PAUSE = 0.5  # Pause between actions
+
+    # Failure predicates (see skills/tool_results.py): window actions that found no
+    # window or could not bring it forward, and a run_actions batch that did not finish
+    window_missed = staticmethod(failed_with("Window with title", contains=("did not come to the foreground",)))
+    _batch_incomplete = staticmethod(failed_with(contains=(" failed", "aborted", "stopped at step")))
+
+    @classmethod
+    def actions_failed(cls, output: str) -> bool:
+        """Whether a run_actions result reports a failed or skipped step."""
+        return cls._batch_incomplete(output.split("\n", 1)[0])
+
+    # Step names accepted by run_actions -> the method each one calls
+    ACTIONS = {
+        "move": "move_mouse", "click": "click_at", "double_click": "double_click_at",
+        "right_click": "right_click_at", "drag": "drag_and_drop", "scroll": "scroll_mouse",
+        "press": "press_key", "hotkey": "hotkey", "type": "type_text",
+        "focus": "focus_window", "minimize": "minimize_window", "maximize": "maximize_window",
+        "restore": "restore_window", "close": "close_window", "move_window": "move_window_to",
+        "resize": "resize_window", "click_button": "click_button_in_window", "type_in_field": "type_in_field",
+        "wait_for_change": "wait_for_screen_change", "wait": None,
+    }
+    MAX_ACTIONS = 100
+    MAX_WAIT = 10.0
+
+    def __init__(self, window_index: Optional[WindowIndex] = None, pacer: Optional[InputPacer] = None,
+                 capture: Optional[ScreenCapture] = None, locator: Optional[ImageLocator] = None):
+        self.windows = window_index or WindowIndex()
+        self.pacer = pacer or InputPacer()
+        self.capture = capture or get_screen_capture()
+        self.locator = locator or get_image_locator()
+
+    def _after_input(self, human: Optional[bool] = None):
+        # The screen is about to change, so buffered frames are stale
+        self.capture.invalidate()
+        self.pacer.pause(human)
+
+    def _not_found(self, title: str, fuzzy: bool) -> str:
+        message = f"Window with title containing '{title}' not found."
+        if not fuzzy:
+            # Mutating actions don't guess, but the closest window is worth naming
+            guess = self.windows.find(title)
+            if guess is not None:
+                message += f" Did you mean '{guess.title}'?"
+        return message
+    
+    def _with_window(self, title: str, action: Callable[[Any, WindowInfo], str], error: str,
+                     fuzzy: bool = False):
+        """
+        Runs action(window, info) on the best match for title. If it fails because the
+        window closed since the index was built, the lookup is retried once on a fresh
+        enumeration. Only exact and substring title matches are used unless fuzzy=True,
+        so a mistyped title can't close or move an unrelated window.
+        """
+        try:
+            for attempt in range(2):
+                info = self.windows.find(title, fuzzy)
+                if info is None:
+                    return self._not_found(title, fuzzy)
+                try:
+                    return action(self.windows.window(info.handle), info)
+                except Exception:
+                    if attempt or self.windows.provider.exists(info.handle):
+                        raise
+                    self.windows.invalidate()
+        except Exception as e:
+            return f"Error {error}: {str(e)}"
     
     # ===== Window Management =====
     
     def list_windows(self):
         """List all visible windows with their titles."""
         try:
-            desktop = Desktop(backend="uia")
-            windows = desktop.windows()
-            window_list = []
-            for win in windows:
-                try:
-                    title = win.window_text()
-                    if title:  # Only include windows with titles
-                        window_list.append(title)
-                except:
-                    continue
+            window_list = [info.title for info in self.windows.windows()]
             
             if not window_list:
                 return "No windows found."
@@ -43,71 +115,54 @@ class DesktopTools:
             return f"Error listing windows: {str(e)}"
     
     def focus_window(self, title: str):
-        """Bring a window to the foreground by its title (partial match)."""
-        try:
-            desktop = Desktop(backend="uia")
-            # Find window with partial title match
-            windows = desktop.windows()
-            for win in windows:
-                try:
-                    win_title = win.window_text()
-                    if title.lower() in win_title.lower():
-                        win.set_focus()
-                        return f"Focused window: {win_title}"
-                except:
-                    continue
-            return f"Window with title containing '{title}' not found."
-        except Exception as e:
-            return f"Error focusing window: {str(e)}"
+        """Bring a window to the foreground by its title (partial or fuzzy match)."""
+        def action(win, info):
+            win.set_focus()
+            if not self.pacer.wait_until(lambda: self.windows.provider.foreground() == info.handle):
+                return f"Focused window: {info.title} (but it did not come to the foreground)"
+            return f"Focused window: {info.title}"
+        return self._with_window(title, action, "focusing window", fuzzy=True)
     
     def minimize_window(self, title: str):
         """Minimize a window by its title."""
-        try:
-            desktop = Desktop(backend="uia")
-            windows = desktop.windows()
-            for win in windows:
-                try:
-                    win_title = win.window_text()
-                    if title.lower() in win_title.lower():
-                        win.minimize()
-                        return f"Minimized window: {win_title}"
-                except:
-                    continue
-            return f"Window with title containing '{title}' not found."
-        except Exception as e:
-            return f"Error minimizing window: {str(e)}"
+        def action(win, info):
+            win.minimize()
+            return f"Minimized window: {info.title}"
+        return self._with_window(title, action, "minimizing window")
     
     def maximize_window(self, title: str):
         """Maximize a window by its title."""
-        try:
-            desktop = Desktop(backend="uia")
-            windows = desktop.windows()
-            for win in windows:
-                try:
-                    win_title = win.window_text()
-                    if title.lower() in win_title.lower():
-                        win.maximize()
-                        return f"Maximized window: {win_title}"
-                except:
-                    continue
-            return f"Window with title containing '{title}' not found."
-        except Exception as e:
-            return f"Error maximizing window: {str(e)}"
+        def action(win, info):
+            win.maximize()
+            return f"Maximized window: {info.title}"
+        return self._with_window(title, action, "maximizing window")
     
     # ===== Mouse Control =====
     
-    def move_mouse(self, x: int, y: int, duration: float = 0.5):
-        """Move mouse to specific coordinates."""
+    def _move_duration(self, x: int, y: int, human: Optional[bool]) -> float:
+        if not self.pacer.is_human(human):
+            return 0.0
+        cx, cy = pyautogui.position()
+        return self.pacer.move_duration(math.hypot(x - cx, y - cy), human)
+
+    def move_mouse(self, x: int, y: int, duration: Optional[float] = None, human: Optional[bool] = None):
+        """Move mouse to specific coordinates. Instant unless a duration is given or human pacing is on."""
         try:
-            pyautogui.moveTo(x, y, duration=duration)
+            if duration is None:
+                duration = self._move_duration(x, y, human)
+            pyautogui.moveTo(x, y, duration=duration, tween=pyautogui.easeOutQuad)
+            self._after_input(human)
             return f"Mouse moved to ({x}, {y})"
         except Exception as e:
             return f"Error moving mouse: {str(e)}"
     
-    def click_at(self, x: int, y: int, button: str = "left"):
-        """Click at specific coordinates."""
+    def click_at(self, x: int, y: int, button: str = "left", human: Optional[bool] = None):
+        """Click at specific coordinates; with human pacing, glides to the target first."""
         try:
+            if self.pacer.is_human(human):
+                pyautogui.moveTo(x, y, duration=self._move_duration(x, y, human), tween=pyautogui.easeOutQuad)
             pyautogui.click(x, y, button=button)
+            self._after_input(human)
             return f"Clicked {button} button at ({x}, {y})"
         except Exception as e:
             return f"Error clicking: {str(e)}"
@@ -116,6 +171,7 @@ class DesktopTools:
         """Double-click at specific coordinates."""
         try:
             pyautogui.doubleClick(x, y)
+            self._after_input()
             return f"Double-clicked at ({x}, {y})"
         except Exception as e:
             return f"Error double-clicking: {str(e)}"
@@ -134,6 +190,7 @@ class DesktopTools:
         """Press a single key."""
         try:
             pyautogui.press(key)
+            self._after_input()
             return f"Pressed key: {key}"
         except Exception as e:
             return f"Error pressing key: {str(e)}"
@@ -142,36 +199,67 @@ class DesktopTools:
         """Press a combination of keys (e.g., 'ctrl', 'c')."""
         try:
             pyautogui.hotkey(*keys)
+            self._after_input()
             keys_str = '+'.join(keys)
             return f"Pressed hotkey: {keys_str}"
         except Exception as e:
             return f"Error pressing hotkey: {str(e)}"
     
-    def type_text(self, text: str, interval: float = 0.05):
-        """Type text with a delay between keystrokes."""
+    def type_text(self, text: str, interval: Optional[float] = None, human: Optional[bool] = None):
+        """Type text. No delay between keystrokes unless an interval is given or human pacing is on."""
         try:
-            pyautogui.write(text, interval=interval)
+            if interval is None and self.pacer.is_human(human):
+                # Jittered per-keystroke timing
+                for char in text:
+                    pyautogui.write(char)
+                    time.sleep(self.pacer.key_interval(human))
+            else:
+                pyautogui.write(text, interval=interval or 0.0)
+            self._after_input(human)
             return f"Typed text: {text[:50]}{'...' if len(text) > 50 else ''}"
         except Exception as e:
             return f"Error typing text: {str(e)}"
     
     # ===== Screen Analysis =====
     
-    def find_on_screen(self, image_path: str, confidence: float = 0.8):
+    @staticmethod
+    def _format_matches(image_path: str, matches: List[Match]) -> str:
+        if not matches:
+            return f"Image not found on screen: {image_path}"
+        lines = [f"Found {len(matches)} match(es) for {image_path}:"]
+        for m in matches:
+            scale = f", scale {m.scale:g}" if m.scale != 1.0 else ""
+            lines.append(f"- center {m.center} region ({m.x}, {m.y}, {m.width}, {m.height}) score {m.score:.2f}{scale}")
+        return "\n".join(lines)
+    
+    def find_images_on_screen(self, image_paths: List[str], confidence: float = 0.8,
+                              region: Optional[List[int]] = None, scales: Optional[List[float]] = None,
+                              max_matches: int = 5):
         """
-        Find an image on the screen and return its coordinates.
-        Requires opencv-python for image recognition.
+        Find several images on the screen in one pass and return every match of each.
+        region: [x, y, width, height] to search only part of the screen; scales: template
+        sizes to try (e.g. [0.8, 1.0, 1.25] for scaled UIs).
         """
         try:
-            location = pyautogui.locateOnScreen(image_path, confidence=confidence)
-            if location:
-                center = pyautogui.center(location)
-                return f"Image found at: {center} (region: {location})"
-            else:
-                return f"Image not found on screen: {image_path}"
+            if region is not None and len(region) != 4:
+                return "Error finding image: region must be [x, y, width, height]"
+            results = self.locator.locate_all(
+                self.capture.frame(), image_paths, confidence=confidence,
+                region=tuple(int(v) for v in region) if region else None,
+                scales=scales or (1.0,), max_matches=max_matches,
+            )
+            return "\n".join(self._format_matches(path, matches) for path, matches in results.items())
         except Exception as e:
             return f"Error finding image: {str(e)}"
     
+    def find_on_screen(self, image_path: str, confidence: float = 0.8, region: Optional[List[int]] = None,
+                       scales: Optional[List[float]] = None, max_matches: int = 5):
+        """
+        Find an image on the screen and return the coordinates of every match.
+        Uses OpenCV template matching on the buffered screen frame.
+        """
+        return self.find_images_on_screen([image_path], confidence, region, scales, max_matches)
+    
     def get_screen_size(self):
         """Get the screen resolution."""
         try:
@@ -185,17 +273,14 @@ class DesktopTools:
     def click_button_in_window(self, window_title: str, button_name: str):
         """Click a button in a specific window using pywinauto."""
         try:
-            desktop = Desktop(backend="uia")
-            windows = desktop.windows()
-            
-            for win in windows:
+            for info in self.windows.matches(window_title, fuzzy=False):
                 try:
-                    win_title = win.window_text()
-                    if window_title.lower() in win_title.lower():
-                        # Try to find and click the button
-                        button = win.child_window(title=button_name, control_type="Button")
-                        button.click()
-                        return f"Clicked button '{button_name}' in window '{win_title}'"
+                    # Try to find and click the button, once it is enabled
+                    button = self.windows.window(info.handle).child_window(title=button_name, control_type="Button")
+                    if not self.pacer.wait_until(button.is_enabled):
+                        return f"Could not click button '{button_name}' in window '{info.title}': it is disabled"
+                    button.click()
+                    return f"Clicked button '{button_name}' in window '{info.title}'"
                 except:
                     continue
             
@@ -206,17 +291,14 @@ class DesktopTools:
     def type_in_field(self, window_title: str, field_name: str, text: str):
         """Type text into a specific field in a window."""
         try:
-            desktop = Desktop(backend="uia")
-            windows = desktop.windows()
-            
-            for win in windows:
+            for info in self.windows.matches(window_title, fuzzy=False):
                 try:
-                    win_title = win.window_text()
-                    if window_title.lower() in win_title.lower():
-                        # Try to find and type in the field
-                        field = win.child_window(title=field_name, control_type="Edit")
-                        field.set_text(text)
-                        return f"Typed text into field '{field_name}' in window '{win_title}'"
+                    # Try to find and type in the field
+                    field = self.windows.window(info.handle).child_window(title=field_name, control_type="Edit")
+                    if not self.pacer.wait_until(field.is_enabled):
+                        return f"Could not type in field '{field_name}' in window '{info.title}': it is disabled"
+                    field.set_text(text)
+                    return f"Typed text into field '{field_name}' in window '{info.title}'"
                 except:
                     continue
             
@@ -226,35 +308,35 @@ class DesktopTools:
     
     def get_window_info(self, title: str):
         """Get detailed information about a window."""
-        try:
-            desktop = Desktop(backend="uia")
-            windows = desktop.windows()
-            
-            for win in windows:
-                try:
-                    win_title = win.window_text()
-                    if title.lower() in win_title.lower():
-                        rect = win.rectangle()
-                        info = f"Window: {win_title}\n"
-                        info += f"Position: ({rect.left}, {rect.top})\n"
-                        info += f"Size: {rect.width()}x{rect.height()}\n"
-                        info += f"Visible: {win.is_visible()}\n"
-                        info += f"Enabled: {win.is_enabled()}"
-                        return info
-                except:
-                    continue
-            
-            return f"Window with title containing '{title}' not found."
-        except Exception as e:
-            return f"Error getting window info: {str(e)}"
+        def action(win, info):
+            # Read live: the indexed rect can be out of date after a user drag
+            rect = win.rectangle()
+            self.windows.update(info.handle, rect=(rect.left, rect.top, rect.right, rect.bottom))
+            text = f"Window: {info.title}\n"
+            if info.process:
+                text += f"Process: {info.process} (pid {info.pid})\n"
+            text += f"Position: ({rect.left}, {rect.top})\n"
+            text += f"Size: {rect.width()}x{rect.height()}\n"
+            text += f"Visible: {win.is_visible()}\n"
+            text += f"Enabled: {win.is_enabled()}"
+            return text
+        return self._with_window(title, action, "getting window info", fuzzy=True)
     
     # ===== Advanced Mouse Enhancements =====
     
-    def drag_and_drop(self, x1: int, y1: int, x2: int, y2: int, duration: float = 1.0):
+    def drag_and_drop(self, x1: int, y1: int, x2: int, y2: int, duration: Optional[float] = None,
+                      human: Optional[bool] = None):
         """Drag from (x1, y1) to (x2, y2)."""
         try:
-            pyautogui.moveTo(x1, y1, duration=duration/2)
-            pyautogui.dragTo(x2, y2, duration=duration/2, button='left')
+            if duration is None:
+                approach = self._move_duration(x1, y1, human)
+                # Many drop targets only react to movement, so a drag is never instant
+                drag = max(0.1, self.pacer.move_duration(math.hypot(x2 - x1, y2 - y1), human))
+            else:
+                approach = drag = duration / 2
+            pyautogui.moveTo(x1, y1, duration=approach)
+            pyautogui.dragTo(x2, y2, duration=drag, button='left')
+            self._after_input(human)
             return f"Dragged from ({x1}, {y1}) to ({x2}, {y2})"
         except Exception as e:
             return f"Error dragging: {str(e)}"
@@ -263,6 +345,7 @@ class DesktopTools:
         """Scroll with mouse wheel. Positive = up, negative = down."""
         try:
             pyautogui.scroll(clicks)
+            self._after_input()
             direction = "up" if clicks > 0 else "down"
             return f"Scrolled {abs(clicks)} clicks {direction}"
         except Exception as e:
@@ -272,6 +355,7 @@ class DesktopTools:
         """Right-click at specific coordinates."""
         try:
             pyautogui.rightClick(x, y)
+            self._after_input()
             return f"Right-clicked at ({x}, {y})"
         except Exception as e:
             return f"Error right-clicking: {str(e)}"
@@ -280,84 +364,70 @@ class DesktopTools:
     
     def close_window(self, title: str):
         """Close a window by its title."""
-        try:
-            desktop = Desktop(backend="uia")
-            windows = desktop.windows()
-            for win in windows:
-                try:
-                    win_title = win.window_text()
-                    if title.lower() in win_title.lower():
-                        win.close()
-                        return f"Closed window: {win_title}"
-                except:
-                    continue
-            return f"Window with title containing '{title}' not found."
-        except Exception as e:
-            return f"Error closing window: {str(e)}"
+        def action(win, info):
+            win.close()
+            self.windows.discard(info.handle)
+            return f"Closed window: {info.title}"
+        return self._with_window(title, action, "closing window")
     
     def resize_window(self, title: str, width: int, height: int):
         """Resize a window to specific dimensions."""
-        try:
-            desktop = Desktop(backend="uia")
-            windows = desktop.windows()
-            for win in windows:
-                try:
-                    win_title = win.window_text()
-                    if title.lower() in win_title.lower():
-                        rect = win.rectangle()
-                        win.move_window(rect.left, rect.top, width, height)
-                        return f"Resized window '{win_title}' to {width}x{height}"
-                except:
-                    continue
-            return f"Window with title containing '{title}' not found."
-        except Exception as e:
-            return f"Error resizing window: {str(e)}"
+        def action(win, info):
+            rect = win.rectangle()
+            win.move_window(rect.left, rect.top, width, height)
+            self.windows.update(info.handle, rect=(rect.left, rect.top, rect.left + width, rect.top + height))
+            return f"Resized window '{info.title}' to {width}x{height}"
+        return self._with_window(title, action, "resizing window")
     
     def move_window_to(self, title: str, x: int, y: int):
         """Move a window to specific coordinates."""
-        try:
-            desktop = Desktop(backend="uia")
-            windows = desktop.windows()
-            for win in windows:
-                try:
-                    win_title = win.window_text()
-                    if title.lower() in win_title.lower():
-                        rect = win.rectangle()
-                        win.move_window(x, y, rect.width(), rect.height())
-                        return f"Moved window '{win_title}' to ({x}, {y})"
-                except:
-                    continue
-            return f"Window with title containing '{title}' not found."
-        except Exception as e:
-            return f"Error moving window: {str(e)}"
+        def action(win, info):
+            rect = win.rectangle()
+            win.move_window(x, y, rect.width(), rect.height())
+            self.windows.update(info.handle, rect=(x, y, x + rect.width(), y + rect.height()))
+            return f"Moved window '{info.title}' to ({x}, {y})"
+        return self._with_window(title, action, "moving window")
     
     def restore_window(self, title: str):
         """Restore a minimized window."""
+        def action(win, info):
+            win.restore()
+            return f"Restored window: {info.title}"
+        return self._with_window(title, action, "restoring window")
+    
+    def wait_for_screen_change(self, x: int, y: int, width: int, height: int, timeout: float = 5.0):
+        """Wait until a screen region changes (e.g. a dialog opens or a page finishes loading)."""
         try:
-            desktop = Desktop(backend="uia")
-            windows = desktop.windows()
-            for win in windows:
-                try:
-                    win_title = win.window_text()
-                    if title.lower() in win_title.lower():
-                        win.restore()
-                        return f"Restored window: {win_title}"
-                except:
-                    continue
-            return f"Window with title containing '{title}' not found."
+            grab = lambda: self.capture.region(x, y, width, height, max_age=0).tobytes()
+            start = time.perf_counter()
+            if self.pacer.wait_for_change(grab, timeout):
+                return f"Region ({x}, {y}, {width}x{height}) changed after {time.perf_counter() - start:.2f}s"
+            return f"Timed out: region ({x}, {y}, {width}x{height}) did not change within {timeout}s"
         except Exception as e:
-            return f"Error restoring window: {str(e)}"
+            return f"Error waiting for screen change: {str(e)}"
     
     # ===== Screen Capture Enhancements =====
     
+    def get_screen_changes(self, wait: float = 0.0):
+        """List the screen regions that changed since the last capture (optionally after waiting)."""
+        try:
+            if wait > 0:
+                time.sleep(min(wait, self.MAX_WAIT))
+            regions = self.capture.changes(threshold=8)
+            if not regions:
+                return "No screen changes since the last capture."
+            shown = "\n".join(f"- ({x}, {y}) {w}x{h}" for x, y, w, h in regions[:20])
+            more = f"\n...[{len(regions) - 20} more]" if len(regions) > 20 else ""
+            return f"{len(regions)} changed region(s):\n{shown}{more}"
+        except Exception as e:
+            return f"Error detecting screen changes: {str(e)}"
+    
     def capture_region(self, x: int, y: int, width: int, height: int, filename: str = "region.png"):
-        """Capture a specific region of the screen."""
+        """Capture a specific region of the screen (.png, .jpg or .webp by filename)."""
         try:
             import os
-            os.makedirs("screenshots", exist_ok=True)
             filepath = os.path.join("screenshots", filename)
-            screenshot = pyautogui.screenshot(region=(x, y, width, height))
-            screenshot.save(filepath)
+            self.capture.save(filepath, region=(x, y, width, height))
             return f"Region screenshot saved to {filepath}"
         except Exception as e:
             return f"Error capturing region: {str(e)}"
@@ -365,7 +435,124 @@ class DesktopTools:
     def get_pixel_color(self, x: int, y: int):
         """Get the RGB color of a pixel at specific coordinates."""
         try:
-            pixel = pyautogui.pixel(x, y)
+            pixel = self.capture.pixel(x, y)
             return f"Pixel color at ({x}, {y}): RGB{pixel}"
         except Exception as e:
             return f"Error getting pixel color: {str(e)}"
+    
+    # ===== Batched Actions =====
+    
+    @staticmethod
+    def _coerce(name: str, value: Any, annotation: Any) -> Any:
+        """Checks/converts a step argument against the method's annotation."""
+        if typing.get_origin(annotation) is typing.Union:
+            if value is None:
+                return None
+            annotation = next(a for a in typing.get_args(annotation) if a is not type(None))
+        if annotation is bool:
+            if not isinstance(value, bool):
+                raise ValueError(f"'{name}' must be true or false")
+            return value
+        if annotation in (int, float):
+            if isinstance(value, bool):
+                raise ValueError(f"'{name}' must be a number")
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"'{name}' must be a number, got {value!r}")
+            if annotation is int:
+                if number != int(number):
+                    raise ValueError(f"'{name}' must be a whole number, got {value!r}")
+                return int(number)
+            return number
+        if annotation is str and not isinstance(value, str):
+            raise ValueError(f"'{name}' must be a string")
+        return value
+    
+    def _prepare_action(self, step: Dict[str, Any]) -> Tuple[str, Callable[[], str]]:
+        """Validates one run_actions step; returns (action name, zero-argument call)."""
+        if not isinstance(step, dict):
+            raise ValueError("each step must be an object with an 'action' field")
+        params = dict(step)
+        action = params.pop("action", None)
+        if action not in self.ACTIONS:
+            raise ValueError(f"unknown action {action!r} (expected one of {', '.join(self.ACTIONS)})")
+        if action == "wait":
+            seconds = self._coerce("seconds", params.pop("seconds", None), float)
+            if params:
+                raise ValueError(f"unexpected field(s) for wait: {', '.join(params)}")
+            if not 0 <= seconds <= self.MAX_WAIT:
+                raise ValueError(f"'seconds' must be between 0 and {self.MAX_WAIT}")
+            return action, lambda: (time.sleep(seconds), f"Waited {seconds}s")[1]
+        if action == "hotkey":
+            keys = params.pop("keys", None)
+            if params:
+                raise ValueError(f"unexpected field(s) for hotkey: {', '.join(params)}")
+            if not keys or not isinstance(keys, list) or not all(isinstance(k, str) and k for k in keys):
+                raise ValueError("hotkey needs 'keys', a list of key names")
+            return action, functools.partial(self.hotkey, *keys)
+
+        method = getattr(self, self.ACTIONS[action])
+        signature = inspect.signature(method)
+        unknown = [name for name in params if name not in signature.parameters]
+        if unknown:
+            raise ValueError(f"unexpected field(s) for {action}: {', '.join(unknown)} "
+                             f"(accepts {', '.join(signature.parameters)})")
+        missing = [name for name, p in signature.parameters.items()
+                   if p.default is inspect.Parameter.empty and name not in params]
+        if missing:
+            raise ValueError(f"{action} is missing {', '.join(missing)}")
+        kwargs = {name: self._coerce(name, value, signature.parameters[name].annotation)
+                  for name, value in params.items()}
+        return action, functools.partial(method, **kwargs)
+    
+    def run_actions(self, actions: List[Dict[str, Any]], stop_on_error: bool = True):
+        """
+        Run a list of mouse/keyboard/window steps back-to-back in one call.
+        Each step is {"action": name, ...fields}; the whole list is validated before
+        anything runs. Stops at the first failed step (unless stop_on_error=False) or
+        when the PyAutoGUI failsafe is triggered.
+        """
+        try:
+            if isinstance(actions, dict):
+                actions = [actions]
+            if not actions:
+                return "Error running actions: no actions given"
+            if len(actions) > self.MAX_ACTIONS:
+                return f"Error running actions: at most {self.MAX_ACTIONS} steps per call"
+            steps = []
+            for i, step in enumerate(actions, 1):
+                try:
+                    steps.append(self._prepare_action(step))
+                except ValueError as e:
+                    return f"Error running actions: step {i}: {str(e)} (nothing was run)"
+
+            lines, ran, failed, aborted = [], 0, 0, False
+            start = time.perf_counter()
+            for i, (action, call) in enumerate(steps, 1):
+                try:
+                    pyautogui.failSafeCheck()
+                except pyautogui.FailSafeException:
+                    lines.append(f"{i}. {action}: not run, PyAutoGUI failsafe triggered (mouse in a screen corner)")
+                    aborted = True
+                    break
+                output = str(call())
+                ran += 1
+                if self.window_missed(output):
+                    failed += 1
+                    lines.append(f"{i}. {action}: FAILED {output[:200]}")
+                    if stop_on_error:
+                        break
+                else:
+                    lines.append(f"{i}. {action}: {output[:120]}")
+
+            header = f"Ran {ran}/{len(steps)} actions in {time.perf_counter() - start:.2f}s"
+            if failed:
+                header += f", {failed} failed"
+            if aborted:
+                header += "; aborted by the failsafe"
+            elif ran < len(steps):
+                header += f"; stopped at step {ran}"
+            return header + "\n" + "\n".join(lines)
+        except Exception as e:
+            return f"Error running actions: {str(e)}"
@@ -0,0 +1,124 @@
+"""
+Batched DOM extraction: a list of selector/operation specs evaluated in a single
+page.evaluate() call. Limits are applied inside the page, so only the nodes and
+characters that are actually returned cross the Playwright connection.
+
+A spec is a dict:
+    selector   CSS selector (default 'body', or 'a[href]' for links)
+    op         'text' | 'attr' | 'value' | 'html' | 'count' | 'exists' | 'links' | 'table'
+    attr       attribute name for op='attr'
+    all        for text/attr/value/html: return up to `limit` matches instead of the first
+    limit      max items (matches, links or table rows), default 20
+    max_chars  max characters per string, default 300
+    name       key for this result (default '<op>:<selector>')
+"""
+import json
+from typing import Any, Dict, List
+
+OPS = {"text", "attr", "value", "html", "count", "exists", "links", "table"}
+DEFAULT_LIMIT = 20
+DEFAULT_MAX_CHARS = 300
+
+EXTRACT_JS = """
+({specs, defaults}) => {
+    const clip = (s, n) => {
+        s = (s || '').replace(/\\s+/g, ' ').trim();
+        return s.length > n ? s.slice(0, n) + '…' : s;
+    };
+    const read = (el, spec, n) => {
+        switch (spec.op) {
+            case 'attr': {
+                const v = el.getAttribute(spec.attr);
+                return v === null ? null : clip(v, n);
+            }
+            case 'value': return 'value' in el ? clip(String(el.value), n) : null;
+            case 'html': return clip(el.outerHTML, n);
+            default: return clip(el.textContent, n);
+        }
+    };
+    const out = {};
+    for (const spec of specs) {
+        const op = spec.op || 'text';
+        const selector = spec.selector || (op === 'links' ? 'a[href]' : 'body');
+        const key = spec.name || `${op}:${selector}`;
+        const limit = spec.limit ?? defaults.limit;
+        const n = spec.max_chars ?? defaults.max_chars;
+        const s = {...spec, op};
+        try {
+            if (op === 'count') { out[key] = document.querySelectorAll(selector).length; continue; }
+            if (op === 'exists') { out[key] = document.querySelector(selector) !== null; continue; }
+            if (op === 'links') {
+                const links = [];
+                for (const a of document.querySelectorAll(selector)) {
+                    if (links.length >= limit) break;
+                    const text = clip(a.textContent, n);
+                    if (a.href && text) links.push({text, href: a.href});
+                }
+                out[key] = links;
+                continue;
+            }
+            if (op === 'table') {
+                const table = document.querySelector(selector);
+                if (!table) { out[key] = null; continue; }
+                const rows = [];
+                for (const row of table.querySelectorAll('tr')) {
+                    if (rows.length >= limit) break;
+                    rows.push(Array.from(row.querySelectorAll('th, td'), cell => clip(cell.textContent, n)));
+                }
+                out[key] = rows;
+                continue;
+            }
+            if (spec.all) {
+                const values = [];
+                for (const el of document.querySelectorAll(selector)) {
+                    if (values.length >= limit) break;
+                    values.push(read(el, s, n));
+                }
+                out[key] = values;
+            } else {
+                const el = document.querySelector(selector);
+                out[key] = el ? read(el, s, n) : null;
+            }
+        } catch (e) {
+            out[key] = {error: String(e)};
+        }
+    }
+    return out;
+}
+"""
+
+
+def normalize_specs(specs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Validates specs and fills in defaults; raises ValueError on a bad spec."""
+    if isinstance(specs, dict):
+        specs = [specs]
+    normalized = []
+    for spec in specs:
+        if isinstance(spec, str):
+            spec = {"selector": spec}
+        spec = dict(spec)
+        op = spec.setdefault("op", "text")
+        if op not in OPS:
+            raise ValueError(f"unknown op '{op}' (expected one of {', '.join(sorted(OPS))})")
+        if op == "attr" and not spec.get("attr"):
+            raise ValueError(f"op 'attr' needs an 'attr' name (selector {spec.get('selector')})")
+        for field in ("limit", "max_chars"):
+            if field in spec:
+                spec[field] = max(0, int(spec[field]))
+        normalized.append(spec)
+    return normalized
+
+
+def evaluate_args(specs: List[Dict[str, Any]], limit: int = DEFAULT_LIMIT,
+                  max_chars: int = DEFAULT_MAX_CHARS) -> Dict[str, Any]:
+    """The argument object EXTRACT_JS expects."""
+    return {"specs": normalize_specs(specs), "defaults": {"limit": limit, "max_chars": max_chars}}
+
+
+def extract(page, specs: List[Dict[str, Any]], **defaults) -> Dict[str, Any]:
+    """Runs all specs against a sync Playwright page in one round-trip."""
+    return page.evaluate(EXTRACT_JS, evaluate_args(specs, **defaults))
+
+
+def to_json(results: Dict[str, Any]) -> str:
+    return json.dumps(results, ensure_ascii=False)
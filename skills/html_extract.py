@@ -0,0 +1,266 @@
+"""
+Streaming HTML-to-text extraction.
+
+The document is fed to the parser chunk by chunk and turned into text blocks from
+parser events, without building a tree. Parsing stops as soon as enough text has been
+collected, so a multi-MB page costs about as much as its first few screens. lxml is
+used when installed; html.parser is the fallback.
+"""
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import Iterable, List, Optional, Tuple, Union
+
+# Elements whose content is never page text
+SKIP_TAGS = {
+    "script", "style", "noscript", "template", "svg", "canvas", "iframe", "object",
+    "nav", "footer", "header", "aside", "button", "select", "head",
+}
+
+# Elements that end the current line of text
+BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "li", "ul", "ol", "dl", "dt", "dd",
+    "h1", "h2", "h3", "h4", "h5", "h6", "br", "hr", "tr", "td", "th", "table",
+    "blockquote", "pre", "figcaption", "body", "title",
+}
+
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+}
+
+MAIN_TAGS = {"main", "article"}
+
+# Page-level elements that are never treated as chrome, whatever their class/id says
+# (e.g. <body class="has-sidebar with-comments">)
+CONTENT_ROOT_TAGS = {"html", "body", "main", "article"}
+
+# Containers whose class/id is checked for chrome names
+CONTAINER_TAGS = {"nav", "aside", "footer", "header", "div", "section"}
+
+# Chrome names inside a class/id token, delimited by '-' or '_' ("site-footer",
+# "ad-slot", "share-buttons", "main-nav", "cookie-banner")
+_BOILERPLATE_RE = re.compile(
+    r"(^|[_-])(nav|navbar|menu|footer|sidebar|side-bar|breadcrumbs?|cookies?|consent|"
+    r"banner|ads?|advert\w*|promo\w*|sponsor\w*|share|social|related|recommended|comments?|"
+    r"subscribe|newsletter|popup|modal|skip-link|navigation)($|[_-])",
+    re.IGNORECASE,
+)
+
+# State classes that mention a chrome word without being chrome ("has-sidebar",
+# "with-comments", "modal-open", "cookies-accepted")
+_STATE_TOKEN_RE = re.compile(r"^(has|with)[_-]|[_-](open|accepted)$", re.IGNORECASE)
+
+# ARIA roles of chrome landmarks
+BOILERPLATE_ROLES = {"navigation", "complementary", "contentinfo", "banner", "menu", "menubar"}
+
+_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([\w-]+)""", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+# How much text to collect before giving up on finding a <main>/<article> region
+OVERSCAN = 4
+
+
+class TextCollector:
+    """
+    Parser target that collects text blocks from start/end/data events.
+
+    Skipped elements (scripts, navigation, elements whose class/id/role looks like
+    chrome) contribute nothing. Blocks dominated by link text (menus, tag clouds) are
+    dropped. If the page has a <main>/<article> region, only its blocks are kept.
+    `done` turns True once enough text has been collected to stop parsing.
+    """
+
+    def __init__(self, max_chars: int = 4000):
+        self.max_chars = max_chars
+        self.blocks: List[Tuple[str, bool]] = []
+        self.total_chars = 0
+        self.main_chars = 0
+        self.done = False
+        self._stack: List[Tuple[str, bool, bool]] = []
+        self._skip_depth = 0
+        self._main_depth = 0
+        self._parts: List[str] = []
+        self._link_chars = 0
+        self._link_depth = 0
+
+    # Parser target interface
+    def start(self, tag, attrs):
+        tag = tag.lower() if isinstance(tag, str) else ""
+        if tag in VOID_TAGS:
+            if tag in ("br", "hr"):
+                self._flush()
+            return
+        skip = tag in SKIP_TAGS or self._is_boilerplate(tag, attrs)
+        main = tag in MAIN_TAGS or (attrs.get("role") or "").lower() == "main"
+        if tag in BLOCK_TAGS or skip or main:
+            self._flush()
+        self._stack.append((tag, skip, main))
+        self._skip_depth += skip
+        self._main_depth += main
+        self._link_depth += tag == "a"
+
+    def end(self, tag):
+        tag = tag.lower() if isinstance(tag, str) else ""
+        if tag in VOID_TAGS:
+            return
+        # Tolerate unbalanced markup: close everything up to the matching start tag
+        if not any(open_tag == tag for open_tag, _, _ in self._stack):
+            return
+        while self._stack:
+            open_tag, skip, main = self._stack.pop()
+            if open_tag in BLOCK_TAGS or skip or main:
+                self._flush()
+            self._skip_depth -= skip
+            self._main_depth -= main
+            self._link_depth -= open_tag == "a"
+            if open_tag == tag:
+                break
+
+    def data(self, text):
+        if self.done or self._skip_depth:
+            return
+        self._parts.append(text)
+        if self._link_depth:
+            self._link_chars += len(text.strip())
+
+    def comment(self, text):
+        pass
+
+    def close(self):
+        self._flush()
+        return self.text()
+
+    def _is_boilerplate(self, tag, attrs) -> bool:
+        role = (attrs.get("role") or "").lower()
+        if tag in CONTENT_ROOT_TAGS or role == "main":
+            return False
+        if role in BOILERPLATE_ROLES:
+            return True
+        if tag in CONTAINER_TAGS:
+            for name in ("class", "id"):
+                for token in (attrs.get(name) or "").split():
+                    if not _STATE_TOKEN_RE.search(token) and _BOILERPLATE_RE.search(token):
+                        return True
+        return attrs.get("aria-hidden") == "true" or "hidden" in attrs
+
+    def _flush(self):
+        if not self._parts:
+            return
+        text = _SPACE_RE.sub(" ", "".join(self._parts)).strip()
+        link_chars = self._link_chars
+        self._parts = []
+        self._link_chars = 0
+        if not text or self.done:
+            return
+        # Menus and link lists: mostly link text and few words of their own
+        if link_chars > 0.6 * len(text) and len(text.split()) < 30:
+            return
+        in_main = self._main_depth > 0
+        self.blocks.append((text, in_main))
+        self.total_chars += len(text) + 1
+        if in_main:
+            self.main_chars += len(text) + 1
+        if self.main_chars > self.max_chars or (
+                not self.main_chars and self.total_chars > self.max_chars * OVERSCAN):
+            self.done = True
+
+    def text(self) -> str:
+        """The collected text, restricted to the main region if the page has one."""
+        main_only = self.main_chars > min(self.max_chars, 500)
+        lines = [text for text, in_main in self.blocks if in_main or not main_only]
+        return "\n".join(lines)
+
+
+class _StdlibParser(HTMLParser):
+    """html.parser front-end that forwards events to a TextCollector."""
+
+    def __init__(self, target: TextCollector):
+        super().__init__(convert_charrefs=True)
+        self.target = target
+
+    def handle_starttag(self, tag, attrs):
+        self.target.start(tag, {k: v or "" for k, v in attrs})
+
+    def handle_startendtag(self, tag, attrs):
+        self.target.start(tag, {k: v or "" for k, v in attrs})
+        if tag not in VOID_TAGS:
+            self.target.end(tag)
+
+    def handle_endtag(self, tag):
+        self.target.end(tag)
+
+    def handle_data(self, data):
+        self.target.data(data)
+
+
+def available_parser() -> str:
+    """'lxml' if it is installed, else 'html.parser'."""
+    try:
+        import lxml.etree  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+def _make_parser(parser: str, target: TextCollector):
+    if parser == "lxml":
+        from lxml import etree
+        return etree.HTMLParser(target=target, remove_comments=True, remove_pis=True)
+    return _StdlibParser(target)
+
+
+def sniff_encoding(head: bytes, default: str = "utf-8") -> str:
+    """Charset from a BOM or <meta charset> in the first bytes of a document."""
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    match = _CHARSET_RE.search(head[:4096])
+    if match:
+        try:
+            return codecs.lookup(match.group(1).decode("ascii")).name
+        except (LookupError, UnicodeDecodeError):
+            pass
+    return default
+
+
+def extract_text(chunks: Iterable[Union[bytes, str]], max_chars: int = 4000,
+                 encoding: Optional[str] = None, parser: Optional[str] = None) -> Tuple[str, bool]:
+    """
+    Extracts readable text from an HTML document given as an iterable of chunks
+    (e.g. response.iter_content()). Returns (text, complete), where complete is False
+    if parsing stopped early because max_chars of text had been collected.
+    """
+    target = TextCollector(max_chars)
+    html_parser = _make_parser(parser or available_parser(), target)
+    decoder = None
+    head = b""
+    fed = False
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                # Buffer enough of the document to find a <meta charset>
+                head += chunk
+                if len(head) < 4096:
+                    continue
+                decoder = codecs.getincrementaldecoder(encoding or sniff_encoding(head))(errors="replace")
+                chunk, head = head, b""
+            chunk = decoder.decode(chunk)
+        if chunk:
+            html_parser.feed(chunk)
+            fed = True
+        if target.done:
+            break
+    if head:
+        html_parser.feed(head.decode(encoding or sniff_encoding(head), errors="replace"))
+        fed = True
+    complete = not target.done
+    # lxml rejects an empty document on close
+    if complete and fed:
+        if decoder is not None:
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                html_parser.feed(tail)
+        html_parser.close()
+    return target.close(), complete
@@ -0,0 +1,255 @@
+"""
+Template matching for locating images on screen, on OpenCV.
+
+- Templates are decoded once and cached (keyed by path, size and mtime, so an
+  edited file is reloaded), together with their resized and downsampled versions.
+- Matching runs coarse-to-fine on image pyramids: candidates are found on a
+  downsampled frame, then confirmed at full resolution in a small window around
+  each one. Templates can be searched at several scales (UI scaling, zoom).
+- The search can be restricted to a region of interest.
+- Every match above the confidence is returned, with overlapping detections
+  merged by non-maximum suppression.
+- Many templates can be searched in one pass: the frame's grayscale pyramid is
+  built once and shared.
+"""
+import os
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from skills.cache import TTLCache
+from skills.lazy_import import LazyModule
+
+cv2 = LazyModule("cv2")
+np = LazyModule("numpy")
+
+Region = Tuple[int, int, int, int]  # x, y, width, height
+
+# Smallest template side searched at a pyramid level; below this, matches get unreliable
+MIN_TEMPLATE_SIDE = 12
+MAX_LEVEL = 2
+# How far below the confidence a candidate may score per pyramid level and still be
+# confirmed at full resolution (downsampling blurs away detail, lowering true scores)
+COARSE_SLACK = 0.08
+MAX_SLACK = 0.15
+
+
+class Match:
+    __slots__ = ("x", "y", "width", "height", "score", "scale", "template")
+
+    def __init__(self, x: int, y: int, width: int, height: int, score: float, scale: float = 1.0,
+                 template: str = ""):
+        self.x, self.y, self.width, self.height = x, y, width, height
+        self.score, self.scale, self.template = score, scale, template
+
+    @property
+    def center(self) -> Tuple[int, int]:
+        return self.x + self.width // 2, self.y + self.height // 2
+
+    @property
+    def box(self) -> Region:
+        return self.x, self.y, self.width, self.height
+
+    def __repr__(self):
+        return f"Match({self.x}, {self.y}, {self.width}x{self.height}, score={self.score:.3f}, scale={self.scale})"
+
+
+def to_gray(image: "np.ndarray") -> "np.ndarray":
+    if image.ndim == 2:
+        return image
+    code = cv2.COLOR_RGBA2GRAY if image.shape[2] == 4 else cv2.COLOR_RGB2GRAY
+    return cv2.cvtColor(np.ascontiguousarray(image), code)
+
+
+def build_pyramid(gray: "np.ndarray", levels: int) -> List["np.ndarray"]:
+    """[full, 1/2, 1/4, ...] resolution images, levels + 1 in total."""
+    pyramid = [gray]
+    for _ in range(levels):
+        if min(pyramid[-1].shape[:2]) < 2 * MIN_TEMPLATE_SIDE:
+            break
+        pyramid.append(cv2.pyrDown(pyramid[-1]))
+    return pyramid
+
+
+def non_max_suppression(boxes: "np.ndarray", scores: "np.ndarray", iou: float = 0.3) -> List[int]:
+    """Indices of the boxes (x, y, w, h) kept, best score first, dropping overlaps above iou."""
+    if len(boxes) == 0:
+        return []
+    x1, y1 = boxes[:, 0], boxes[:, 1]
+    x2, y2 = x1 + boxes[:, 2], y1 + boxes[:, 3]
+    areas = boxes[:, 2] * boxes[:, 3]
+    order = np.argsort(-scores)
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(int(i))
+        rest = order[1:]
+        w = np.clip(np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest]), 0, None)
+        h = np.clip(np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest]), 0, None)
+        overlap = w * h / (areas[i] + areas[rest] - w * h)
+        order = rest[overlap <= iou]
+    return keep
+
+
+def peaks(scores: "np.ndarray", threshold: float, size: Tuple[int, int], limit: int) -> List[Tuple[int, int, float]]:
+    """
+    Local maxima of a matchTemplate score map at or above threshold, as (x, y, score),
+    best first. Each blob of high scores yields one peak instead of every pixel in it.
+    """
+    scores = np.nan_to_num(scores, nan=-1.0, posinf=-1.0, neginf=-1.0)
+    kernel = np.ones((max(3, size[1] // 2 | 1), max(3, size[0] // 2 | 1)), np.uint8)
+    local_max = scores >= cv2.dilate(scores, kernel)
+    ys, xs = np.nonzero(local_max & (scores >= threshold))
+    values = scores[ys, xs]
+    order = np.argsort(-values)[:limit]
+    return [(int(xs[i]), int(ys[i]), float(values[i])) for i in order]
+
+
+class Template:
+    """A decoded grayscale template and its scaled pyramids, built on demand."""
+
+    def __init__(self, name: str, gray: "np.ndarray"):
+        self.name = name
+        self.gray = gray
+        self._pyramids: Dict[float, List["np.ndarray"]] = {}
+        self._lock = threading.Lock()
+
+    def pyramid(self, scale: float) -> List["np.ndarray"]:
+        with self._lock:
+            if scale not in self._pyramids:
+                image = self.gray
+                if scale != 1.0:
+                    h, w = image.shape[:2]
+                    size = (max(1, round(w * scale)), max(1, round(h * scale)))
+                    image = cv2.resize(image, size, interpolation=cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR)
+                self._pyramids[scale] = build_pyramid(image, MAX_LEVEL)
+            return self._pyramids[scale]
+
+
+class ImageLocator:
+    """
+    Finds template images in frames (HxWx3 RGB or grayscale arrays).
+    The pyramid of the last frame searched is kept, so several lookups on the same
+    buffered screen frame share it.
+    """
+
+    def __init__(self, cache_size: int = 64):
+        self.templates = TTLCache(max_entries=cache_size, default_ttl=float("inf"))
+        self._haystack: Optional[Tuple["np.ndarray", Optional[Region], List["np.ndarray"]]] = None
+        self._lock = threading.Lock()
+
+    def template(self, path: str) -> Template:
+        """Decoded template for path, from cache unless the file changed."""
+        stat = os.stat(path)
+        key = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        template = self.templates.get(key)
+        if template is None:
+            gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if gray is None:
+                raise ValueError(f"could not decode image '{path}'")
+            if gray.min() == gray.max():
+                # Normalized correlation is undefined for a flat template: it "matches" anywhere
+                raise ValueError(f"image '{path}' is a single flat colour")
+            template = Template(path, gray)
+            self.templates.put(key, template)
+        return template
+
+    def _pyramid(self, frame: "np.ndarray", region: Optional[Region]) -> List["np.ndarray"]:
+        with self._lock:
+            cached = self._haystack
+            if cached is not None and cached[0] is frame and cached[1] == region:
+                return cached[2]
+        image = frame
+        if region:
+            x, y, w, h = region
+            image = frame[max(0, y):y + h, max(0, x):x + w]
+        pyramid = build_pyramid(to_gray(image), MAX_LEVEL)
+        with self._lock:
+            self._haystack = (frame, region, pyramid)
+        return pyramid
+
+    @staticmethod
+    def _level_for(haystack: List["np.ndarray"], template_pyramid: List["np.ndarray"]) -> int:
+        """Coarsest level at which the template is still at least MIN_TEMPLATE_SIDE."""
+        level = 0
+        while (level + 1 < min(len(haystack), len(template_pyramid))
+               and min(template_pyramid[level + 1].shape[:2]) >= MIN_TEMPLATE_SIDE):
+            level += 1
+        return level
+
+    def _search(self, haystack: List["np.ndarray"], template: Template, scale: float,
+                confidence: float, limit: int) -> List[Match]:
+        tpl = template.pyramid(scale)
+        th, tw = tpl[0].shape[:2]
+        full = haystack[0]
+        if th > full.shape[0] or tw > full.shape[1]:
+            return []
+        level = self._level_for(haystack, tpl)
+        coarse_tpl, coarse_hay = tpl[level], haystack[level]
+        if coarse_tpl.shape[0] > coarse_hay.shape[0] or coarse_tpl.shape[1] > coarse_hay.shape[1]:
+            level, coarse_tpl, coarse_hay = 0, tpl[0], full
+        scores = cv2.matchTemplate(coarse_hay, coarse_tpl, cv2.TM_CCOEFF_NORMED)
+        if level == 0:
+            return [Match(x, y, tw, th, score, scale, template.name)
+                    for x, y, score in peaks(scores, confidence, (tw, th), limit)]
+
+        # Confirm each coarse candidate at full resolution within a small window
+        factor = 2 ** level
+        # A coarse pixel spans `factor` full-resolution ones
+        pad = factor + 1
+        slack = min(MAX_SLACK, COARSE_SLACK * level)
+        candidates = peaks(scores, confidence - slack, coarse_tpl.shape[::-1], limit * 3)
+        matches = []
+        for cx, cy, _ in candidates:
+            if len(matches) >= limit:
+                break
+            x0, y0 = max(0, cx * factor - pad), max(0, cy * factor - pad)
+            x1, y1 = min(full.shape[1], cx * factor + tw + pad), min(full.shape[0], cy * factor + th + pad)
+            window = full[y0:y1, x0:x1]
+            if window.shape[0] < th or window.shape[1] < tw:
+                continue
+            refined = cv2.matchTemplate(window, tpl[0], cv2.TM_CCOEFF_NORMED)
+            _, best, _, (bx, by) = cv2.minMaxLoc(np.nan_to_num(refined, nan=-1.0))
+            if best >= confidence:
+                matches.append(Match(x0 + bx, y0 + by, tw, th, float(best), scale, template.name))
+        return matches
+
+    def locate_all(self, frame: "np.ndarray", templates: Sequence[str], confidence: float = 0.8,
+                   region: Optional[Region] = None, scales: Sequence[float] = (1.0,),
+                   max_matches: int = 20, overlap: float = 0.3) -> Dict[str, List[Match]]:
+        """
+        Searches frame for every template at every scale; returns template -> matches
+        (best first, screen coordinates, overlapping detections suppressed).
+        """
+        haystack = self._pyramid(frame, region)
+        offset_x, offset_y = (max(0, region[0]), max(0, region[1])) if region else (0, 0)
+        results = {}
+        for name in templates:
+            template = self.template(name)
+            found = []
+            for scale in scales:
+                found.extend(self._search(haystack, template, float(scale), confidence, max_matches))
+            if found:
+                boxes = np.array([m.box for m in found], dtype=np.float64)
+                keep = non_max_suppression(boxes, np.array([m.score for m in found]), overlap)
+                found = [found[i] for i in keep[:max_matches]]
+            for match in found:
+                match.x += offset_x
+                match.y += offset_y
+            results[name] = found
+        return results
+
+    def locate(self, frame: "np.ndarray", template: str, **kwargs) -> List[Match]:
+        return self.locate_all(frame, [template], **kwargs)[template]
+
+
+_locator: Optional[ImageLocator] = None
+_locator_lock = threading.Lock()
+
+
+def get_image_locator() -> ImageLocator:
+    """Process-wide ImageLocator, so the template cache is shared."""
+    global _locator
+    with _locator_lock:
+        if _locator is None:
+            _locator = ImageLocator()
+        return _locator
@@ -0,0 +1,73 @@
+"""
+Pacing for synthetic mouse/keyboard input.
+
+Input is sent as fast as the target can take it: there is no fixed dead time after
+each call, only a short settle so the app sees events in separate message-loop
+turns. Where an action really depends on the UI catching up, DesktopTools waits
+for an observable condition instead (window in the foreground, control enabled,
+screen region changed), polling until it holds or a timeout runs out.
+
+Human-like pacing (eased mouse movement scaled by distance, jittered keystrokes
+and pauses) is opt-in per call, or for everything with VIORA_INPUT_HUMAN=1.
+"""
+import math
+import os
+import random
+import time
+from typing import Callable, Optional
+
+
+class InputPacer:
+    def __init__(self, settle: Optional[float] = None, human: Optional[bool] = None,
+                 timeout: Optional[float] = None, poll: float = 0.02, rng: Optional[random.Random] = None):
+        self.settle = settle if settle is not None else float(os.getenv("VIORA_INPUT_SETTLE", "0.01"))
+        self.human = human if human is not None else os.getenv("VIORA_INPUT_HUMAN", "0") == "1"
+        self.timeout = timeout if timeout is not None else float(os.getenv("VIORA_INPUT_WAIT_TIMEOUT", "2.0"))
+        self.poll = poll
+        self.rng = rng or random.Random()
+
+    def is_human(self, human: Optional[bool] = None) -> bool:
+        return self.human if human is None else human
+
+    def move_duration(self, distance: float, human: Optional[bool] = None) -> float:
+        """Seconds a pointer move of `distance` pixels should take: 0 (instant) unless human."""
+        if not self.is_human(human):
+            return 0.0
+        # Longer moves take longer, with diminishing growth (roughly Fitts' law)
+        base = 0.1 + 0.08 * math.log2(1 + distance / 20)
+        return min(1.0, base * self.rng.uniform(0.85, 1.2))
+
+    def key_interval(self, human: Optional[bool] = None) -> float:
+        """Delay between typed characters."""
+        if not self.is_human(human):
+            return 0.0
+        return max(0.02, self.rng.gauss(0.07, 0.025))
+
+    def pause(self, human: Optional[bool] = None):
+        """Gap after a complete action: the settle time, or a human reaction pause."""
+        delay = self.rng.uniform(0.08, 0.25) if self.is_human(human) else self.settle
+        if delay > 0:
+            time.sleep(delay)
+
+    def wait_until(self, condition: Callable[[], bool], timeout: Optional[float] = None) -> bool:
+        """
+        Polls condition until it is true or timeout (default self.timeout) runs out.
+        A condition that raises counts as false (e.g. the control isn't there yet).
+        """
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        while True:
+            try:
+                if condition():
+                    return True
+            except Exception:
+                pass
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.poll)
+
+    def wait_for_change(self, grab: Callable[[], bytes], timeout: Optional[float] = None,
+                        baseline: Optional[bytes] = None) -> bool:
+        """Waits until grab() returns something different from baseline (default: its first result)."""
+        if baseline is None:
+            baseline = grab()
+        return self.wait_until(lambda: grab() != baseline, timeout)
@@ -0,0 +1,39 @@
+import importlib
+import threading
+from typing import Callable, Optional
+
+
+class LazyModule:
+    """
+    Stand-in for a heavy module that performs the real import on first attribute access,
+    so importing a skill does not pay for backends that are never used.
+    `on_import` runs once with the loaded module (e.g. to apply settings).
+    """
+
+    def __init__(self, name: str, on_import: Optional[Callable] = None):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_on_import", on_import)
+        object.__setattr__(self, "_module", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            with self._lock:
+                module = self._module
+                if module is None:
+                    module = importlib.import_module(self._name)
+                    if self._on_import:
+                        self._on_import(module)
+                    object.__setattr__(self, "_module", module)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name} ({state})>"
@@ -1,39 +1,59 @@
-import json
 import os
 from datetime import datetime
+from skills.storage import Store, date_bounds
 
 class Organizer:
-    def __init__(self, storage_file: str = "data/organizer.json"):
+    def __init__(self, storage_file: str = "data/organizer.db"):
         self.storage_file = storage_file
-        self.data = self._load_data()
-
-    def _load_data(self):
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(self.storage_file), exist_ok=True)
-        if os.path.exists(self.storage_file):
-            with open(self.storage_file, 'r') as f:
-                return json.load(f)
-        return {"todos": [], "journal": []}
-
-    def save_data(self):
-        with open(self.storage_file, 'w') as f:
-            json.dump(self.data, f, indent=4)
+        # Entries from the old single-file JSON format are imported on first open
+        legacy_json = os.path.splitext(storage_file)[0] + ".json"
+        self.store = Store(
+            storage_file, ["todos", "journal"], legacy_json=legacy_json,
+            indexes={"todos": ["completed"]},
+            text_fields={"todos": ["task"], "journal": ["entry"]}
+        )
 
     def add_todo(self, task: str):
         """Adds a task to the todo list."""
-        self.data["todos"].append({"task": task, "completed": False, "created_at": datetime.now().isoformat()})
-        self.save_data()
+        self.store.append("todos", {"task": task, "completed": False, "created_at": datetime.now().isoformat()})
         return f"Added todo: {task}"
 
     def list_todos(self):
         """Lists all incomplete todos."""
-        incomplete = [t for t in self.data["todos"] if not t["completed"]]
+        incomplete = self.store.find("todos", {"completed": False})
         if not incomplete:
             return "No pending tasks."
         return "\n".join([f"- {t['task']}" for t in incomplete])
 
     def add_journal_entry(self, entry: str):
         """Adds a journal entry."""
-        self.data["journal"].append({"entry": entry, "timestamp": datetime.now().isoformat()})
-        self.save_data()
+        self.store.append("journal", {"entry": entry, "timestamp": datetime.now().isoformat()})
         return "Journal entry saved."
+
+    def search(self, query: str, limit: int = 10):
+        """Full-text search over todos and journal entries."""
+        try:
+            todos = self.store.search("todos", query, limit)
+            journal = self.store.search("journal", query, limit)
+        except Exception as e:
+            return f"Error searching organizer: {str(e)}"
+        if not todos and not journal:
+            return f"No todos or journal entries matching '{query}'."
+        lines = [f"- [todo{', done' if t['completed'] else ''}] {t['task']}" for t in todos]
+        lines += [f"- [journal {j['timestamp'][:10]}] {j['entry']}" for j in journal]
+        return "\n".join(lines)
+
+    def entries_between(self, kind: str, start_date: str = "", end_date: str = "", limit: int = 50):
+        """Lists todos or journal entries created between two dates (YYYY-MM-DD, inclusive)."""
+        if kind not in ("todos", "journal"):
+            return f"Invalid kind: {kind}. Valid kinds: ['todos', 'journal']"
+        try:
+            start, end = date_bounds(start_date or None, end_date or None)
+            entries = self.store.between(kind, start, end, limit)
+        except Exception as e:
+            return f"Error listing {kind}: {str(e)}"
+        if not entries:
+            return f"No {kind} found in that date range."
+        if kind == "todos":
+            return "\n".join(f"- [{t['created_at'][:10]}] {t['task']}{' (done)' if t['completed'] else ''}" for t in entries)
+        return "\n".join(f"- [{j['timestamp'][:16]}] {j['entry']}" for j in entries)
@@ -0,0 +1,165 @@
+"""
+Compact page snapshots for the LLM: a numbered list of the visible interactive
+elements with their accessibility role, accessible name and state.
+
+Each element is stamped with a data-viora-ref attribute the first time it is seen,
+so its number stays the same across snapshots of the same document and can be
+used to act on it (see ref_selector). Later snapshots of the same page can be sent
+as a diff against the previous one.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urldefrag
+
+REF_ATTRIBUTE = "data-viora-ref"
+
+SNAPSHOT_JS = """
+(maxElements) => {
+    const SELECTOR = 'a[href], button, input:not([type=hidden]), select, textarea, summary, [role], ' +
+        '[contenteditable=""], [contenteditable="true"], [tabindex]:not([tabindex="-1"]), [onclick]';
+    const ROLES = new Set(['button', 'link', 'checkbox', 'radio', 'textbox', 'searchbox', 'combobox',
+        'listbox', 'option', 'menuitem', 'menuitemcheckbox', 'menuitemradio', 'tab', 'switch',
+        'slider', 'spinbutton', 'treeitem']);
+    const INPUT_ROLES = {checkbox: 'checkbox', radio: 'radio', range: 'slider', number: 'spinbutton',
+        search: 'searchbox', button: 'button', submit: 'button', reset: 'button', image: 'button',
+        file: 'button'};
+    const VALUE_ROLES = new Set(['textbox', 'searchbox', 'combobox', 'spinbutton', 'slider']);
+    const clip = (s, n) => {
+        s = (s || '').replace(/\\s+/g, ' ').trim();
+        return s.length > n ? s.slice(0, n) + '…' : s;
+    };
+    const implicitRole = (el) => {
+        const tag = el.tagName.toLowerCase();
+        if (tag === 'a') return 'link';
+        if (tag === 'select') return el.multiple ? 'listbox' : 'combobox';
+        if (tag === 'textarea' || el.isContentEditable) return 'textbox';
+        if (tag === 'input') return INPUT_ROLES[(el.type || 'text').toLowerCase()] || 'textbox';
+        return 'button';
+    };
+    const nameOf = (el) => {
+        const ids = el.getAttribute('aria-labelledby');
+        if (ids) {
+            const text = ids.split(/\\s+/).map(id => document.getElementById(id))
+                .filter(Boolean).map(node => node.textContent).join(' ');
+            if (text.trim()) return clip(text, 80);
+        }
+        const label = el.getAttribute('aria-label') || (el.labels && el.labels.length ? el.labels[0].textContent : '');
+        if (label && label.trim()) return clip(label, 80);
+        const tag = el.tagName.toLowerCase();
+        if (tag === 'input' && ['submit', 'button', 'reset'].includes(el.type)) return clip(el.value, 80);
+        if (!['input', 'textarea', 'select'].includes(tag)) {
+            const text = clip(el.innerText || el.textContent, 80);
+            if (text) return text;
+            const img = el.querySelector('img[alt]');
+            if (img && img.alt.trim()) return clip(img.alt, 80);
+        }
+        return clip(el.getAttribute('placeholder') || el.getAttribute('title') || el.getAttribute('alt') ||
+            el.getAttribute('name') || '', 80);
+    };
+    const visible = (el) => {
+        if (el.closest('[hidden], [aria-hidden="true"]')) return false;
+        const rect = el.getBoundingClientRect();
+        if (rect.width === 0 && rect.height === 0) return false;
+        const style = getComputedStyle(el);
+        return style.visibility !== 'hidden' && style.display !== 'none';
+    };
+    window.__vioraRefSeq = window.__vioraRefSeq || 0;
+    const items = [];
+    let total = 0;
+    for (const el of document.querySelectorAll(SELECTOR)) {
+        const explicit = (el.getAttribute('role') || '').toLowerCase();
+        if (explicit && !ROLES.has(explicit)) continue;
+        if (!visible(el)) continue;
+        total++;
+        if (items.length >= maxElements) continue;
+        let ref = el.getAttribute('data-viora-ref');
+        if (!ref) {
+            ref = String(++window.__vioraRefSeq);
+            el.setAttribute('data-viora-ref', ref);
+        }
+        const role = explicit || implicitRole(el);
+        const item = {ref: Number(ref), role, name: nameOf(el)};
+        const states = [];
+        if (el.disabled || el.getAttribute('aria-disabled') === 'true') states.push('disabled');
+        if (el.checked || el.getAttribute('aria-checked') === 'true') states.push('checked');
+        const expanded = el.getAttribute('aria-expanded');
+        if (expanded) states.push(expanded === 'true' ? 'expanded' : 'collapsed');
+        if (el.getAttribute('aria-selected') === 'true') states.push('selected');
+        if (states.length) item.states = states;
+        if (VALUE_ROLES.has(role)) {
+            let value = el.tagName === 'SELECT'
+                ? (el.selectedOptions.length ? el.selectedOptions[0].textContent : '')
+                : (el.isContentEditable ? el.innerText : el.value);
+            if (value && el.type === 'password') value = '••••';
+            if (value) item.value = clip(value, 40);
+        }
+        items.push(item);
+    }
+    return {url: location.href, title: document.title, items, total};
+}
+"""
+
+
+def ref_selector(ref: int) -> str:
+    """CSS selector for the element numbered ref in a snapshot."""
+    return f'[{REF_ATTRIBUTE}="{int(ref)}"]'
+
+
+def take(page, max_elements: int = 150) -> Dict[str, Any]:
+    """Snapshot of a sync Playwright page: {'url', 'title', 'items', 'total'}."""
+    return page.evaluate(SNAPSHOT_JS, max_elements)
+
+
+def format_item(item: Dict[str, Any]) -> str:
+    line = f'[{item["ref"]}] {item["role"]} "{item["name"]}"'
+    if "value" in item:
+        line += f' = "{item["value"]}"'
+    if item.get("states"):
+        line += " " + " ".join(item["states"])
+    return line
+
+
+def diff_lines(previous: Dict[int, str], current: Dict[int, str]) -> List[str]:
+    """'+' added, '~' changed and '-' removed elements between two snapshots."""
+    lines = []
+    for ref, line in current.items():
+        if ref not in previous:
+            lines.append(f"+ {line}")
+        elif previous[ref] != line:
+            lines.append(f"~ {line}")
+    lines.extend(f"- [{ref}] removed" for ref in previous if ref not in current)
+    return lines
+
+
+class SnapshotTracker:
+    """Formats snapshots, sending only the changes when the page is the same document."""
+
+    def __init__(self):
+        self._key: Optional[Tuple[Any, str]] = None
+        self._lines: Dict[int, str] = {}
+
+    def reset(self):
+        self._key = None
+        self._lines = {}
+
+    def render(self, snapshot: Dict[str, Any], full: bool = False, source: Any = None) -> Tuple[str, bool]:
+        """
+        Returns (text, is_full) for a snapshot from take(). A diff is only produced
+        against the previous snapshot of the same source (e.g. tab) and URL.
+        """
+        key = (source, urldefrag(snapshot["url"])[0])
+        current = {item["ref"]: format_item(item) for item in snapshot["items"]}
+        header = f'Page: {snapshot["title"]} ({snapshot["url"]})'
+        hidden = snapshot["total"] - len(snapshot["items"])
+
+        changes = None if (full or key != self._key) else diff_lines(self._lines, current)
+        self._key, self._lines = key, current
+
+        if changes is not None and len(changes) < len(current):
+            if not changes:
+                return f"{header}\nNo changes since the last snapshot ({len(current)} elements).", False
+            return f"{header}\nChanges since the last snapshot:\n" + "\n".join(changes), False
+
+        text = f"{header}\n" + ("\n".join(current.values()) or "No interactive elements found.")
+        if hidden > 0:
+            text += f"\n...[{hidden} more elements not shown]..."
+        return text, True
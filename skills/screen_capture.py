@@ -0,0 +1,273 @@
+"""
+Screen capture engine shared by the desktop and system tools.
+
+The most recent full-screen frame is kept as an RGB NumPy array. Pixel and region
+reads are served from it while it is younger than max_age, so a burst of reads
+(pixel colours, region captures, template searches) costs one grab. Input actions
+invalidate the buffer, since the screen is about to change.
+
+Frames can be compared tile by tile to find the regions that changed, and encoded
+as PNG (fast compression), JPEG, WebP or raw bytes for internal use; save()
+hands other file types to PIL.
+
+Grabs come from a FrameSource: mss when installed (fastest), otherwise
+PIL.ImageGrab, or SyntheticSource to drive the engine from prepared frames.
+"""
+import io
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+
+from skills.lazy_import import LazyModule
+
+np = LazyModule("numpy")
+
+Region = Tuple[int, int, int, int]  # x, y, width, height
+
+# Encodings by file extension
+FORMATS = {".png": "png", ".jpg": "jpeg", ".jpeg": "jpeg", ".webp": "webp", ".raw": "raw"}
+
+
+class FrameSource:
+    """Produces full-screen frames as HxWx3 uint8 RGB arrays."""
+
+    def grab(self) -> "np.ndarray":
+        raise NotImplementedError
+
+
+class MSSSource(FrameSource):
+    """Primary monitor via mss (DXGI/BitBlt without a PIL round-trip)."""
+
+    def __init__(self):
+        import mss
+        self._mss = mss
+        self._local = threading.local()
+
+    def grab(self) -> "np.ndarray":
+        # mss handles are tied to the thread that created them
+        sct = getattr(self._local, "sct", None)
+        if sct is None:
+            sct = self._local.sct = self._mss.mss()
+        shot = sct.grab(sct.monitors[1])
+        # BGRA -> RGB
+        return np.ascontiguousarray(np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)[:, :, 2::-1])
+
+
+class PILSource(FrameSource):
+    """Primary monitor via PIL.ImageGrab."""
+
+    def grab(self) -> "np.ndarray":
+        from PIL import ImageGrab
+        return np.asarray(ImageGrab.grab().convert("RGB"))
+
+
+class SyntheticSource(FrameSource):
+    """
+    Frames from prepared arrays (repeating the last one when exhausted) or from a
+    callable, for tests and benchmarks. grab_delay simulates the cost of a grab.
+    """
+
+    def __init__(self, frames: Union[Callable[[], "np.ndarray"], Iterable["np.ndarray"]], grab_delay: float = 0.0):
+        self._next = frames if callable(frames) else self._replay(list(frames))
+        self.grab_delay = grab_delay
+        self.grabs = 0
+
+    @staticmethod
+    def _replay(frames: List["np.ndarray"]) -> Callable[[], "np.ndarray"]:
+        queue = deque(frames)
+
+        def next_frame():
+            return queue.popleft() if len(queue) > 1 else queue[0]
+        return next_frame
+
+    def grab(self) -> "np.ndarray":
+        if self.grab_delay:
+            time.sleep(self.grab_delay)
+        self.grabs += 1
+        return np.array(self._next(), dtype=np.uint8)
+
+
+def default_source() -> FrameSource:
+    try:
+        return MSSSource()
+    except ImportError:
+        return PILSource()
+
+
+def dirty_regions(previous: "np.ndarray", current: "np.ndarray", tile: int = 32,
+                  threshold: int = 0) -> List[Region]:
+    """
+    Bounding boxes (x, y, width, height) of the areas that differ between two frames.
+    Frames are compared in tile x tile blocks; changed blocks that touch (including
+    diagonally) are merged into one box. threshold ignores per-channel differences up
+    to that value (e.g. compression noise).
+    """
+    if previous.shape != current.shape:
+        height, width = current.shape[:2]
+        return [(0, 0, width, height)]
+    height, width = current.shape[:2]
+    rows, cols = -(-height // tile), -(-width // tile)
+    # Compare as (height, width * channels): per-channel reductions over a 3-wide
+    # last axis are far slower than comparing the flat rows
+    before, after = previous.reshape(height, -1), current.reshape(height, -1)
+    if threshold:
+        changed = np.abs(before.astype(np.int16) - after.astype(np.int16)) > threshold
+    else:
+        changed = before != after
+    # Reduce to one flag per tile: first bands of `tile` rows, then `tile` columns
+    if rows * tile != height:
+        changed = np.pad(changed, ((0, rows * tile - height), (0, 0)))
+    bands = changed.reshape(rows, tile, -1).max(axis=1)
+    channels = bands.shape[1] // width
+    if cols * tile != width:
+        bands = np.pad(bands, ((0, 0), (0, (cols * tile - width) * channels)))
+    grid = bands.reshape(rows, cols, tile * channels).max(axis=2)
+
+    regions = []
+    seen = np.zeros_like(grid)
+    for r, c in zip(*np.nonzero(grid)):
+        if seen[r, c]:
+            continue
+        # Flood fill over neighbouring dirty tiles
+        seen[r, c] = True
+        stack, top, left, bottom, right = [(r, c)], r, c, r, c
+        while stack:
+            y, x = stack.pop()
+            top, left, bottom, right = min(top, y), min(left, x), max(bottom, y), max(right, x)
+            for ny in range(max(0, y - 1), min(rows, y + 2)):
+                for nx in range(max(0, x - 1), min(cols, x + 2)):
+                    if grid[ny, nx] and not seen[ny, nx]:
+                        seen[ny, nx] = True
+                        stack.append((ny, nx))
+        x0, y0 = int(left) * tile, int(top) * tile
+        regions.append((x0, y0, min(width, (int(right) + 1) * tile) - x0, min(height, (int(bottom) + 1) * tile) - y0))
+    return regions
+
+
+def encode(image: "np.ndarray", fmt: str = "png", quality: int = 80) -> bytes:
+    """Encodes an RGB array as png (fast compression), jpeg, webp or raw bytes."""
+    fmt = fmt.lower()
+    if fmt == "raw":
+        return np.ascontiguousarray(image).tobytes()
+    from PIL import Image
+    buffer = io.BytesIO()
+    picture = Image.fromarray(image)
+    if fmt == "png":
+        # Level 1 encodes faster than PIL's default (6) for a slightly larger file
+        picture.save(buffer, "PNG", compress_level=1)
+    elif fmt in ("jpeg", "jpg"):
+        picture.save(buffer, "JPEG", quality=quality)
+    elif fmt == "webp":
+        picture.save(buffer, "WEBP", quality=quality, method=0)
+    else:
+        raise ValueError(f"unknown image format '{fmt}' (expected png, jpeg, webp or raw)")
+    return buffer.getvalue()
+
+
+class ScreenCapture:
+    """
+    Frame buffer over a FrameSource. Reads less than max_age seconds after the last
+    grab reuse it; pass max_age=0 to force a new grab.
+    """
+
+    def __init__(self, source: Optional[FrameSource] = None, max_age: Optional[float] = None, tile: int = 32):
+        self._source = source
+        self.max_age = max_age if max_age is not None else float(os.getenv("VIORA_CAPTURE_MAX_AGE", "0.2"))
+        self.tile = tile
+        self._frame: Optional["np.ndarray"] = None
+        self._grabbed_at = 0.0
+        self._lock = threading.Lock()
+        self.grabs = 0
+        self.hits = 0
+
+    @property
+    def source(self) -> FrameSource:
+        if self._source is None:
+            self._source = default_source()
+        return self._source
+
+    def _grab(self) -> "np.ndarray":
+        frame = self.source.grab()
+        frame.flags.writeable = False  # readers get views into the shared buffer
+        self._frame, self._grabbed_at = frame, time.monotonic()
+        self.grabs += 1
+        return frame
+
+    def frame(self, max_age: Optional[float] = None) -> "np.ndarray":
+        """The full screen as a read-only HxWx3 RGB array, younger than max_age (0 = always grab)."""
+        max_age = self.max_age if max_age is None else max_age
+        with self._lock:
+            # Strict comparison and an explicit 0 check: on a coarse clock (~15.6 ms on
+            # Windows before Python 3.13) two reads can share a tick, so "age <= 0" would
+            # reuse the buffer when a fresh grab was asked for
+            if self._frame is not None and max_age > 0 and time.monotonic() - self._grabbed_at < max_age:
+                self.hits += 1
+                return self._frame
+            return self._grab()
+
+    def invalidate(self):
+        """Marks the buffer stale (e.g. after input that changes the screen)."""
+        with self._lock:
+            self._grabbed_at = float("-inf")
+
+    def size(self) -> Tuple[int, int]:
+        height, width = self.frame().shape[:2]
+        return width, height
+
+    def region(self, x: int, y: int, width: int, height: int, max_age: Optional[float] = None) -> "np.ndarray":
+        """Region of the screen as an array view; raises ValueError if it is off-screen."""
+        frame = self.frame(max_age)
+        screen_h, screen_w = frame.shape[:2]
+        if width <= 0 or height <= 0 or x < 0 or y < 0 or x + width > screen_w or y + height > screen_h:
+            raise ValueError(f"region ({x}, {y}, {width}x{height}) is outside the {screen_w}x{screen_h} screen")
+        return frame[y:y + height, x:x + width]
+
+    def pixel(self, x: int, y: int, max_age: Optional[float] = None) -> Tuple[int, int, int]:
+        r, g, b = self.region(x, y, 1, 1, max_age)[0, 0]
+        return int(r), int(g), int(b)
+
+    def changes(self, threshold: int = 0) -> List[Region]:
+        """Grabs a new frame and returns the regions that changed since the buffered one."""
+        with self._lock:
+            previous = self._frame
+            current = self._grab()
+        if previous is None:
+            return []
+        return dirty_regions(previous, current, self.tile, threshold)
+
+    def save(self, path: str, region: Optional[Region] = None, quality: int = 80,
+             max_age: Optional[float] = None) -> int:
+        """
+        Writes the screen (or a region) to path, encoded by its extension; returns bytes
+        written. FORMATS use the fast encoders; any other extension PIL knows (.bmp, .gif,
+        .tiff, ...) is saved by PIL, and a path without an extension is written as PNG.
+        """
+        ext = os.path.splitext(path)[1].lower()
+        image = self.region(*region, max_age=max_age) if region else self.frame(max_age)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fmt = FORMATS.get(ext)
+        if fmt is None:
+            from PIL import Image
+            Image.fromarray(image).save(path, format=None if ext else "PNG")
+            return os.path.getsize(path)
+        data = encode(image, fmt, quality)
+        with open(path, "wb") as f:
+            f.write(data)
+        return len(data)
+
+
+_capture: Optional[ScreenCapture] = None
+_capture_lock = threading.Lock()
+
+
+def get_screen_capture() -> ScreenCapture:
+    """Process-wide ScreenCapture, so every tool shares one frame buffer."""
+    global _capture
+    with _capture_lock:
+        if _capture is None:
+            _capture = ScreenCapture()
+        return _capture
@@ -0,0 +1,221 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+def date_bounds(start_date: Optional[str] = None, end_date: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+    """Turns inclusive YYYY-MM-DD dates into [start, end) timestamp bounds for Store.between()."""
+    start = date.fromisoformat(start_date).isoformat() if start_date else None
+    end = (date.fromisoformat(end_date) + timedelta(days=1)).isoformat() if end_date else None
+    return start, end
+
+
+class Store:
+    """
+    Append-oriented document store on SQLite in WAL mode.
+    Each collection is a table of JSON documents; appends are single-row inserts, so a
+    write costs O(1) instead of re-serializing the whole history. Every write is its own
+    transaction, so a crash can lose at most the write in flight, never corrupt the file.
+    The WAL is checkpointed (compacted back into the main file) every `checkpoint_every`
+    writes and on close.
+
+    `indexes` maps a collection to document fields that get an expression index for
+    find(); every collection is also indexed by timestamp for between(). `text_fields`
+    maps a collection to the fields mirrored into an FTS5 table for search().
+    """
+
+    def __init__(self, path: str, collections: Iterable[str], legacy_json: Optional[str] = None,
+                 checkpoint_every: int = 1000, indexes: Optional[Dict[str, List[str]]] = None,
+                 text_fields: Optional[Dict[str, List[str]]] = None):
+        self.path = path
+        self.collections = list(collections)
+        self.indexes = indexes or {}
+        self.text_fields = text_fields or {}
+        self.checkpoint_every = checkpoint_every
+        self._writes = 0
+        self._lock = threading.RLock()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            for name in self.collections:
+                self.conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {name} ("
+                    "id INTEGER PRIMARY KEY, timestamp TEXT, data TEXT NOT NULL)"
+                )
+                self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{name}_timestamp ON {name}(timestamp)")
+                for field in self.indexes.get(name, []):
+                    self.conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_{name}_{field} ON {name}(json_extract(data, '$.{field}'))"
+                    )
+                if name in self.text_fields:
+                    self._create_fts(name, self.text_fields[name])
+        if legacy_json:
+            self._migrate(legacy_json)
+
+    def _migrate(self, legacy_json: str):
+        """Imports a legacy JSON document ({collection: [items]}) once; the file is left as a backup."""
+        if not os.path.exists(legacy_json) or self.get_meta("migrated_from") == legacy_json:
+            return
+        try:
+            with open(legacy_json, 'r') as f:
+                legacy = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self._lock, self.conn:
+            for name in self.collections:
+                self.conn.executemany(
+                    f"INSERT INTO {name} (timestamp, data) VALUES (?, ?)",
+                    [(self._timestamp(item), json.dumps(item)) for item in legacy.get(name, [])]
+                )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from', ?)", (legacy_json,)
+            )
+
+    def _create_fts(self, name: str, fields: List[str]):
+        """Creates the FTS5 mirror of a collection, kept in sync by triggers."""
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (f"{name}_fts",)
+        ).fetchone()
+        body = " || ' ' || ".join(f"coalesce(json_extract({{row}}.data, '$.{f}'), '')" for f in fields)
+        self.conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {name}_fts USING fts5(body)")
+        self.conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {name}_fts_insert AFTER INSERT ON {name} BEGIN "
+            f"INSERT INTO {name}_fts (rowid, body) VALUES (new.id, {body.format(row='new')}); END"
+        )
+        self.conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {name}_fts_update AFTER UPDATE ON {name} BEGIN "
+            f"UPDATE {name}_fts SET body = {body.format(row='new')} WHERE rowid = old.id; END"
+        )
+        self.conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {name}_fts_delete AFTER DELETE ON {name} BEGIN "
+            f"DELETE FROM {name}_fts WHERE rowid = old.id; END"
+        )
+        if not exists:
+            # Backfill rows written before full-text search was enabled
+            self.conn.execute(
+                f"INSERT INTO {name}_fts (rowid, body) SELECT id, {body.format(row=name)} FROM {name}"
+            )
+
+    @staticmethod
+    def _timestamp(item: Dict) -> Optional[str]:
+        return item.get("timestamp") or item.get("created_at")
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def append(self, collection: str, item: Dict) -> int:
+        """Appends a document and returns its id."""
+        with self._lock:
+            with self.conn:
+                cursor = self.conn.execute(
+                    f"INSERT INTO {collection} (timestamp, data) VALUES (?, ?)",
+                    (self._timestamp(item), json.dumps(item))
+                )
+            self._after_write()
+            return cursor.lastrowid
+
+    def update(self, collection: str, item_id: int, item: Dict):
+        """Replaces the document stored under item_id."""
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    f"UPDATE {collection} SET timestamp = ?, data = ? WHERE id = ?",
+                    (self._timestamp(item), json.dumps(item), item_id)
+                )
+            self._after_write()
+
+    def all(self, collection: str) -> List[Dict]:
+        """Returns every document in insertion order."""
+        return [item for _, item in self.rows(collection)]
+
+    def rows(self, collection: str) -> List[Tuple[int, Dict]]:
+        """Returns (id, document) pairs in insertion order."""
+        with self._lock:
+            cursor = self.conn.execute(f"SELECT id, data FROM {collection} ORDER BY id")
+            return [(row_id, json.loads(data)) for row_id, data in cursor]
+
+    def find(self, collection: str, where: Dict[str, Any], limit: Optional[int] = None) -> List[Dict]:
+        """Returns documents whose fields equal the given values (uses the field indexes)."""
+        clauses = " AND ".join(f"json_extract(data, '$.{field}') = ?" for field in where)
+        # JSON booleans come back from json_extract as 0/1
+        params = [int(v) if isinstance(v, bool) else v for v in where.values()]
+        sql = f"SELECT data FROM {collection} WHERE {clauses} ORDER BY id"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            return [json.loads(data) for (data,) in self.conn.execute(sql, params)]
+
+    def between(self, collection: str, start: Optional[str] = None, end: Optional[str] = None,
+                limit: Optional[int] = None) -> List[Dict]:
+        """Returns documents with start <= timestamp < end (ISO-8601 strings), oldest first."""
+        clauses, params = [], []
+        if start:
+            clauses.append("timestamp >= ?")
+            params.append(start)
+        if end:
+            clauses.append("timestamp < ?")
+            params.append(end)
+        sql = f"SELECT data FROM {collection}"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        with self._lock:
+            return [json.loads(data) for (data,) in self.conn.execute(sql, params)]
+
+    def search(self, collection: str, query: str, limit: int = 10) -> List[Dict]:
+        """Full-text search over a collection's text fields, best matches first."""
+        # Quote every term so user input is never parsed as FTS5 query syntax
+        terms = [t.replace('"', '""') for t in query.split()]
+        if not terms:
+            return []
+        match = " ".join(f'"{t}"' for t in terms)
+        sql = (
+            f"SELECT {collection}.data FROM {collection}_fts "
+            f"JOIN {collection} ON {collection}.id = {collection}_fts.rowid "
+            f"WHERE {collection}_fts MATCH ? ORDER BY bm25({collection}_fts) LIMIT ?"
+        )
+        with self._lock:
+            return [json.loads(data) for (data,) in self.conn.execute(sql, (match, limit))]
+
+    def get(self, collection: str, item_id: int) -> Optional[Dict]:
+        """Returns the document stored under item_id, or None."""
+        with self._lock:
+            row = self.conn.execute(f"SELECT data FROM {collection} WHERE id = ?", (item_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def execute(self, sql: str, params: Iterable = (), many: bool = False) -> List[tuple]:
+        """Runs raw SQL in its own transaction, for side tables kept next to the collections."""
+        with self._lock:
+            with self.conn:
+                cursor = self.conn.executemany(sql, params) if many else self.conn.execute(sql, params)
+                return cursor.fetchall()
+
+    def count(self, collection: str) -> int:
+        with self._lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM {collection}").fetchone()[0]
+
+    def _after_write(self):
+        self._writes += 1
+        if self._writes % self.checkpoint_every == 0:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Folds the write-ahead log back into the database file and truncates it."""
+        with self._lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        with self._lock:
+            self.checkpoint()
+            self.conn.close()
@@ -3,14 +3,13 @@ import datetime
 import os
 import subprocess
 import difflib
-import psutil
-import pyperclip
-from PIL import ImageGrab
-from ctypes import cast, POINTER
-from comtypes import CLSCTX_ALL
-from pycaw.pycaw import AudioUtilities, IAudioEndpointVolume
 import ctypes
 import math
+from skills.lazy_import import LazyModule
+
+# Heavy backends are imported on first use
+psutil = LazyModule("psutil")
+pyperclip = LazyModule("pyperclip")
 
 class SystemTools:
     # Common Windows App Aliases
@@ -132,16 +131,12 @@ class SystemTools:
             return f"Error getting system status: {str(e)}"
 
     @staticmethod
-    def take_screenshot(filename: str = "screenshot.png"):
-        """Takes a screenshot and saves it to the specified filename."""
+    def take_screenshot(filename: str = "screenshot.png", quality: int = 80):
+        """Takes a screenshot and saves it to the specified filename; the format follows the extension."""
         try:
-            # Ensure screenshots directory exists if path has one
-            directory = os.path.dirname(filename)
-            if directory and not os.path.exists(directory):
-                os.makedirs(directory)
-                
-            screenshot = ImageGrab.grab()
-            screenshot.save(filename)
+            from skills.screen_capture import get_screen_capture
+            # A fresh grab, encoded by extension; JPEG/WebP use `quality`
+            get_screen_capture().save(filename, quality=quality, max_age=0)
             return f"Screenshot saved to '{filename}'."
         except Exception as e:
             return f"Error taking screenshot: {str(e)}"
@@ -165,6 +160,7 @@ class SystemTools:
 
     @staticmethod
     def _get_volume_interface():
+        from pycaw.pycaw import AudioUtilities
         devices = AudioUtilities.GetSpeakers()
         return devices.EndpointVolume
 
@@ -0,0 +1,29 @@
+"""
+How tool outputs report failure.
+
+Tools return a message instead of raising, so failure has to be read from the
+output. Every tool fails with an output starting with one of FAILURE_PREFIXES;
+tools that can also come back empty-handed ("Image not found on screen: ...") are
+registered with their own predicate built by failed_with().
+"""
+from typing import Any, Callable
+
+FAILURE_PREFIXES = ("Error", "Tool ", "Failed", "Timed out", "Could not")
+
+FailurePredicate = Callable[[str], bool]
+
+
+def failed_with(*prefixes: str, contains: tuple = ()) -> FailurePredicate:
+    """Predicate for outputs that start with a generic or given prefix, or contain any of `contains`."""
+    starts = FAILURE_PREFIXES + prefixes
+
+    def failed(output: str) -> bool:
+        return output.lstrip().startswith(starts) or any(marker in output for marker in contains)
+    return failed
+
+
+_generic = failed_with()
+
+
+def is_failure(output: Any, predicate: FailurePredicate = None) -> bool:
+    return (predicate or _generic)(str(output))
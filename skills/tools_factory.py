@@ -1,97 +1,153 @@
+import threading
+from typing import Optional
 from langchain_core.tools import StructuredTool
 from skills.web_search import WebSearch
 from skills.organizer import Organizer
 from skills.system_tools import SystemTools
 from skills.web_tools import WebTools
 from skills.browser_tools import BrowserTools
+from skills.browser_parallel import get_parallel_browser
 from skills.desktop_tools import DesktopTools
+from skills.tool_results import FailurePredicate, failed_with, is_failure
+from agent.memory import Memory
 
-def get_viora_tools(category: str = "ALL"):
+# Concurrency classes declared per tool. PARALLEL tools may run on worker threads
+# alongside each other; SERIAL tools share state (the Playwright page, mouse/keyboard,
+# data files, audio device, clipboard) and run one at a time in call order.
+PARALLEL = "parallel"
+SERIAL = "serial"
+
+def _tool(name: str, func, description: str, concurrency: str = PARALLEL,
+          failed: Optional[FailurePredicate] = None) -> StructuredTool:
+    # failed: how this tool reports a miss, for tools whose negative results don't
+    # start with a generic failure prefix (see skills/tool_results.py)
+    return StructuredTool.from_function(
+        name=name, func=func, description=description,
+        metadata={"concurrency": concurrency, "failed": failed},
+    )
+
+def get_tool_concurrency(tool) -> str:
+    """Returns the concurrency class a tool was registered with (SERIAL if undeclared)."""
+    return (tool.metadata or {}).get("concurrency", SERIAL)
+
+def is_tool_failure(tool, output) -> bool:
+    """Whether a tool's output means the call did not do its job (tool may be None if unknown)."""
+    return is_failure(output, (tool.metadata or {}).get("failed") if tool is not None else None)
+
+# Negative results of tools that can come back empty-handed
+WINDOW_MISS = DesktopTools.window_missed
+IMAGE_MISS = failed_with(contains=("Image not found on screen",))
+
+# Process-wide tool registry: category -> list of tools, built once on first use.
+_tool_registry = None
+_registry_lock = threading.Lock()
+
+def _build_tool_groups():
+    """Instantiates the skill backends and wraps them as LangChain tools."""
     search = WebSearch()
     org = Organizer()
+    memory = Memory()
     sys = SystemTools()
     web = WebTools()
     browser = BrowserTools()
+    parallel = get_parallel_browser()
     desktop = DesktopTools()
 
     # Define tool groups
     search_tools = [
-        StructuredTool.from_function(name="web_search", func=search.run, description="Search the web.")
+        _tool(name="web_search", func=search.run, description="Search the web.", failed=failed_with("No results found")),
+        _tool(name="multi_search", func=search.multi_search, description="Run several web searches at once (list of queries); duplicate results are merged.")
     ]
 
     todo_tools = [
-        StructuredTool.from_function(name="add_todo", func=org.add_todo, description="Add a todo task."),
-        StructuredTool.from_function(name="list_todos", func=org.list_todos, description="List all todos.")
+        _tool(name="add_todo", func=org.add_todo, description="Add a todo task.", concurrency=SERIAL),
+        _tool(name="list_todos", func=org.list_todos, description="List all todos.", concurrency=SERIAL),
+        _tool(name="search_organizer", func=org.search, description="Full-text search todos and journal entries."),
+        _tool(name="organizer_by_date", func=org.entries_between, description="List 'todos' or 'journal' entries between dates (YYYY-MM-DD).", failed=failed_with("Invalid kind")),
+        _tool(name="search_memory", func=memory.search, description="Full-text search saved notes and past conversations."),
+        _tool(name="memory_by_date", func=memory.entries_between, description="List 'notes' or 'logs' (past conversations) between dates (YYYY-MM-DD).", failed=failed_with("Invalid kind"))
     ]
 
     system_tools = [
-        StructuredTool.from_function(name="get_time", func=sys.get_time, description="Get current date/time."),
-        StructuredTool.from_function(name="get_os_info", func=sys.get_os_info, description="Get OS details."),
-        StructuredTool.from_function(name="open_app", func=sys.open_application, description="Open a Windows app (edge, chrome, notepad, calc, etc)."),
-        StructuredTool.from_function(name="list_files", func=sys.list_files, description="List files in a directory."),
-        StructuredTool.from_function(name="read_file", func=sys.read_file, description="Read a text file."),
-        StructuredTool.from_function(name="write_file", func=sys.write_file, description="Write text to a file (mode='w' or 'a')."),
-        StructuredTool.from_function(name="get_system_status", func=sys.get_system_status, description="Get CPU, RAM, and Battery status."),
-        StructuredTool.from_function(name="take_screenshot", func=sys.take_screenshot, description="Take and save a screenshot."),
-        StructuredTool.from_function(name="get_clipboard", func=sys.get_clipboard_content, description="Get clipboard text."),
-        StructuredTool.from_function(name="set_clipboard", func=sys.set_clipboard_content, description="Set clipboard text."),
-        StructuredTool.from_function(name="set_volume", func=sys.set_volume, description="Set volume (0-100)."),
-        StructuredTool.from_function(name="mute_volume", func=sys.mute_volume, description="Mute volume."),
-        StructuredTool.from_function(name="unmute_volume", func=sys.unmute_volume, description="Unmute volume."),
-        StructuredTool.from_function(name="media_control", func=sys.media_control, description="Media: play_pause, next, prev, stop, vol_up, vol_down, mute.")
+        _tool(name="get_time", func=sys.get_time, description="Get current date/time."),
+        _tool(name="get_os_info", func=sys.get_os_info, description="Get OS details."),
+        _tool(name="open_app", func=sys.open_application, description="Open a Windows app (edge, chrome, notepad, calc, etc).", concurrency=SERIAL),
+        _tool(name="list_files", func=sys.list_files, description="List files in a directory."),
+        _tool(name="read_file", func=sys.read_file, description="Read a text file."),
+        _tool(name="write_file", func=sys.write_file, description="Write text to a file (mode='w' or 'a').", concurrency=SERIAL),
+        _tool(name="get_system_status", func=sys.get_system_status, description="Get CPU, RAM, and Battery status."),
+        _tool(name="take_screenshot", func=sys.take_screenshot, description="Take and save a screenshot (format from the filename extension, PNG if none; quality for jpg/webp).", concurrency=SERIAL),
+        _tool(name="get_clipboard", func=sys.get_clipboard_content, description="Get clipboard text.", concurrency=SERIAL),
+        _tool(name="set_clipboard", func=sys.set_clipboard_content, description="Set clipboard text.", concurrency=SERIAL),
+        _tool(name="set_volume", func=sys.set_volume, description="Set volume (0-100).", concurrency=SERIAL),
+        _tool(name="mute_volume", func=sys.mute_volume, description="Mute volume.", concurrency=SERIAL),
+        _tool(name="unmute_volume", func=sys.unmute_volume, description="Unmute volume.", concurrency=SERIAL),
+        _tool(name="media_control", func=sys.media_control, description="Media: play_pause, next, prev, stop, vol_up, vol_down, mute.", concurrency=SERIAL, failed=failed_with("Invalid media action"))
     ]
 
     browser_tools = [
-        StructuredTool.from_function(name="read_web_page", func=web.read_url, description="Fetch/read web page text."),
-        StructuredTool.from_function(name="browser_navigate", func=browser.navigate_to, description="Navigate to a URL."),
-        StructuredTool.from_function(name="browser_click", func=browser.click_element, description="Click an element (CSS selector)."),
-        StructuredTool.from_function(name="browser_type", func=browser.type_text, description="Type text into an element (CSS selector)."),
-        StructuredTool.from_function(name="browser_get_text", func=browser.get_text, description="Get element text (CSS selector)."),
-        StructuredTool.from_function(name="browser_screenshot", func=browser.take_screenshot, description="Take browser screenshot."),
-        StructuredTool.from_function(name="browser_extract_links", func=browser.extract_links, description="Extract all links from page."),
-        StructuredTool.from_function(name="browser_get_url", func=browser.get_current_url, description="Get current URL."),
-        StructuredTool.from_function(name="browser_go_back", func=browser.go_back, description="Navigate back."),
-        StructuredTool.from_function(name="browser_reload", func=browser.reload_page, description="Reload current page."),
-        StructuredTool.from_function(name="browser_close", func=browser.close_browser, description="Close browser."),
-        StructuredTool.from_function(name="browser_submit_form", func=browser.submit_form, description="Submit form (selector)."),
-        StructuredTool.from_function(name="browser_select_dropdown", func=browser.select_dropdown, description="Select dropdown option."),
-        StructuredTool.from_function(name="browser_check_checkbox", func=browser.check_checkbox, description="Check/uncheck checkbox."),
-        StructuredTool.from_function(name="browser_upload_file", func=browser.upload_file, description="Upload file (selector, path)."),
-        StructuredTool.from_function(name="browser_scroll_to", func=browser.scroll_to, description="Scroll to (x, y)."),
-        StructuredTool.from_function(name="browser_scroll_to_element", func=browser.scroll_to_element, description="Scroll element into view."),
-        StructuredTool.from_function(name="browser_hover", func=browser.hover_element, description="Hover over element."),
-        StructuredTool.from_function(name="browser_right_click", func=browser.right_click, description="Right-click on element."),
-        StructuredTool.from_function(name="browser_new_tab", func=browser.new_tab, description="Open new tab."),
-        StructuredTool.from_function(name="browser_switch_tab", func=browser.switch_tab, description="Switch tab by index."),
-        StructuredTool.from_function(name="browser_close_tab", func=browser.close_tab, description="Close current tab."),
-        StructuredTool.from_function(name="browser_list_tabs", func=browser.list_tabs, description="List all tabs."),
-        StructuredTool.from_function(name="browser_extract_table", func=browser.extract_table, description="Extract table data."),
-        StructuredTool.from_function(name="browser_get_all_text", func=browser.get_all_text, description="Get all page text."),
-        StructuredTool.from_function(name="browser_count_elements", func=browser.count_elements, description="Count matching elements.")
+        _tool(name="read_web_page", func=web.read_url, description="Fetch/read web page text."),
+        _tool(name="read_web_pages", func=web.read_urls, description="Fetch/read several web pages at once (list of URLs)."),
+        _tool(name="browser_navigate", func=browser.navigate_to, description="Navigate to a URL (optional wait_until: commit, domcontentloaded, load, networkidle).", concurrency=SERIAL),
+        _tool(name="browser_navigation_stats", func=browser.get_navigation_stats, description="Show load time and bytes transferred for recent navigations.", concurrency=SERIAL),
+        _tool(name="browser_parallel_extract", func=parallel.parallel_extract, description="Load several URLs at once in background tabs and extract data from each (optional spec: list of browser_extract_data specs); returns JSON."),
+        _tool(name="browser_snapshot", func=browser.snapshot, description="List interactive elements as numbered refs; later calls return only changes (full=True for everything).", concurrency=SERIAL),
+        _tool(name="browser_click_ref", func=browser.click_ref, description="Click an element by snapshot ref number.", concurrency=SERIAL),
+        _tool(name="browser_type_ref", func=browser.type_ref, description="Type text into an element (or choose a dropdown option) by snapshot ref number; submit=True presses Enter.", concurrency=SERIAL),
+        _tool(name="browser_click", func=browser.click_element, description="Click an element (CSS selector).", concurrency=SERIAL),
+        _tool(name="browser_type", func=browser.type_text, description="Type text into an element (CSS selector).", concurrency=SERIAL),
+        _tool(name="browser_get_text", func=browser.get_text, description="Get element text (CSS selector).", concurrency=SERIAL),
+        _tool(name="browser_screenshot", func=browser.take_screenshot, description="Take browser screenshot.", concurrency=SERIAL),
+        _tool(name="browser_extract_links", func=browser.extract_links, description="Extract all links from page.", concurrency=SERIAL),
+        _tool(name="browser_get_url", func=browser.get_current_url, description="Get current URL.", concurrency=SERIAL),
+        _tool(name="browser_go_back", func=browser.go_back, description="Navigate back.", concurrency=SERIAL),
+        _tool(name="browser_reload", func=browser.reload_page, description="Reload current page.", concurrency=SERIAL),
+        _tool(name="browser_close", func=browser.close_browser, description="Close browser.", concurrency=SERIAL),
+        _tool(name="browser_submit_form", func=browser.submit_form, description="Submit form (selector).", concurrency=SERIAL),
+        _tool(name="browser_select_dropdown", func=browser.select_dropdown, description="Select dropdown option.", concurrency=SERIAL),
+        _tool(name="browser_check_checkbox", func=browser.check_checkbox, description="Check/uncheck checkbox.", concurrency=SERIAL),
+        _tool(name="browser_upload_file", func=browser.upload_file, description="Upload file (selector, path).", concurrency=SERIAL),
+        _tool(name="browser_scroll_to", func=browser.scroll_to, description="Scroll to (x, y).", concurrency=SERIAL),
+        _tool(name="browser_scroll_to_element", func=browser.scroll_to_element, description="Scroll element into view.", concurrency=SERIAL),
+        _tool(name="browser_hover", func=browser.hover_element, description="Hover over element.", concurrency=SERIAL),
+        _tool(name="browser_right_click", func=browser.right_click, description="Right-click on element.", concurrency=SERIAL),
+        _tool(name="browser_new_tab", func=browser.new_tab, description="Open new tab.", concurrency=SERIAL),
+        _tool(name="browser_switch_tab", func=browser.switch_tab, description="Switch tab by index.", concurrency=SERIAL, failed=failed_with("Invalid tab index")),
+        _tool(name="browser_close_tab", func=browser.close_tab, description="Close current tab.", concurrency=SERIAL, failed=failed_with("Cannot close")),
+        _tool(name="browser_list_tabs", func=browser.list_tabs, description="List all tabs.", concurrency=SERIAL),
+        _tool(name="browser_extract_table", func=browser.extract_table, description="Extract table data.", concurrency=SERIAL, failed=failed_with("No table found")),
+        _tool(name="browser_extract_data", func=browser.extract_data, description="Batch-extract page data in one call. specs: list of {selector, op: text|attr|value|html|count|exists|links|table, attr?, all?, limit?, max_chars?, name?}; returns JSON.", concurrency=SERIAL),
+        _tool(name="browser_get_all_text", func=browser.get_all_text, description="Get all page text.", concurrency=SERIAL),
+        _tool(name="browser_count_elements", func=browser.count_elements, description="Count matching elements.", concurrency=SERIAL)
     ]
 
     desktop_tools = [
-        StructuredTool.from_function(name="desktop_list_windows", func=desktop.list_windows, description="List visible windows."),
-        StructuredTool.from_function(name="desktop_focus_window", func=desktop.focus_window, description="Focus window by title."),
-        StructuredTool.from_function(name="desktop_minimize_window", func=desktop.minimize_window, description="Minimize window."),
-        StructuredTool.from_function(name="desktop_maximize_window", func=desktop.maximize_window, description="Maximize window."),
-        StructuredTool.from_function(name="desktop_move_mouse", func=desktop.move_mouse, description="Move mouse to (x, y)."),
-        StructuredTool.from_function(name="desktop_click_at", func=desktop.click_at, description="Click at (x, y). button: 'left', 'right', 'middle'."),
-        StructuredTool.from_function(name="desktop_get_mouse_pos", func=desktop.get_mouse_position, description="Get mouse (x, y)."),
-        StructuredTool.from_function(name="desktop_press_key", func=desktop.press_key, description="Press a key (enter, esc, a, b, etc)."),
-        StructuredTool.from_function(name="desktop_hotkey", func=desktop.hotkey, description="Press key combo (e.g. 'ctrl', 'c')."),
-        StructuredTool.from_function(name="desktop_type_text", func=desktop.type_text, description="Type text via keyboard."),
-        StructuredTool.from_function(name="desktop_get_screen_size", func=desktop.get_screen_size, description="Get screen resolution."),
-        StructuredTool.from_function(name="desktop_get_window_info", func=desktop.get_window_info, description="Get window details (pos, size)."),
-        StructuredTool.from_function(name="desktop_drag_drop", func=desktop.drag_and_drop, description="Drag from (x1, y1) to (x2, y2)."),
-        StructuredTool.from_function(name="desktop_scroll", func=desktop.scroll_mouse, description="Scroll mouse wheel (+up, -down)."),
-        StructuredTool.from_function(name="desktop_right_click", func=desktop.right_click_at, description="Right-click at (x, y)."),
-        StructuredTool.from_function(name="desktop_close_window", func=desktop.close_window, description="Close window by title."),
-        StructuredTool.from_function(name="desktop_resize_window", func=desktop.resize_window, description="Resize window (w, h)."),
-        StructuredTool.from_function(name="desktop_move_window", func=desktop.move_window_to, description="Move window to (x, y)."),
-        StructuredTool.from_function(name="desktop_restore_window", func=desktop.restore_window, description="Restore minimized window."),
-        StructuredTool.from_function(name="desktop_capture_region", func=desktop.capture_region, description="Capture screen region."),
-        StructuredTool.from_function(name="desktop_get_pixel_color", func=desktop.get_pixel_color, description="Get pixel RGB at (x, y).")
+        _tool(name="desktop_list_windows", func=desktop.list_windows, description="List visible windows.", concurrency=SERIAL, failed=failed_with("No windows found")),
+        _tool(name="desktop_focus_window", func=desktop.focus_window, description="Focus window by title (partial, process name or fuzzy match).", concurrency=SERIAL, failed=WINDOW_MISS),
+        _tool(name="desktop_minimize_window", func=desktop.minimize_window, description="Minimize window (exact or partial title).", concurrency=SERIAL, failed=WINDOW_MISS),
+        _tool(name="desktop_maximize_window", func=desktop.maximize_window, description="Maximize window (exact or partial title).", concurrency=SERIAL, failed=WINDOW_MISS),
+        _tool(name="desktop_move_mouse", func=desktop.move_mouse, description="Move mouse to (x, y); human=True for a human-like glide, False for instant; omit to use the global setting.", concurrency=SERIAL),
+        _tool(name="desktop_click_at", func=desktop.click_at, description="Click at (x, y). button: 'left', 'right', 'middle'; human=True glides there first, False clicks instantly; omit to use the global setting.", concurrency=SERIAL),
+        _tool(name="desktop_get_mouse_pos", func=desktop.get_mouse_position, description="Get mouse (x, y).", concurrency=SERIAL),
+        _tool(name="desktop_press_key", func=desktop.press_key, description="Press a key (enter, esc, a, b, etc).", concurrency=SERIAL),
+        _tool(name="desktop_hotkey", func=desktop.hotkey, description="Press key combo (e.g. 'ctrl', 'c').", concurrency=SERIAL),
+        _tool(name="desktop_type_text", func=desktop.type_text, description="Type text via keyboard; human=True for human-like keystroke timing, False for instant; omit to use the global setting.", concurrency=SERIAL),
+        _tool(name="desktop_find_on_screen", func=desktop.find_on_screen, description="Find an image file on screen; returns every match's center and box. Optional region [x, y, w, h], scales (e.g. [0.8, 1, 1.25]), confidence.", concurrency=SERIAL, failed=IMAGE_MISS),
+        _tool(name="desktop_find_images", func=desktop.find_images_on_screen, description="Find several image files on screen in one pass (image_paths list); same options as desktop_find_on_screen.", concurrency=SERIAL, failed=IMAGE_MISS),
+        _tool(name="desktop_get_screen_size", func=desktop.get_screen_size, description="Get screen resolution.", concurrency=SERIAL),
+        _tool(name="desktop_get_window_info", func=desktop.get_window_info, description="Get window details (pos, size).", concurrency=SERIAL, failed=WINDOW_MISS),
+        _tool(name="desktop_drag_drop", func=desktop.drag_and_drop, description="Drag from (x1, y1) to (x2, y2); human=True for human-like movement, False for fast; omit to use the global setting.", concurrency=SERIAL),
+        _tool(name="desktop_scroll", func=desktop.scroll_mouse, description="Scroll mouse wheel (+up, -down).", concurrency=SERIAL),
+        _tool(name="desktop_right_click", func=desktop.right_click_at, description="Right-click at (x, y).", concurrency=SERIAL),
+        _tool(name="desktop_close_window", func=desktop.close_window, description="Close window by exact or partial title; no fuzzy matching.", concurrency=SERIAL, failed=WINDOW_MISS),
+        _tool(name="desktop_resize_window", func=desktop.resize_window, description="Resize window (w, h); exact or partial title.", concurrency=SERIAL, failed=WINDOW_MISS),
+        _tool(name="desktop_move_window", func=desktop.move_window_to, description="Move window to (x, y); exact or partial title.", concurrency=SERIAL, failed=WINDOW_MISS),
+        _tool(name="desktop_restore_window", func=desktop.restore_window, description="Restore minimized window (exact or partial title).", concurrency=SERIAL, failed=WINDOW_MISS),
+        _tool(name="desktop_run_actions", func=desktop.run_actions, description="Run many desktop steps in one call, stopping at the first failure. actions: list of {action, ...fields}; actions: move/click/double_click/right_click {x, y}, drag {x1, y1, x2, y2}, scroll {clicks}, press {key}, hotkey {keys: [...]}, type {text}, focus/minimize/maximize/restore/close {title}, move_window {title, x, y}, resize {title, width, height}, click_button {window_title, button_name}, type_in_field {window_title, field_name, text}, wait {seconds}, wait_for_change {x, y, width, height}.", concurrency=SERIAL, failed=DesktopTools.actions_failed),
+        _tool(name="desktop_wait_for_change", func=desktop.wait_for_screen_change, description="Wait until a screen region (x, y, width, height) changes, up to timeout seconds.", concurrency=SERIAL),
+        _tool(name="desktop_screen_changes", func=desktop.get_screen_changes, description="List screen regions that changed since the last capture (optional wait seconds first).", concurrency=SERIAL),
+        _tool(name="desktop_capture_region", func=desktop.capture_region, description="Capture screen region.", concurrency=SERIAL),
+        _tool(name="desktop_get_pixel_color", func=desktop.get_pixel_color, description="Get pixel RGB at (x, y).", concurrency=SERIAL)
     ]
 
     # Map categories to tool groups
@@ -105,4 +161,19 @@ def get_viora_tools(category: str = "ALL"):
         "ALL": search_tools + todo_tools + system_tools + browser_tools + desktop_tools
     }
 
-    return mapping.get(category, mapping["ALL"])
+    return mapping
+
+def get_viora_tools(category: str = "ALL"):
+    """Returns the tools for a category, building the shared registry on first call."""
+    global _tool_registry
+    if _tool_registry is None:
+        with _registry_lock:
+            if _tool_registry is None:
+                _tool_registry = _build_tool_groups()
+    return list(_tool_registry.get(category, _tool_registry["ALL"]))
+
+def reset_viora_tools():
+    """Drops the cached registry so the next get_viora_tools() call rebuilds it."""
+    global _tool_registry
+    with _registry_lock:
+        _tool_registry = None
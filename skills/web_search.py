@@ -1,12 +1,143 @@
-from langchain_community.tools import DuckDuckGoSearchRun
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from skills.cache import TTLCache
+
+# A search backend takes (query, max_results) and returns result dicts with
+# 'title', 'url' and 'snippet' keys. Tests can pass a stub instead of the network.
+SearchBackend = Callable[[str, int], List[Dict[str, str]]]
+
+# Sentence punctuation at the end of a query; symbols inside it stay meaningful
+# ("c++", "c#", ".net", "node.js" must not share an entry with "c" or "net")
+_TRAILING_PUNCT_RE = re.compile(r"[\s?!.,;:'\"]+$")
+
+# Bumped when the key format changes, so entries persisted under an old one are not reused
+CACHE_KEY_VERSION = 2
+
+
+def normalize_search_query(query: str) -> str:
+    """Lowercases, collapses whitespace and drops trailing punctuation so rephrasings share a cache entry."""
+    return _TRAILING_PUNCT_RE.sub("", " ".join(query.lower().split()))
+
+
+def _url_key(url: str) -> str:
+    """Identity of a result URL, ignoring scheme, 'www.', fragment and trailing slash."""
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    key = f"{host}{parts.path.rstrip('/')}"
+    return f"{key}?{parts.query}" if parts.query else key
+
+
+def duckduckgo_backend(query: str, max_results: int) -> List[Dict[str, str]]:
+    """Text search through the ddgs package (or the older duckduckgo_search)."""
+    try:
+        from ddgs import DDGS
+    except ImportError:
+        from duckduckgo_search import DDGS
+    results = DDGS().text(query, max_results=max_results) or []
+    return [
+        {"title": r.get("title", ""), "url": r.get("href") or r.get("url", ""), "snippet": r.get("body", "")}
+        for r in results
+    ]
+
 
 class WebSearch:
-    def __init__(self):
-        self.search = DuckDuckGoSearchRun()
+    """
+    Web search with a result cache keyed by the normalized query (TTL + LRU,
+    persisted to data/search_cache.json unless VIORA_SEARCH_CACHE=0).
+    """
+
+    def __init__(self, backend: Optional[SearchBackend] = None, cache: Optional[TTLCache] = None,
+                 max_results: int = 5):
+        self.backend = backend or duckduckgo_backend
+        if cache is None:
+            persist = os.getenv("VIORA_SEARCH_CACHE", "1") != "0"
+            cache = TTLCache(
+                max_entries=256,
+                default_ttl=float(os.getenv("VIORA_SEARCH_CACHE_TTL", "3600")),
+                storage_file="data/search_cache.json" if persist else None,
+            )
+        self.cache = cache
+        self.max_results = max_results
+
+    def search(self, query: str, max_results: Optional[int] = None) -> List[Dict[str, str]]:
+        """Returns result dicts for a query, from cache when possible. Raises on backend errors."""
+        max_results = max_results or self.max_results
+        key = f"v{CACHE_KEY_VERSION}:{max_results}:{normalize_search_query(query)}"
+        results = self.cache.get(key)
+        if results is None:
+            results = self.backend(query, max_results)
+            # Empty result sets are usually transient (rate limits); don't pin them
+            if results:
+                self.cache.put(key, results)
+        return results
+
+    @staticmethod
+    def _format(results: List[Dict[str, str]]) -> str:
+        return "\n".join(
+            f"{i}. {r['title']}\n   {r['url']}\n   {r['snippet']}" for i, r in enumerate(results, 1)
+        )
 
     def run(self, query: str):
         """Performs a web search using DuckDuckGo."""
         try:
-            return self.search.run(query)
+            results = self.search(query)
+            if not results:
+                return f"No results found for '{query}'"
+            return self._format(results)
+        except Exception as e:
+            return f"Error performing search: {str(e)}"
+
+    def multi_search(self, queries: List[str]):
+        """
+        Runs several searches concurrently. A result already listed under an earlier
+        query is not repeated.
+        """
+        try:
+            # Queries that normalize the same would only race for one cache entry
+            if isinstance(queries, str):
+                queries = [queries]
+            unique_queries = {}
+            for query in queries:
+                if query and query.strip():
+                    unique_queries.setdefault(normalize_search_query(query), query.strip())
+            queries = list(unique_queries.values())[:10]
+            if not queries:
+                return "Error performing search: no queries given"
+
+            def search_one(query):
+                try:
+                    return self.search(query)
+                except Exception as e:
+                    return e
+
+            with ThreadPoolExecutor(max_workers=min(5, len(queries)), thread_name_prefix="viora-search") as pool:
+                outcomes = list(pool.map(search_one, queries))
+
+            seen = set()
+            sections = []
+            duplicates = 0
+            for query, outcome in zip(queries, outcomes):
+                if isinstance(outcome, Exception):
+                    sections.append(f"--- Results for '{query}' ---\nError performing search: {str(outcome)}")
+                    continue
+                unique = []
+                for result in outcome:
+                    key = _url_key(result["url"])
+                    if key in seen:
+                        duplicates += 1
+                        continue
+                    seen.add(key)
+                    unique.append(result)
+                body = self._format(unique) if unique else "No new results"
+                sections.append(f"--- Results for '{query}' ---\n{body}")
+            if duplicates:
+                sections.append(f"({duplicates} duplicate result(s) omitted)")
+            return "\n\n".join(sections)
         except Exception as e:
             return f"Error performing search: {str(e)}"
@@ -1,39 +1,143 @@
-import requests
-from bs4 import BeautifulSoup
+import os
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+from skills.cache import TTLCache
+from skills.html_extract import extract_text
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+_MAX_AGE_RE = re.compile(r"max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Process-wide requests.Session with a sized keep-alive connection pool."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            import urllib3
+            from requests.adapters import HTTPAdapter
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+            pool_size = int(os.getenv("VIORA_HTTP_POOL_SIZE", "16"))
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = USER_AGENT
+            session.verify = False
+            _session = session
+        return _session
+
+
+def freshness_lifetime(headers, default_ttl: float) -> Optional[float]:
+    """
+    Seconds a response may be served from cache without revalidation, from its
+    Cache-Control header; None if it must not be stored at all.
+    """
+    cache_control = headers.get("Cache-Control", "").lower()
+    if "no-store" in cache_control:
+        return None
+    if "no-cache" in cache_control:
+        return 0.0
+    match = _MAX_AGE_RE.search(cache_control)
+    if match:
+        return float(match.group(1))
+    return default_ttl
+
 
 class WebTools:
-    @staticmethod
-    def read_url(url: str):
+    """
+    Web page reading over a shared pooled session.
+    Responses are streamed into the HTML extractor, which stops reading once it has
+    enough text.
+    Extracted page text is cached per URL (LRU, TTL from Cache-Control). Expired
+    entries are revalidated with If-None-Match / If-Modified-Since, so an unchanged
+    page costs a 304 round-trip and is never re-parsed.
+    """
+
+    def __init__(self, cache: Optional[TTLCache] = None, session=None):
+        if cache is None:
+            cache = TTLCache(
+                max_entries=int(os.getenv("VIORA_PAGE_CACHE_SIZE", "128")),
+                default_ttl=float(os.getenv("VIORA_PAGE_CACHE_TTL", "300")),
+            )
+        self.cache = cache
+        self._session = session
+        self.per_host = int(os.getenv("VIORA_WEB_PER_HOST", "2"))
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_lock = threading.Lock()
+
+    @property
+    def session(self):
+        return self._session or get_session()
+
+    def fetch_text(self, url: str, max_chars: int = 4000, timeout: float = 10) -> str:
         """
-        Fetches and reads the textual content of a URL.
-        Returns a simplified text representation of the page.
+        Returns the extracted text of a page, from cache when possible. Text beyond
+        max_chars may be cut off, since parsing stops once that much is collected.
+        Raises on HTTP errors.
         """
-        try:
-            import urllib3
-            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-            
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = requests.get(url, headers=headers, timeout=10, verify=False)
-            response.raise_for_status()
+        cached = self.cache.get_entry(url)
+        if cached is not None:
+            entry, fresh = cached
+            # A truncated entry can't serve a request for more text than it holds
+            if not entry["complete"] and len(entry["text"]) < max_chars:
+                cached = None
+            elif fresh:
+                self.cache.hits += 1
+                return entry["text"]
+
+        headers: Dict[str, str] = {}
+        if cached is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
 
-            soup = BeautifulSoup(response.content, 'html.parser')
+        with self.session.get(url, headers=headers, timeout=timeout, stream=True) as response:
+            if response.status_code == 304 and cached is not None:
+                self.cache.hits += 1
+                ttl = freshness_lifetime(response.headers, self.cache.default_ttl)
+                self.cache.put(url, entry, ttl or 0.0)
+                return entry["text"]
+            response.raise_for_status()
+            self.cache.misses += 1
 
-            # Kill all script and style elements
-            for script in soup(["script", "style", "nav", "footer", "header", "noscript"]):
-                script.decompose()
+            # Only trust a declared charset; otherwise sniff it from the document
+            content_type = response.headers.get("Content-Type", "")
+            encoding = response.encoding if "charset" in content_type.lower() else None
+            text, complete = extract_text(
+                response.iter_content(chunk_size=64 * 1024), max_chars=max_chars, encoding=encoding
+            )
 
-            # Get text
-            text = soup.get_text()
+        ttl = freshness_lifetime(response.headers, self.cache.default_ttl)
+        if ttl is None:
+            self.cache.discard(url)
+        else:
+            self.cache.put(url, {
+                "text": text,
+                "complete": complete,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }, ttl)
+        return text
 
-            # Break into lines and remove leading/trailing space on each
-            lines = (line.strip() for line in text.splitlines())
-            # Break multi-headlines into a line each
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            # Drop blank lines
-            text = '\n'.join(chunk for chunk in chunks if chunk)
+    def read_url(self, url: str):
+        """
+        Fetches and reads the textual content of a URL.
+        Returns a simplified text representation of the page.
+        """
+        try:
+            text = self.fetch_text(url)
 
             # Limit to a reasonable length to avoid context overflow (approx 4000 chars)
             if len(text) > 4000:
@@ -43,3 +147,70 @@ class WebTools:
 
         except Exception as e:
             return f"Error reading URL '{url}': {str(e)}"
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlsplit(url).netloc.lower()
+        with self._host_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self._host_slots[host]
+
+    def _fetch_limited(self, url: str, max_chars: int, deadline: float) -> str:
+        with self._host_slot(url):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("timed out waiting for a connection")
+            return self.fetch_text(url, max_chars=max_chars, timeout=min(10, remaining))
+
+    def read_urls(self, urls: List[str], max_chars: int = 12000, timeout: float = 30):
+        """
+        Fetches several URLs concurrently and returns their text in one response.
+        At most `per_host` requests run against the same host at a time. The pages
+        share max_chars; text a short page doesn't use goes to the longer ones.
+        Pages not finished within timeout seconds are reported as errors.
+        """
+        try:
+            if isinstance(urls, str):
+                urls = [urls]
+            urls = list(dict.fromkeys(u.strip() for u in urls if u and u.strip()))[:20]
+            if not urls:
+                return "Error reading URLs: no URLs given"
+
+            share = max_chars // len(urls)
+            deadline = time.monotonic() + timeout
+            pool = ThreadPoolExecutor(max_workers=min(8, len(urls)), thread_name_prefix="viora-web")
+            # Fetch a little more than the even share so unused budget can be redistributed
+            futures = [pool.submit(self._fetch_limited, url, min(max_chars, 2 * share), deadline) for url in urls]
+            wait(futures, timeout=timeout)
+            pool.shutdown(wait=False, cancel_futures=True)
+
+            texts: Dict[str, str] = {}
+            errors: Dict[str, str] = {}
+            for url, future in zip(urls, futures):
+                if not future.done() or future.cancelled():
+                    errors[url] = f"timed out after {timeout:g}s"
+                elif future.exception() is not None:
+                    errors[url] = str(future.exception())
+                else:
+                    texts[url] = future.result()
+
+            # Shortest pages first: each gets an even split of what is left
+            budget = max_chars
+            limits: Dict[str, int] = {}
+            for i, url in enumerate(sorted(texts, key=lambda u: len(texts[u]))):
+                limits[url] = min(len(texts[url]), budget // (len(texts) - i))
+                budget -= limits[url]
+
+            sections = []
+            for url in urls:
+                if url in errors:
+                    sections.append(f"--- Error reading {url}: {errors[url]} ---")
+                    continue
+                text = texts[url]
+                if len(text) > limits[url]:
+                    text = text[:limits[url]] + "\n...[Content Truncated]..."
+                sections.append(f"--- Content of {url} ---\n{text}")
+            return "\n\n".join(sections)
+
+        except Exception as e:
+            return f"Error reading URLs: {str(e)}"
@@ -0,0 +1,238 @@
+"""
+Index of top-level windows (handle -> title, rect, process) for DesktopTools.
+
+Enumerating windows through UI Automation costs a COM round-trip per window and
+property, so the index enumerates once and serves lookups from memory until its TTL
+runs out. A lookup that misses refreshes early (the window may have just opened),
+and DesktopTools patches entries after actions that change them (close, move,
+resize) instead of re-enumerating.
+
+The OS side is a WindowProvider, so the index can run against a fake provider on
+any platform.
+"""
+import difflib
+import os
+import re
+import sys
+import threading
+import time
+import warnings
+from typing import Any, Dict, List, Optional, Tuple
+
+from skills.lazy_import import LazyModule
+
+
+def _prepare_pywinauto():
+    # pywinauto reads the COM threading mode when it is first imported
+    warnings.filterwarnings("ignore", message="Revert to STA COM threading mode")
+    if not hasattr(sys, "coinit_flags"):
+        sys.coinit_flags = 2  # COINIT_APARTMENTTHREADED
+
+# Imported on first use so loading the skill stays cheap
+pywinauto = LazyModule("pywinauto")
+psutil = LazyModule("psutil")
+_prepare_pywinauto()
+
+Rect = Tuple[int, int, int, int]  # left, top, right, bottom
+
+
+class WindowInfo:
+    __slots__ = ("handle", "title", "rect", "pid", "process")
+
+    def __init__(self, handle: int, title: str, rect: Rect = (0, 0, 0, 0), pid: int = 0, process: str = ""):
+        self.handle = handle
+        self.title = title
+        self.rect = rect
+        self.pid = pid
+        self.process = process
+
+    def __repr__(self):
+        return f"WindowInfo({self.handle}, {self.title!r}, {self.rect}, {self.pid}, {self.process!r})"
+
+
+class WindowProvider:
+    """Source of top-level windows. Subclasses talk to the OS (or fake it)."""
+
+    def enumerate(self) -> List[WindowInfo]:
+        """All titled top-level windows, front-most first."""
+        raise NotImplementedError
+
+    def window(self, handle: int) -> Any:
+        """Object to act on the window with (pywinauto wrapper API)."""
+        raise NotImplementedError
+
+    def exists(self, handle: int) -> bool:
+        raise NotImplementedError
+
+    def foreground(self) -> Optional[int]:
+        """Handle of the window that currently has the input focus."""
+        raise NotImplementedError
+
+
+class UIAWindowProvider(WindowProvider):
+    """Windows provider on pywinauto's UI Automation backend."""
+
+    def __init__(self):
+        self._wrappers: Dict[int, Any] = {}
+        self._process_names: Dict[int, str] = {}
+
+    def _process_name(self, pid: int) -> str:
+        if pid not in self._process_names:
+            try:
+                self._process_names[pid] = psutil.Process(pid).name()
+            except Exception:
+                self._process_names[pid] = ""
+        return self._process_names[pid]
+
+    def enumerate(self) -> List[WindowInfo]:
+        windows, wrappers = [], {}
+        for win in pywinauto.Desktop(backend="uia").windows():
+            try:
+                title = win.window_text()
+                if not title:
+                    continue
+                handle = win.handle
+                rect = win.rectangle()
+                pid = win.process_id()
+            except Exception:
+                continue
+            wrappers[handle] = win
+            windows.append(WindowInfo(handle, title, (rect.left, rect.top, rect.right, rect.bottom),
+                                      pid, self._process_name(pid)))
+        # Wrappers from the latest enumeration are reused for actions
+        self._wrappers = wrappers
+        return windows
+
+    def window(self, handle: int) -> Any:
+        wrapper = self._wrappers.get(handle)
+        if wrapper is None:
+            wrapper = pywinauto.Desktop(backend="uia").window(handle=handle).wrapper_object()
+            self._wrappers[handle] = wrapper
+        return wrapper
+
+    def exists(self, handle: int) -> bool:
+        import ctypes
+        return bool(ctypes.windll.user32.IsWindow(handle))
+
+    def foreground(self) -> Optional[int]:
+        import ctypes
+        return ctypes.windll.user32.GetForegroundWindow() or None
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"\w+", text.lower())
+
+
+def match_score(query: str, info: WindowInfo, fuzzy: bool = True, process: bool = True) -> float:
+    """
+    How well a title query matches a window: 1.0 exact title, 0.8 substring,
+    0.7 process name (unless process=False), below that fuzzy word similarity.
+    0 means no match.
+    """
+    q = query.strip().lower()
+    title = info.title.lower()
+    if not q:
+        return 0.0
+    if title == q:
+        return 1.0
+    if q in title:
+        return 0.8
+    name = info.process.lower() if process else ""
+    if name and (q == name or q == os.path.splitext(name)[0]):
+        return 0.7
+    if not fuzzy:
+        return 0.0
+    # Typos and reordered words: every query word must closely match some title word
+    query_words, title_words = _words(q), _words(title)
+    if not query_words or not title_words:
+        return 0.0
+    ratios = [max(difflib.SequenceMatcher(None, w, t).ratio() for t in title_words) for w in query_words]
+    worst = min(ratios)
+    return 0.6 * sum(ratios) / len(ratios) if worst >= 0.75 else 0.0
+
+
+class WindowIndex:
+    """
+    Cached, fuzzy-searchable view of the top-level windows from a WindowProvider.
+
+    ttl is how long an enumeration is trusted; a lookup that finds nothing
+    re-enumerates if the snapshot is older than miss_refresh seconds.
+    """
+
+    def __init__(self, provider: Optional[WindowProvider] = None, ttl: Optional[float] = None,
+                 miss_refresh: float = 0.25):
+        self.provider = provider or UIAWindowProvider()
+        self.ttl = ttl if ttl is not None else float(os.getenv("VIORA_WINDOW_INDEX_TTL", "2.0"))
+        self.miss_refresh = miss_refresh
+        self._windows: Dict[int, WindowInfo] = {}
+        self._refreshed_at: Optional[float] = None
+        self._lock = threading.RLock()
+        self.refreshes = 0
+
+    def refresh(self) -> List[WindowInfo]:
+        windows = self.provider.enumerate()
+        with self._lock:
+            # Dicts keep insertion order, so this stays front-most first
+            self._windows = {info.handle: info for info in windows}
+            self._refreshed_at = time.monotonic()
+            self.refreshes += 1
+            return list(self._windows.values())
+
+    def age(self) -> float:
+        if self._refreshed_at is None:
+            return float("inf")
+        return time.monotonic() - self._refreshed_at
+
+    def windows(self) -> List[WindowInfo]:
+        """All indexed windows, re-enumerating if the snapshot has expired."""
+        with self._lock:
+            if self.age() <= self.ttl:
+                return list(self._windows.values())
+        return self.refresh()
+
+    def matches(self, query: str, fuzzy: bool = True) -> List[WindowInfo]:
+        """
+        Windows matching query, best first; ties keep front-most first.
+        fuzzy=False only accepts exact and substring title matches (no process
+        names or typo tolerance), for actions that should not guess.
+        """
+        windows = self.windows()
+        ranked = self._rank(query, windows, fuzzy)
+        if not ranked and self.age() > self.miss_refresh:
+            ranked = self._rank(query, self.refresh(), fuzzy)
+        return ranked
+
+    @staticmethod
+    def _rank(query: str, windows: List[WindowInfo], fuzzy: bool = True) -> List[WindowInfo]:
+        # Fuzzy scoring is far slower than substring checks, so it only runs when
+        # nothing matches exactly, by substring or by process name
+        for tier in ((False, True) if fuzzy else (False,)):
+            scored = [(match_score(query, info, tier, process=fuzzy), i, info) for i, info in enumerate(windows)]
+            ranked = sorted((s for s in scored if s[0] > 0), key=lambda s: (-s[0], s[1]))
+            if ranked:
+                return [info for _, _, info in ranked]
+        return []
+
+    def find(self, query: str, fuzzy: bool = True) -> Optional[WindowInfo]:
+        ranked = self.matches(query, fuzzy)
+        return ranked[0] if ranked else None
+
+    def window(self, handle: int) -> Any:
+        return self.provider.window(handle)
+
+    def update(self, handle: int, **fields):
+        """Patches an entry after an action changed it (e.g. rect after a move)."""
+        with self._lock:
+            info = self._windows.get(handle)
+            if info is not None:
+                for name, value in fields.items():
+                    setattr(info, name, value)
+
+    def discard(self, handle: int):
+        with self._lock:
+            self._windows.pop(handle, None)
+
+    def invalidate(self):
+        """Forces the next lookup to re-enumerate."""
+        with self._lock:
+            self._refreshed_at = None